@@ -1,7 +1,7 @@
-import sys
+import argparse
 from pathlib import Path
 import json
-from src.core import chat, pick_log_file, get_logger, print_summary
+from src.core import chat, pick_log_file, get_logger, read_log_range, print_summary, split_response, report_parsed
 import time
 
 logger = get_logger("Log Analyzer Agent")
@@ -53,6 +53,14 @@ Be technical in analysis but simple in executive summary."""
 
 
 
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Log Analyzer Agent")
+    parser.add_argument("log_file", nargs="?", default=None, help="Log file (default: first in data/logs)")
+    parser.add_argument("--since", default=None, help="Range start: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    parser.add_argument("--until", default=None, help="Range end: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    return parser.parse_args()
+
+
 def main():
     """Run the log analyzer agent."""
     start_time = time.time()
@@ -61,9 +69,9 @@ def main():
 
     try:
         # 1. Pick log file
-        file_arg = sys.argv[1] if len(sys.argv) > 1 else None
-        log_file = pick_log_file(file_arg, LOG_DIR)
-        log_content = log_file.read_text(encoding="utf-8")
+        args = _parse_args()
+        log_file = pick_log_file(args.log_file, LOG_DIR)
+        log_content = read_log_range(log_file, args.since, args.until)
 
         logger.info(f"Analyzing: {log_file.name}")
         logger.info(f"Log size: {len(log_content)} characters")
@@ -87,38 +95,19 @@ def main():
         logger.info(f"Cost: ${metadata['cost_usd']:.6f} ({metadata['total_tokens']} tokens)")
 
         # 4. Split response into 3 parts: text, JSON, executive
-        text_report = response
-        json_text = '{"error": "No JSON generated"}'
-        exec_summary = "Executive summary not generated."
-
-        # Extract JSON
-        if "```json" in response:
-            parts = response.split("```json")
-            text_report = parts[0].strip()
-            remainder = parts[1]
-
-            if "```" in remainder:
-                json_block = remainder.split("```")[0].strip()
-                json_text = json_block
-
-                # Extract executive summary
-                after_json = remainder.split("```", 1)[1]
-                if "---EXECUTIVE---" in after_json:
-                    exec_parts = after_json.split("---EXECUTIVE---")
-                    exec_summary = exec_parts[1].strip()
+        text_report, json_data, exec_summary = split_response(response)
 
         # 5. Save text report
         report_file = OUT_DIR / f"{log_file.stem}_analysis.txt"
         report_file.write_text(text_report, encoding="utf-8")
 
         # 6. Save JSON
-        try:
-            json_data = json.loads(json_text)
+        if report_parsed(json_data):
             json_file = OUT_DIR / f"{log_file.stem}_analysis.json"
             json_file.write_text(json.dumps(json_data, indent=2), encoding="utf-8")
             logger.info(f"JSON saved: {json_file.relative_to(ROOT)}")
-        except json.JSONDecodeError as e:
-            logger.info(f"⚠JSON parsing failed: {e}")
+        else:
+            logger.info(f"⚠JSON parsing failed: {json_data.get('error', 'No JSON generated')}")
 
         # 7. Save executive summary
         exec_file = OUT_DIR / f"{log_file.stem}_executive.txt"
@@ -1,11 +1,14 @@
+import argparse
 import json
-import sys
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 import pandas as pd
 import time
 
 from src.core import chat, parse_json_safely, pick_requirement, get_logger, print_summary
+from src.core import pick_requirement_files, run_batch, batch_output_dir, write_batch_index
+from src.core import combine_test_cases, write_test_case_dataset
 
 logger = get_logger("TestCase Generator Agent")
 
@@ -65,50 +68,102 @@ def save_as_csv(test_cases: List[Dict], csv_file: Path) -> None:
         
         pd.DataFrame(rows).to_csv(csv_file, index=False, encoding="utf-8")
 
+def generate_test_cases(req_file: Path, out_dir: Path) -> Dict:
+    """One requirement → raw text, JSON and CSV in out_dir. Returns test cases and LLM metadata."""
+    requirement = req_file.read_text(encoding="utf-8")
+    logger.info(f"Processing requirement file: {req_file}")
+
+    # Build messages for LLM
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Requirements are follows:\\n\\n{requirement}"}
+    ]
+
+    # Call LLM
+    logger.info("Calling LLM to generate test cases...")
+    result = chat(messages)
+    response = result["response"]
+    metadata = result["metadata"]
+
+    logger.debug(f"LLM call: {metadata['provider']}/{metadata['model']}, "
+                 f"{metadata['total_tokens']} tokens, {metadata['duration_ms']}ms")
+
+    logger.info(f"Cost: ${metadata['cost_usd']:.6f} ({metadata['total_tokens']} tokens)")
+
+    # Parse Json Response
+    raw_file_txt = out_dir / "raw_output.txt"
+    raw_file_json = out_dir / "raw_output.json"
+    testcases = parse_json_safely(response, raw_file_txt)
+    raw_file_json.write_text(json.dumps(testcases, indent=2), encoding="utf-8")
+
+    # Save as CSV
+    csv_file = out_dir / "testcases.csv"
+    save_as_csv(testcases, csv_file)
+
+    logger.info(f"Generated test cases: {len(testcases)}")
+    logger.info(f"Raw Text saved to: {raw_file_txt}")
+    logger.info(f"Raw Json saved to: {raw_file_json}")
+    logger.info(f"CSV saved to: {csv_file}")
+
+    return {"test_cases": testcases, "metadata": metadata}
+
+def generate_batch(req_files: List[Path], workers: int) -> Dict:
+    """Many requirements concurrently (workers LLM calls at a time) + one deduplicated dataset."""
+    run_dir = OUT_DIR / "batch" / datetime.now().strftime("%Y%m%d_%H%M%S")
+    generated, calls = {}, []
+
+    def generate(item: dict) -> dict:
+        req_file = Path(item["file"])
+        out_dir = batch_output_dir(run_dir, req_file)
+        result = generate_test_cases(req_file, out_dir)
+        # Same file name in two directories: out_dir.name (stem + path hash) keeps both
+        generated[out_dir.name] = result["test_cases"]
+        calls.append(result["metadata"])
+        return {"status": "success", "output_dir": str(out_dir), "test_cases": len(result["test_cases"])}
+
+    results = run_batch([{"file": str(f)} for f in req_files], generate, max_workers=workers)
+    write_batch_index(results, run_dir)
+    csv_file = write_test_case_dataset(combine_test_cases(generated), run_dir)
+    logger.info(f"Combined dataset saved to: {csv_file}")
+
+    failed = [r for r in results if r["status"] != "success"]
+    if failed:
+        logger.error(f"{len(failed)}/{len(results)} requirements failed: "
+                     f"{', '.join(Path(r['file']).name for r in failed)}")
+
+    # Aggregate metadata for the performance summary
+    return {
+        "llm_calls": len(calls),
+        "metadata": {
+            "total_tokens": sum(m["total_tokens"] for m in calls),
+            "cost_usd": sum(m["cost_usd"] for m in calls),
+            "provider": calls[0]["provider"] if calls else "N/A",
+            "model": calls[0]["model"] if calls else "N/A"
+        }
+    }
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="TestCase Generator Agent")
+    parser.add_argument("target", nargs="?", default=None,
+                        help="Requirement file (default: first in data/requirements), or a directory / glob for batch mode")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent LLM calls in batch mode")
+    return parser.parse_args()
+
 def main():
     start_time = time.time()
     llm_call_count = 0
     metadata = None
 
     try:
-        # Pick requirement file
-        file_arg = sys.argv[1] if len(sys.argv) > 1 else None
-        req_file = pick_requirement(file_arg,REQ_DIR)
-        requirement = req_file.read_text(encoding="utf-8")
-        logger.info(f"Processing requirement file: {req_file}")
-
-        # Build messages for LLM
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": f"Requirements are follows:\\n\\n{requirement}"}
-        ]
-
-        # Call LLM
-        logger.info("Calling LLM to generate test cases...")
-        result = chat(messages)
-        llm_call_count += 1
-        response = result["response"]
-        metadata = result["metadata"]
-
-        logger.debug(f"LLM call: {metadata['provider']}/{metadata['model']}, "
-                     f"{metadata['total_tokens']} tokens, {metadata['duration_ms']}ms")
-
-        logger.info(f"Cost: ${metadata['cost_usd']:.6f} ({metadata['total_tokens']} tokens)")
-
-        # Parse Json Response
-        raw_file_txt = OUT_DIR / "raw_output.txt"
-        raw_file_json = OUT_DIR / "raw_output.json"
-        testcases = parse_json_safely(response, raw_file_txt)
-        raw_file_json.write_text(json.dumps(testcases, indent=2), encoding="utf-8")
-
-        # Save as CSV
-        csv_file = OUT_DIR / "testcases.csv"
-        save_as_csv(testcases, csv_file)
-
-        logger.info(f"Generated test cases: {len(testcases)}")
-        logger.info(f"Raw Text saved to: {raw_file_txt}")
-        logger.info(f"Raw Json saved to: {raw_file_json}")
-        logger.info(f"CSV saved to: {csv_file}")
+        # Pick requirement file(s): a directory or glob runs in batch mode
+        args = _parse_args()
+        if args.target and not Path(args.target).is_file():
+            batch = generate_batch(pick_requirement_files(args.target, REQ_DIR), args.workers)
+            llm_call_count, metadata = batch["llm_calls"], batch["metadata"]
+        else:
+            req_file = pick_requirement(args.target, REQ_DIR)
+            metadata = generate_test_cases(req_file, OUT_DIR)["metadata"]
+            llm_call_count += 1
 
         # Success summary
         duration = time.time() - start_time
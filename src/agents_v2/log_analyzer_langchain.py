@@ -2,7 +2,7 @@
 Log Analyzer Agent - Langchain Version
 Analyzes log files and generates analysis reports using Langchain.
 """
-import sys
+import argparse
 import json
 from pathlib import Path
 
@@ -11,7 +11,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
 # Our core utilities
-from src.core import get_langchain_llm, pick_log_file, get_logger
+from src.core import get_langchain_llm, pick_log_file, get_logger, read_log_range
 
 # Import prompt
 from src.prompts.log_analyzer_prompts import LOG_ANALYZER_SYSTEM_PROMPT
@@ -53,10 +53,10 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
 # Our core utilities
-from src.core import get_langchain_llm, pick_log_file, get_logger
+from src.core import get_langchain_llm, pick_log_file, get_logger, log_analysis_chain
 
 # Import prompt
-from src.prompts.log_analyzer_prompts import LOG_ANALYZER_SYSTEM_PROMPT
+from src.prompts.log_analyzer_prompts import LOG_ANALYZER_SYSTEM_PROMPT, LOG_ANALYZER_STRUCTURED_SYSTEM_PROMPT
 
 # Project paths
 ROOT = Path(__file__).resolve().parents[2]
@@ -79,47 +79,38 @@ llm = get_langchain_llm()
 # Get parser (String output - we'll split manually)
 parser = StrOutputParser()
 
-# Build chain
-chain = prompt_template | llm | parser
+# Build chain: native structured output where supported, else the three-part text
+structured_template = ChatPromptTemplate.from_messages([
+    ("system", LOG_ANALYZER_STRUCTURED_SYSTEM_PROMPT),
+    ("user", "Log file content:\n\n{log_content}")
+])
+chain = log_analysis_chain(structured_template, prompt_template, llm, parser)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Log Analyzer Agent")
+    parser.add_argument("log_file", nargs="?", default=None, help="Log file (default: first in data/logs)")
+    parser.add_argument("--since", default=None, help="Range start: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    parser.add_argument("--until", default=None, help="Range end: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    return parser.parse_args()
 
 
 def main():
     logger.info("Log Analyzer (Langchain) started")
 
     # 1. Pick log file
-    file_arg = sys.argv[1] if len(sys.argv) > 1 else None
-    log_file = pick_log_file(file_arg, LOG_DIR)
-    log_content = log_file.read_text(encoding="utf-8")
+    args = _parse_args()
+    log_file = pick_log_file(args.log_file, LOG_DIR)
+    log_content = read_log_range(log_file, args.since, args.until)
     logger.info(f"Analyzing: {log_file.name}")
 
     # 2. Run chain
     logger.info("Calling LLM via Langchain...")
-    response = chain.invoke({"log_content": log_content})
-
-    # 3. Split response into 3 parts
-    text_report = response
-    json_text = '{"error": "No JSON generated"}'
-    exec_summary = "Executive summary not generated."
-
-    if "```json" in response:
-        parts = response.split("```json")
-        text_report = parts[0].strip()
-        remainder = parts[1]
-
-        if "```" in remainder:
-            json_block = remainder.split("```")[0].strip()
-            json_text = json_block
-
-            after_json = remainder.split("```", 1)[1]
-            if "---EXECUTIVE---" in after_json:
-                exec_parts = after_json.split("---EXECUTIVE---")
-                exec_summary = exec_parts[1].strip()
-
-    # 4. Parse JSON
-    try:
-        json_data = json.loads(json_text)
-    except json.JSONDecodeError:
-        json_data = {"error": "Failed to parse JSON"}
+    # 3. Text, JSON and executive summary (structured object or parsed 3-part response)
+    text_report, json_data, exec_summary = chain.invoke({"log_content": log_content})
+
+    # 4. No JSON part at all
+    json_data = json_data or {"error": "No JSON generated"}
 
     # 5. Save outputs
     base_name = log_file.stem
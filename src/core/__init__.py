@@ -1,12 +1,53 @@
 # Core Packages - LLM Client and utilities
 
-from .llm_client import chat, get_langchain_llm
-from .utils import pick_requirement, parse_json_safely, pick_log_file, print_summary
+from .llm_client import chat, get_langchain_llm, SMALL_MODEL, CASCADE_MODELS
+from .utils import pick_requirement, pick_requirement_files, parse_json_safely, pick_log_file, pick_log_files, print_summary
 from .logger import get_logger
 from .cost_tracker import calculate_cost
-from .vector_store import build_vector_store, load_vector_store, search_vector_store
+from .vector_store import build_vector_store, load_vector_store, search_vector_store, embed_query
 from .memory import ConversationMemory, PersistentMemory
+from .log_parser import parse_log_records
+from .triage import triage_log, render_clean_report
+from .log_windows import extract_error_windows, extract_anchor_query
+from .fingerprint import incident_fingerprint, normalize_message
+from .result_cache import ResultCache, refresh_cached_analysis
+from .log_index import read_log_range, get_index
+from .correlation import build_correlated_timeline, correlate, load_sources
+from .log_metrics import extract_log_metrics, format_metrics, log_metrics_table
+from .log_digest import build_digest, format_digest, log_digest, PROMPT_MODE
+from .tokens import estimate_tokens, truncate_to_tokens, truncate_to_sentences
+from .context_assembler import assemble_context, format_accounting, CONTEXT_TOKEN_BUDGET
+from .concurrency import llm_slot
+from .approval_queue import ApprovalQueue, auto_approval, APPROVAL_MODE, APPROVAL_POLICY
+from .testcase_dataset import combine_test_cases, write_test_case_dataset
+from .json_stream import JsonItemStream, stream_items, STREAM_PARSE
+from .structured_output import split_response, report_parsed, testcase_chain, log_analysis_chain, LogAnalysis, LogReport, TestCaseList, STRUCTURED_OUTPUT
+from .cascade import CascadeStats, CASCADE_TIERS, next_tier
+from .speculative import speculative_candidates, tier_candidates, speculate_batch, SPECULATIVE_MODE
+from .testcase_schema import TestCase, parse_test_cases, validate_test_cases
+from .testcase_manifest import TestCaseManifest
+from .requirement_sections import split_requirement, generate_by_section, repair_test_cases
+from .testcase_retry import retry_generation
+from .batch import parse_log_file, parse_files, run_batch, arun_batch, batch_output_dir, write_batch_index
 
-__all__ = ["chat", "pick_requirement", "parse_json_safely", "pick_log_file", "get_logger", "calculate_cost",
+__all__ = ["chat", "pick_requirement", "parse_json_safely", "pick_log_file", "pick_log_files", "get_logger", "calculate_cost",
            "print_summary", "get_langchain_llm", "build_vector_store", "load_vector_store", "search_vector_store",
-           "ConversationMemory", "PersistentMemory"]
+           "ConversationMemory", "PersistentMemory", "parse_log_file", "parse_files", "run_batch", "batch_output_dir",
+           "write_batch_index", "SMALL_MODEL", "parse_log_records", "triage_log", "render_clean_report",
+           "extract_error_windows", "extract_anchor_query", "incident_fingerprint", "normalize_message",
+           "ResultCache", "refresh_cached_analysis", "read_log_range", "get_index",
+           "build_correlated_timeline", "correlate", "load_sources",
+           "extract_log_metrics", "format_metrics", "log_metrics_table",
+           "build_digest", "format_digest", "log_digest", "PROMPT_MODE",
+           "estimate_tokens", "truncate_to_tokens", "llm_slot", "arun_batch", "embed_query",
+           "ApprovalQueue", "auto_approval", "APPROVAL_MODE", "APPROVAL_POLICY",
+           "pick_requirement_files", "combine_test_cases", "write_test_case_dataset",
+           "split_requirement", "generate_by_section", "TestCaseManifest",
+           "TestCase", "parse_test_cases", "validate_test_cases", "repair_test_cases",
+           "speculative_candidates", "tier_candidates", "speculate_batch", "SPECULATIVE_MODE",
+           "CASCADE_MODELS", "CascadeStats", "CASCADE_TIERS", "next_tier",
+           "split_response", "report_parsed", "testcase_chain", "log_analysis_chain",
+           "LogAnalysis", "LogReport", "TestCaseList", "STRUCTURED_OUTPUT",
+           "JsonItemStream", "stream_items", "STREAM_PARSE",
+           "truncate_to_sentences", "assemble_context", "format_accounting", "CONTEXT_TOKEN_BUDGET",
+           "retry_generation"]
@@ -0,0 +1,118 @@
+"""
+Approval Queue
+Pending human approvals stored in SQLite, so generation runs can pause at
+the approval step (a checkpointed interrupt) instead of blocking on input()
+"""
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from .logger import get_logger
+
+load_dotenv()
+
+logger = get_logger("approval_queue")
+
+ROOT = Path(__file__).resolve().parents[2]
+APPROVAL_DB = ROOT / "data" / "approvals" / "queue.db"
+
+# interactive: ask on the terminal (input()) | queue: interrupt the graph and queue the preview
+APPROVAL_MODE = os.getenv("APPROVAL_MODE", "interactive").lower()
+
+# manual: always ask | validation_pass: auto-approve validated test cases | all: approve everything
+APPROVAL_POLICY = os.getenv("APPROVAL_POLICY", "manual").lower()
+
+
+class ApprovalQueue:
+    def __init__(self, db_path: Path = APPROVAL_DB):
+        """
+        Initialize approval queue (one row per paused run).
+        """
+        self.db_path = Path(db_path)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS approvals (
+                    run_id TEXT PRIMARY KEY,
+                    pipeline TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    preview TEXT NOT NULL,
+                    feedback TEXT,
+                    created_at TEXT NOT NULL,
+                    decided_at TEXT
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the queue thread-safe
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def submit(self, run_id: str, pipeline: str, preview: Dict):
+        """Queue (or re-queue after a rejected retry) a run waiting for approval."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO approvals (run_id, pipeline, status, preview, created_at) "
+                "VALUES (?, ?, 'pending', ?, ?)",
+                (run_id, pipeline, json.dumps(preview), datetime.now().isoformat())
+            )
+
+        logger.info(f"⏸️ Queued for approval: {run_id} ({pipeline})")
+
+    def decide(self, run_id: str, decision: str, feedback: str = "") -> bool:
+        """Record approved / rejected for a pending run. Returns False if it is not pending."""
+        with closing(self._connect()) as conn, conn:
+            updated = conn.execute(
+                "UPDATE approvals SET status = ?, feedback = ?, decided_at = ? WHERE run_id = ? AND status = 'pending'",
+                (decision, feedback, datetime.now().isoformat(), run_id)
+            ).rowcount
+
+        if updated:
+            logger.info(f"{'✅' if decision == 'approved' else '❌'} {run_id}: {decision}")
+        else:
+            logger.warning(f"{run_id} is not pending approval")
+        return bool(updated)
+
+    def mark_resumed(self, run_id: str):
+        """The decided run has been handed back to its graph."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("UPDATE approvals SET status = 'resumed' WHERE run_id = ? AND status != 'pending'",
+                         (run_id,))
+
+    def get(self, run_id: str) -> Optional[Dict]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM approvals WHERE run_id = ?", (run_id,)).fetchone()
+        return _to_dict(row) if row else None
+
+    def list(self, status: str = "pending") -> List[Dict]:
+        """Runs with the given status, oldest first."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT * FROM approvals WHERE status = ? ORDER BY created_at", (status,)
+            ).fetchall()
+        return [_to_dict(row) for row in rows]
+
+
+def _to_dict(row: sqlite3.Row) -> Dict:
+    item = dict(row)
+    item["preview"] = json.loads(item["preview"])
+    return item
+
+
+def auto_approval(state: Dict, policy: str = APPROVAL_POLICY) -> Optional[Dict]:
+    """Approval decision under an auto-approve policy, or None when a human has to decide."""
+    if policy == "all":
+        reason = "Auto-approved (APPROVAL_POLICY=all)"
+    elif policy == "validation_pass" and state.get("validation_status") == "pass":
+        reason = "Auto-approved: validation passed"
+    else:
+        return None
+
+    logger.info(f"✅ {reason}")
+    return {"human_approval": "approved", "human_feedback": reason}
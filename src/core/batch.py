@@ -0,0 +1,165 @@
+"""
+Batch Processing
+Runs many files through a pipeline concurrently and writes an aggregate index
+"""
+import asyncio
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Tuple
+from .log_index import read_log_range
+from .log_windows import extract_error_windows
+from .log_metrics import log_metrics_table
+from .log_digest import log_digest, PROMPT_MODE
+from .triage import triage_log
+from .logger import get_logger
+
+logger = get_logger("batch")
+
+def parse_log_file(path: str, since: str = "", until: str = "") -> Dict:
+    """
+    Read, triage and pre-process one log (runs in a worker process).
+    Returns the graph state fields, so the LLM workers do no parsing of their own.
+    """
+    log_content = read_log_range(path, since, until)
+    triage = triage_log(log_content)
+    parsed = {"log_content": log_content, "triage": triage, "focused_log": "", "metrics": "", "log_digest": ""}
+
+    # Clean logs never reach the LLM, the rest get windows / metrics / digest up front
+    if triage["action"] != "skip":
+        parsed["focused_log"] = extract_error_windows(log_content)
+        parsed["metrics"] = log_metrics_table(log_content)
+        parsed["log_digest"] = log_digest(log_content) if PROMPT_MODE == "digest" else ""
+
+    return parsed
+
+
+def parse_files(files: List[Path], since: str = "", until: str = "",
+                max_workers: int = 4) -> Tuple[List[Dict], Dict[str, Dict]]:
+    """
+    Parse files in a process pool (CPU-bound), leaving the LLM waits to run_batch.
+    Returns (batch items, largest / noisiest first) and the parsed state fields by file.
+    """
+    logger.info(f"Parsing {len(files)} files ({max_workers} processes)...")
+    paths = [str(f) for f in files]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        parsed = dict(zip(paths, pool.map(partial(parse_log_file, since=since, until=until), paths)))
+
+    items = []
+    for path, fields in parsed.items():
+        levels = fields["triage"]["level_counts"]
+        items.append({
+            "file": path,
+            "size": len(fields["log_content"]),
+            "triage": fields["triage"]["level"],
+            "error_lines": levels.get("ERROR", 0) + levels.get("CRITICAL", 0)
+        })
+
+    # Longest jobs first keeps the thread pool busy until the end
+    items.sort(key=lambda s: (s["error_lines"], s["size"]), reverse=True)
+    return items, parsed
+
+
+def batch_output_dir(base_dir: Path, file_path: Path) -> Path:
+    """Unique per-file output directory (stem + short path hash)."""
+    file_path = Path(file_path)
+    digest = hashlib.sha1(str(file_path.resolve()).encode("utf-8")).hexdigest()[:8]
+    out_dir = Path(base_dir) / f"{file_path.stem}_{digest}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return out_dir
+
+
+def run_batch(items: List[Dict], worker: Callable[[Dict], Dict], max_workers: int = 4) -> List[Dict]:
+    """
+    Run worker(item) for every item in a thread pool.
+    Workers mostly wait on LLM calls, so threads are enough here.
+    """
+    results = []
+    logger.info(f"Running batch of {len(items)} items ({max_workers} workers)...")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_timed, worker, item): item for item in items}
+
+        for future in as_completed(futures):
+            item = futures[future]
+            result = future.result()
+            results.append({**item, **result})
+
+            status = result.get("status", "unknown")
+            logger.info(f"[{len(results)}/{len(items)}] {Path(item['file']).name}: {status} "
+                        f"({result['duration_s']:.1f}s)")
+
+    # Keep index order stable regardless of completion order
+    results.sort(key=lambda r: r["file"])
+    return results
+
+
+async def arun_batch(items: List[Dict], worker: Callable[[Dict], Awaitable[Dict]],
+                     max_concurrency: int = 8) -> List[Dict]:
+    """Async counterpart of run_batch: await worker(item) for every item, max_concurrency at a time."""
+    results = []
+    logger.info(f"Running async batch of {len(items)} items (max {max_concurrency} concurrent)...")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(item: Dict):
+        async with semaphore:
+            result = await _atimed(worker, item)
+        results.append({**item, **result})
+        logger.info(f"[{len(results)}/{len(items)}] {Path(item['file']).name}: {result.get('status', 'unknown')} "
+                    f"({result['duration_s']:.1f}s)")
+
+    await asyncio.gather(*(run_one(item) for item in items))
+
+    # Keep index order stable regardless of completion order
+    results.sort(key=lambda r: r["file"])
+    return results
+
+
+def write_batch_index(results: List[Dict], out_dir: Path) -> Path:
+    """Write aggregate index for a batch run."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    index = {
+        "generated_at": datetime.now().isoformat(),
+        "total": len(results),
+        "succeeded": sum(1 for r in results if r.get("status") == "success"),
+        "failed": sum(1 for r in results if r.get("status") != "success"),
+        "results": results
+    }
+
+    index_file = out_dir / "index.json"
+    index_file.write_text(json.dumps(index, indent=2, default=str), encoding="utf-8")
+    logger.info(f"Batch index saved: {index_file}")
+    return index_file
+
+
+def _timed(worker: Callable[[Dict], Dict], item: Dict) -> Dict:
+    """Run one worker call, never letting an exception kill the batch."""
+    start_time = time.time()
+    try:
+        result = worker(item) or {}
+    except Exception as e:
+        logger.error(f"{Path(item['file']).name} failed: {e}")
+        result = {"status": "failed", "errors": [str(e)]}
+
+    result["duration_s"] = round(time.time() - start_time, 2)
+    return result
+
+
+async def _atimed(worker: Callable[[Dict], Awaitable[Dict]], item: Dict) -> Dict:
+    """Async counterpart of _timed."""
+    start_time = time.time()
+    try:
+        result = await worker(item) or {}
+    except Exception as e:
+        logger.error(f"{Path(item['file']).name} failed: {e}")
+        result = {"status": "failed", "errors": [str(e)]}
+
+    result["duration_s"] = round(time.time() - start_time, 2)
+    return result
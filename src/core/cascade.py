@@ -0,0 +1,76 @@
+"""
+Model Cascade
+Nodes start on the cheapest CASCADE_MODELS tier and escalate only when the
+output fails validation / parsing. Every attempt is recorded in SQLite so the
+hit rate of each tier can be reviewed
+"""
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+from .llm_client import CASCADE_MODELS
+from .logger import get_logger
+
+logger = get_logger("cascade")
+
+ROOT = Path(__file__).resolve().parents[2]
+CASCADE_DB = ROOT / "data" / "cascade" / "stats.db"
+
+CASCADE_TIERS = len(CASCADE_MODELS)
+
+
+def next_tier(tier: int) -> int:
+    """One tier up, staying on the strongest model."""
+    return min(tier + 1, CASCADE_TIERS - 1)
+
+
+class CascadeStats:
+    def __init__(self, db_path: Path = CASCADE_DB):
+        """
+        Initialize cascade stats (one row per attempt).
+        """
+        self.db_path = Path(db_path)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS attempts (
+                    pipeline TEXT NOT NULL,
+                    tier INTEGER NOT NULL,
+                    model TEXT NOT NULL,
+                    accepted INTEGER NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def record(self, pipeline: str, tier: int, accepted: bool):
+        """Outcome of one attempt on a tier (only recorded when a cascade is configured)."""
+        if CASCADE_TIERS < 2:
+            return
+
+        model = CASCADE_MODELS[min(tier, CASCADE_TIERS - 1)]
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO attempts (pipeline, tier, model, accepted, created_at) VALUES (?, ?, ?, ?, ?)",
+                (pipeline, tier, model, int(accepted), datetime.now().isoformat())
+            )
+
+        if not accepted and tier < CASCADE_TIERS - 1:
+            logger.warning(f"⬆️ {pipeline}: {model} output rejected - a retry escalates to {CASCADE_MODELS[tier + 1]}")
+
+    def hit_rates(self, pipeline: str = None) -> List[Dict]:
+        """Attempts and accepted outputs per pipeline / tier / model."""
+        query = ("SELECT pipeline, tier, model, COUNT(*) AS attempts, SUM(accepted) AS accepted "
+                 "FROM attempts {where} GROUP BY pipeline, tier, model ORDER BY pipeline, tier")
+        where, params = ("WHERE pipeline = ?", (pipeline,)) if pipeline else ("", ())
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query.format(where=where), params).fetchall()
+
+        return [{**dict(row), "hit_rate": row["accepted"] / row["attempts"]} for row in rows]
@@ -0,0 +1,38 @@
+"""
+LLM Concurrency Caps
+Global and per-provider limits for concurrent async LLM calls
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+from .llm_client import PROVIDER
+
+load_dotenv()
+
+MAX_CONCURRENT_LLM_CALLS = int(os.getenv("MAX_CONCURRENT_LLM_CALLS", 16))
+
+# Providers rate-limit differently; a local Ollama serves one request at a time
+PROVIDER_CONCURRENCY = {
+    "openai": int(os.getenv("OPENAI_CONCURRENCY", 8)),
+    "google": int(os.getenv("GOOGLE_CONCURRENCY", 4)),
+    "ollama": int(os.getenv("OLLAMA_CONCURRENCY", 1)),
+}
+
+# Semaphores belong to an event loop, so they are created per loop
+_semaphores = {}
+
+
+def _semaphore(name: str, limit: int) -> asyncio.Semaphore:
+    key = (id(asyncio.get_running_loop()), name)
+    if key not in _semaphores:
+        _semaphores[key] = asyncio.Semaphore(limit)
+    return _semaphores[key]
+
+
+@asynccontextmanager
+async def llm_slot(provider: str = PROVIDER):
+    """Wait for a free global and per-provider slot before an LLM call."""
+    provider_limit = PROVIDER_CONCURRENCY.get(provider, MAX_CONCURRENT_LLM_CALLS)
+    async with _semaphore("global", MAX_CONCURRENT_LLM_CALLS), _semaphore(provider, provider_limit):
+        yield
@@ -0,0 +1,97 @@
+"""
+Context Assembler
+Builds prompt context within a total token budget: every section has a priority
+and a minimum, items inside a section are taken by relevance score, and cut
+text ends at a sentence boundary. Returns an accounting of what was included
+"""
+import os
+from typing import Dict, List, Union
+from dotenv import load_dotenv
+from .tokens import estimate_tokens, truncate_to_sentences
+from .logger import get_logger
+
+load_dotenv()
+
+logger = get_logger("context_assembler")
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", 6000))
+MIN_PARTIAL_TOKENS = 40  # Smaller leftovers are not worth a cut-off fragment
+
+
+def assemble_context(sections: List[Dict], budget: int = CONTEXT_TOKEN_BUDGET) -> Dict:
+    """
+    sections: [{"name", "items": [text | {"text", "score"}], "priority", "min_tokens", "separator"}]
+    Every section is first guaranteed min(min_tokens, its size), highest priority first;
+    the rest of the budget then goes to sections in priority order, items by score.
+    Included items keep their original order.
+    Returns {"texts": {name: text}, "accounting": [per section], "tokens", "budget"}.
+    """
+    ordered = sorted(sections, key=lambda section: -section.get("priority", 0))
+    items = {section["name"]: _items(section["items"]) for section in sections}
+
+    # Minimums first: when even those don't fit, the lowest priorities give theirs up
+    reserved, left = {}, budget
+    for section in ordered:
+        size = sum(estimate_tokens(item["text"]) for item in items[section["name"]])
+        reserved[section["name"]] = min(section.get("min_tokens", 0), size, left)
+        left -= reserved[section["name"]]
+
+    texts, accounting, free = {}, [], left
+    for section in ordered:
+        name = section["name"]
+        allowance = reserved[name] + free
+        chosen, used, truncated = _fill(items[name], allowance)
+        free = allowance - used
+
+        texts[name] = section.get("separator", "\n\n").join(chosen)
+        accounting.append({
+            "name": name,
+            "tokens": used,
+            "items": len(chosen),
+            "available": len(items[name]),
+            "truncated": truncated
+        })
+
+    return {
+        "texts": texts,
+        "accounting": accounting,
+        "tokens": sum(entry["tokens"] for entry in accounting),
+        "budget": budget
+    }
+
+
+def format_accounting(context: Dict) -> str:
+    """'2950/6000 tokens - requirement 900 (1/1), guidelines 1400 (2/3, cut), ...'"""
+    parts = [
+        f"{entry['name']} {entry['tokens']} ({entry['items']}/{entry['available']}"
+        f"{', cut' if entry['truncated'] else ''})"
+        for entry in context["accounting"]
+    ]
+    return f"{context['tokens']}/{context['budget']} tokens - " + ", ".join(parts)
+
+
+def _items(raw: List[Union[str, Dict]]) -> List[Dict]:
+    """Plain strings score 1.0; empty items are dropped."""
+    items = [item if isinstance(item, dict) else {"text": item, "score": 1.0} for item in raw or []]
+    return [item for item in items if item.get("text")]
+
+
+def _fill(items: List[Dict], allowance: int) -> tuple:
+    """Best-scored items that fit; the first one that doesn't is cut at a sentence boundary."""
+    taken, remaining, truncated = {}, allowance, False
+
+    for index in sorted(range(len(items)), key=lambda i: -items[i].get("score", 0)):
+        text = items[index]["text"]
+        tokens = estimate_tokens(text)
+        if tokens > remaining:
+            if remaining < MIN_PARTIAL_TOKENS:
+                break
+            text = truncate_to_sentences(text, remaining)
+            tokens = estimate_tokens(text)
+            truncated = True
+        taken[index] = text
+        remaining -= tokens
+        if truncated:
+            break
+
+    return [taken[index] for index in sorted(taken)], allowance - remaining, truncated
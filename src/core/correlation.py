@@ -0,0 +1,181 @@
+"""
+Cross-Log Correlation
+Merge-joins records from several logs on time and clusters co-occurring failure signatures
+"""
+import heapq
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List
+from .log_parser import parse_log_records
+from .log_index import read_log_range
+from .fingerprint import normalize_message
+from .logger import get_logger
+
+logger = get_logger("correlation")
+
+CORRELATION_LEVELS = {"WARNING", "ERROR", "CRITICAL", "SLOW_QUERY"}
+WINDOW_SECONDS = 120
+
+# Service-independent failure signatures (first match wins)
+SIGNATURE_PATTERNS = [
+    ("connection_pool", re.compile(r"connection pool|pool (exhausted|saturation)", re.I)),
+    ("deadlock", re.compile(r"deadlock|lock wait timeout", re.I)),
+    ("db_timeout", re.compile(r"(database|query|connection) timeout|timeout: exceeded", re.I)),
+    ("gateway_timeout", re.compile(r"gateway timeout", re.I)),
+    ("service_unavailable", re.compile(r"service (degraded|unavailable|temporarily unavailable)|unhealthy", re.I)),
+    ("server_error", re.compile(r"internal server error", re.I)),
+    ("out_of_memory", re.compile(r"out of memory|killed process", re.I)),
+    ("disk_full", re.compile(r"no space left|disk usage", re.I)),
+    ("port_conflict", re.compile(r"address already in use", re.I)),
+    ("slow_query", re.compile(r"slow_query|table scan|duration=", re.I)),
+    ("auth_failure", re.compile(r"invalid credentials|unauthorized|too many login|insufficient permissions", re.I)),
+]
+
+
+def classify_signature(record: Dict) -> str:
+    """Map a record to a service-independent signature (falls back to its template)."""
+    if record["level"] == "SLOW_QUERY":
+        return "slow_query"
+
+    text = f"{record['component']} {record['message']}"
+    for name, pattern in SIGNATURE_PATTERNS:
+        if pattern.search(text):
+            return name
+    return normalize_message(record["message"])[:60]
+
+
+def load_sources(log_files: List[Path], since: str = None, until: str = None) -> Dict[str, List[Dict]]:
+    """Parse each log into time-sorted records of interest."""
+    sources = {}
+    for log_file in log_files:
+        log_file = Path(log_file)
+        records = parse_log_records(read_log_range(log_file, since, until), source=log_file.stem)
+        records = [r for r in records if r["time"] and r["level"] in CORRELATION_LEVELS]
+        records.sort(key=lambda r: r["time"])
+        sources[log_file.stem] = records
+        logger.info(f"Loaded {len(records)} records from {log_file.name}")
+    return sources
+
+
+def correlate(sources: Dict[str, List[Dict]], window_seconds: int = WINDOW_SECONDS) -> Dict:
+    """
+    Merge-join all sources on time into episodes (records no more than
+    window_seconds apart) and cluster signatures that co-occur across services.
+    Only signatures shared inside one episode ("shared") link services causally;
+    the clusters are totals over all episodes.
+    """
+    merged = heapq.merge(*sources.values(), key=lambda r: r["time"])
+
+    episodes = []
+    for record in merged:
+        record["signature"] = classify_signature(record)
+        if episodes and (record["time"] - episodes[-1]["end"]).total_seconds() <= window_seconds:
+            episodes[-1]["records"].append(record)
+            episodes[-1]["end"] = record["time"]
+        else:
+            episodes.append({"start": record["time"], "end": record["time"], "records": [record]})
+
+    # Signature clusters across all logs
+    clusters = defaultdict(lambda: {"sources": set(), "count": 0, "first": None, "last": None})
+    for episode in episodes:
+        for record in episode["records"]:
+            cluster = clusters[record["signature"]]
+            cluster["sources"].add(record["source"])
+            cluster["count"] += 1
+            cluster["first"] = min(cluster["first"] or record["time"], record["time"])
+            cluster["last"] = max(cluster["last"] or record["time"], record["time"])
+
+    # Signatures that show up together in one episode on different services
+    co_occurrence = Counter()
+    for episode in episodes:
+        by_signature = defaultdict(set)
+        for record in episode["records"]:
+            by_signature[record["signature"]].add(record["source"])
+        for a, b in combinations(sorted(by_signature), 2):
+            if len(by_signature[a] | by_signature[b]) > 1:
+                co_occurrence[(a, b)] += 1
+
+    for episode in episodes:
+        episode["sources"] = sorted({r["source"] for r in episode["records"]})
+        episode["shared"] = _shared_signatures(episode)
+
+    return {"sources": sorted(sources), "episodes": episodes, "clusters": dict(clusters), "co_occurrence": co_occurrence}
+
+
+def format_timeline(correlation: Dict, max_lines_per_episode: int = 30) -> str:
+    """
+    Compact correlated timeline.
+    Event lines keep the 'YYYY-MM-DD HH:MM:SS [LEVEL] ...' shape so triage,
+    window extraction and fingerprinting work on it like on any other log.
+    """
+    lines = [f"CORRELATED TIMELINE ({', '.join(correlation['sources'])})", ""]
+
+    # Signatures shared by services inside one episode first: candidates for the causal chain
+    shared = [(i, name, examples) for i, episode in enumerate(correlation["episodes"], 1)
+              for name, examples in episode["shared"].items()]
+    if shared:
+        lines.append("Signatures seen on more than one service in the same episode:")
+        for i, name, examples in shared:
+            lines.append(f"- Episode {i}, {name}: {', '.join(sorted(examples))}")
+            # One example per service: a signature can group different messages
+            for source, record in sorted(examples.items()):
+                lines.append(f"    {record['timestamp']} ({source}) {record['message'][:120]}")
+        lines.append("")
+
+    if correlation["co_occurrence"]:
+        lines.append("Co-occurring signatures (same episode):")
+        for (a, b), count in correlation["co_occurrence"].most_common(10):
+            lines.append(f"- {a} + {b}: {count} episode(s)")
+        lines.append("")
+
+    for i, episode in enumerate(correlation["episodes"], 1):
+        lines.append(f"--- Episode {i}: {_fmt(episode['start'])} → {_fmt(episode['end'])} "
+                     f"[{', '.join(episode['sources'])}] ---")
+
+        # Collapse repeats of the same source + signature (the first message is the example)
+        collapsed = {}
+        for record in episode["records"]:
+            key = (record["source"], record["signature"], record["level"])
+            if key in collapsed:
+                collapsed[key]["count"] += 1
+                collapsed[key]["templates"].add(normalize_message(record["message"]))
+            else:
+                collapsed[key] = {"record": record, "count": 1, "templates": {normalize_message(record["message"])}}
+
+        events = list(collapsed.values())
+        for event in events[:max_lines_per_episode]:
+            record = event["record"]
+            repeat = ""
+            if len(event["templates"]) > 1:
+                repeat = f"  (x{event['count']}, {len(event['templates'])} distinct messages)"
+            elif event["count"] > 1:
+                repeat = f"  (x{event['count']})"
+            lines.append(f"{record['timestamp']} [{record['level']}] ({record['source']}) {record['message']}{repeat}")
+        if len(events) > max_lines_per_episode:
+            lines.append(f"... {len(events) - max_lines_per_episode} more distinct events")
+        lines.append("")
+
+    return "\n".join(lines).strip() + "\n"
+
+
+def _shared_signatures(episode: Dict) -> Dict[str, Dict[str, Dict]]:
+    """Signatures logged by more than one service in this episode → first record per service."""
+    by_signature = defaultdict(dict)
+    for record in episode["records"]:
+        by_signature[record["signature"]].setdefault(record["source"], record)
+    return {name: examples for name, examples in by_signature.items() if len(examples) > 1}
+
+
+def build_correlated_timeline(log_files: List[Path], since: str = None, until: str = None,
+                              window_seconds: int = WINDOW_SECONDS) -> str:
+    """Parse several logs and return one compact correlated timeline."""
+    correlation = correlate(load_sources(log_files, since, until), window_seconds)
+    logger.info(f"Correlated {len(correlation['sources'])} logs into {len(correlation['episodes'])} episodes")
+    return format_timeline(correlation)
+
+
+def _fmt(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S")
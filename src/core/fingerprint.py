@@ -0,0 +1,64 @@
+"""
+Incident Fingerprinting
+Stable signature of a log's failures, independent of timestamps, ids and counters
+"""
+import hashlib
+import re
+from typing import Dict, List
+from .log_parser import parse_log_records
+
+FINGERPRINT_LEVELS = {"ERROR", "CRITICAL", "SLOW_QUERY"}
+# Minor logs (warnings / 4xx only) are fingerprinted by their warning templates instead
+FALLBACK_LEVELS = {"WARNING"}
+
+# Order matters: specific patterns before the generic number rule
+NORMALIZE_RULES = [
+    (re.compile(r'"[^"]*"|\'[^\']*\''), "<str>"),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "<uuid>"),
+    (re.compile(r"\b0x[0-9a-f]+\b", re.I), "<hex>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<ip>"),
+    (re.compile(r"\b[A-Z]{2,}-\d+\b"), "<id>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+]
+
+# ConnectionTimeout, psycopg2.OperationalError, AttributeError, NullPointerException ...
+ERROR_TYPE_RE = re.compile(r"\b((?:[a-z_][\w]*\.)*[A-Z]\w*(?:Error|Exception|Timeout))\b")
+
+
+def normalize_message(message: str) -> str:
+    """Replace variable parts of a message with placeholders."""
+    template = message.strip()
+    for pattern, placeholder in NORMALIZE_RULES:
+        template = pattern.sub(placeholder, template)
+    return re.sub(r"\s+", " ", template).lower()
+
+
+def extract_error_types(text: str) -> List[str]:
+    """Exception / error class names mentioned in text."""
+    return sorted(set(ERROR_TYPE_RE.findall(text)))
+
+
+def incident_fingerprint(log_content: str) -> Dict:
+    """
+    Fingerprint = hash of the sorted set of error templates and error types.
+    Two logs with the same failures on different days share a fingerprint.
+    A log without any signature gets an empty fingerprint and must not be cached.
+    """
+    records = parse_log_records(log_content)
+
+    signatures = _signatures(records, FINGERPRINT_LEVELS) or _signatures(records, FALLBACK_LEVELS)
+    digest = hashlib.sha256("\n".join(signatures).encode("utf-8")).hexdigest()[:16] if signatures else ""
+
+    return {"fingerprint": digest, "signatures": signatures}
+
+
+def _signatures(records: List[Dict], levels: set) -> List[str]:
+    """Sorted templates (level|component|message) and error types of the records at these levels."""
+    signatures = set()
+    for record in records:
+        if record["level"] not in levels:
+            continue
+        signatures.add(f"{record['level']}|{record['component']}|{normalize_message(record['message'])}")
+        for error_type in extract_error_types("\n".join([record["message"]] + record["continuation"])):
+            signatures.add(f"TYPE|{error_type}")
+    return sorted(signatures)
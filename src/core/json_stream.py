@@ -0,0 +1,146 @@
+"""
+JSON Stream
+Incremental parser over streamed LLM tokens: yields each object of a JSON array
+(top-level, or under a key such as "critical_errors") as soon as it closes, so
+items are validated while the rest of the response is still being generated.
+Only plain-text responses stream this way: native structured output arrives in one piece
+"""
+import json
+import os
+from typing import Callable, Dict, Iterable, List
+from dotenv import load_dotenv
+from .testcase_schema import repair_json
+from .logger import get_logger
+
+load_dotenv()
+
+logger = get_logger("json_stream")
+
+# on: stream LLM responses and stop early on invalid / enough items | off: wait for the full response
+STREAM_PARSE = os.getenv("STREAM_PARSE", "on").lower() not in ("off", "0", "false")
+
+
+class JsonItemStream:
+    def __init__(self, key: str = None, start_marker: str = None):
+        """
+        Track the objects of one JSON array across chunks.
+        key=None → the first top-level array; key="critical_errors" → the array under that key.
+        start_marker: ignore everything before it (e.g. "```json" after a prose report).
+        """
+        self.key = key
+        self.start_marker = start_marker
+        self.text = ""
+        self.pos = 0
+        self.started = start_marker is None
+
+        self.stack = []              # Open containers: "{" / "["
+        self.in_string = False
+        self.escape = False
+        self.string_start = None
+        self.last_string = None      # Last closed string and where it ended (candidate key)
+        self.last_string_end = None
+        self.target_depth = None     # Stack depth inside the target array
+        self.item_start = None
+        self.closed = False
+
+    def feed(self, chunk: str) -> List:
+        """Add a chunk; returns the items completed by it."""
+        self.text += chunk
+        if not self.started:
+            marker = self.text.find(self.start_marker)
+            if marker == -1:
+                return []
+            self.started = True
+            self.pos = marker + len(self.start_marker)
+
+        items = []
+        while self.pos < len(self.text) and not self.closed:
+            item = self._step(self.text[self.pos])
+            if item is not None:
+                items.append(item)
+            self.pos += 1
+        return items
+
+    def _step(self, ch: str):
+        if self.in_string:
+            if self.escape:
+                self.escape = False
+            elif ch == "\\":
+                self.escape = True
+            elif ch == '"':
+                self.in_string = False
+                self.last_string = self.text[self.string_start + 1:self.pos]
+                self.last_string_end = self.pos
+            return None
+
+        if ch == '"':
+            self.in_string = True
+            self.string_start = self.pos
+        elif ch == "[" and self.target_depth is None and self._at_target():
+            self.stack.append(ch)
+            self.target_depth = len(self.stack)
+        elif ch in "[{":
+            if ch == "{" and self.target_depth == len(self.stack) and self.item_start is None:
+                self.item_start = self.pos
+            self.stack.append(ch)
+        elif ch in "]}" and self.stack:
+            self.stack.pop()
+            if self.target_depth is not None and len(self.stack) == self.target_depth and self.item_start is not None:
+                item_text, self.item_start = self.text[self.item_start:self.pos + 1], None
+                return _load(item_text)
+            if self.target_depth is not None and len(self.stack) < self.target_depth:
+                self.closed = True
+        return None
+
+    def _at_target(self) -> bool:
+        if self.key is None:
+            return not self.stack
+        return (
+            bool(self.stack) and self.stack[-1] == "{"
+            and self.last_string == self.key
+            and self.text[self.last_string_end + 1:self.pos].strip() == ":"
+        )
+
+
+def _load(item_text: str):
+    """Parsed item, or the raw text when even the local repair fails (validation flags it)."""
+    try:
+        return json.loads(item_text)
+    except ValueError:
+        try:
+            return json.loads(repair_json(item_text))
+        except ValueError:
+            return item_text
+
+
+def stream_items(chunks: Iterable[str], key: str = None, start_marker: str = None,
+                 validate: Callable = None, max_items: int = None, on_item: Callable = None) -> Dict:
+    """
+    Consume a token stream, validating each item as soon as it closes.
+    validate(item) → list of errors (empty when valid). Stops early at the first invalid
+    item or once max_items valid items arrived; on_item(item) sees each valid item immediately.
+    Returns {"text", "items", "errors", "stopped": "complete" | "enough" | "invalid"}.
+    """
+    parser = JsonItemStream(key, start_marker)
+    items = []
+    try:
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                errors = validate(item) if validate else []
+                if errors:
+                    logger.warning(f"✂️ Stream stopped at item {len(items) + 1}: {'; '.join(errors)}")
+                    return {"text": parser.text, "items": items, "errors": errors, "stopped": "invalid"}
+
+                items.append(item)
+                if on_item:
+                    on_item(item)
+                if max_items and len(items) >= max_items:
+                    logger.info(f"✂️ Stream stopped after {len(items)} items ({len(parser.text)} chars)")
+                    return {"text": parser.text, "items": items, "errors": [], "stopped": "enough"}
+    finally:
+        # Closing the generator ends the HTTP stream, so the rest is never generated
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+
+    return {"text": parser.text, "items": items, "errors": [], "stopped": "complete"}
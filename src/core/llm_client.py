@@ -6,6 +6,7 @@ import httpx
 from dotenv import load_dotenv
 import time
 from .cost_tracker import calculate_cost
+from .tokens import estimate_tokens
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.llms import Ollama
@@ -15,11 +16,16 @@ load_dotenv() # Load environment variables from .env file
 # Read configuration from .env
 PROVIDER = os.getenv("PROVIDER", "openai")  # Default to openai
 MODEL = os.getenv("MODEL", "gpt-4o-mini") # Default to gpt-4o-mini
+SMALL_MODEL = os.getenv("SMALL_MODEL") or MODEL # Cheap model for minor logs (defaults to MODEL)
+# Model cascade, cheapest first (e.g. "gpt-5-nano,gpt-4o-mini" or "ollama:mistral:latest,gpt-4o-mini")
+CASCADE_MODELS = [m.strip() for m in os.getenv("CASCADE_MODELS", "").split(",") if m.strip()] or [MODEL]
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY","")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY","")
 OLLAMA_HOST = os.getenv("OLLAMA_HOST","http://localhost:11434")
 TIMEOUT = int(os.getenv("TIMEOUT", 60))
 
+PROVIDERS = ("openai", "google", "ollama")
+
 # Type alias for message structure
 Message = Dict[str, str]
 
@@ -43,8 +49,8 @@ def chat(messages: List[Message]) -> Dict:
 
     # Estimate tokens (rough: 1 token ≈ 4 characters)
     prompt_text = " ".join([m["content"] for m in messages])
-    prompt_tokens = len(prompt_text) // 4
-    response_tokens = len(response) // 4
+    prompt_tokens = estimate_tokens(prompt_text)
+    response_tokens = estimate_tokens(response)
     
     # Calculate Cost
     cost = calculate_cost(PROVIDER, MODEL, prompt_tokens, response_tokens)
@@ -145,16 +151,30 @@ def _call_ollama(messages: List[Message]) -> str:
         raise RuntimeError("Ollama returned empty response. Check if Ollama is running ?")
     return data["message"]["content"]
 
-def get_langchain_llm():
+def parse_model_spec(spec: str) -> tuple:
+    """'gpt-5-nano' → (PROVIDER, 'gpt-5-nano'); 'google:gemini-2.5-flash' → ('google', 'gemini-2.5-flash')."""
+    prefix, _, rest = spec.partition(":")
+    if prefix in PROVIDERS and rest:
+        return prefix, rest
+    return PROVIDER, spec  # Ollama tags such as mistral:latest stay intact
+
+
+def get_langchain_llm(model: str = None, provider: str = None, temperature: float = 0, tier: int = None):
     """
         Returns Langchain LLM wrapper based on .env PROVIDER.
         Used by agents_v2/ (Langchain-based agents).
+        Pass model to override .env MODEL (e.g. SMALL_MODEL), provider to override PROVIDER,
+        or tier for a CASCADE_MODELS entry (0 = cheapest, clamped to the last tier).
         """
-    if PROVIDER == "openai":
-        return ChatOpenAI(model=MODEL, temperature=0, api_key=OPENAI_API_KEY)
-    elif PROVIDER == "google":
-        return ChatGoogleGenerativeAI(model=MODEL, temperature=0, google_api_key=GOOGLE_API_KEY)
-    elif PROVIDER == "ollama":
-        return Ollama(model=MODEL, temperature=0, base_url=OLLAMA_HOST)
+    if tier is not None:
+        provider, model = parse_model_spec(CASCADE_MODELS[min(tier, len(CASCADE_MODELS) - 1)])
+    model = model or MODEL
+    provider = provider or PROVIDER
+    if provider == "openai":
+        return ChatOpenAI(model=model, temperature=temperature, api_key=OPENAI_API_KEY)
+    elif provider == "google":
+        return ChatGoogleGenerativeAI(model=model, temperature=temperature, google_api_key=GOOGLE_API_KEY)
+    elif provider == "ollama":
+        return Ollama(model=model, temperature=temperature, base_url=OLLAMA_HOST)
     else:
-        raise ValueError(f"Unsupported provider: {PROVIDER}")
\ No newline at end of file
+        raise ValueError(f"Unsupported provider: {provider}")
\ No newline at end of file
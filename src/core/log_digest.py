@@ -0,0 +1,123 @@
+"""
+Log Digest
+Pre-aggregated statistics (counts, top message groups, time span, components) that replace raw log lines in prompts
+"""
+import os
+from collections import Counter
+from typing import Dict
+from dotenv import load_dotenv
+from .log_parser import parse_log_records
+from .fingerprint import normalize_message
+
+load_dotenv()
+
+# raw    → agents read the (windowed) log lines
+# digest → agents read the digest plus a few exemplar lines
+PROMPT_MODE = os.getenv("PROMPT_MODE", "raw").lower()
+
+SEVERITY_ORDER = ["CRITICAL", "ERROR", "SLOW_QUERY", "WARNING", "INFO", "DEBUG"]
+DIGEST_LEVELS = {"CRITICAL", "ERROR", "SLOW_QUERY", "WARNING"}
+
+TOP_N_GROUPS = 10
+MAX_EXEMPLARS = 5
+SINGLE_LINE_EXEMPLARS = 2
+EXEMPLAR_CONTINUATION_LINES = 3
+
+
+def build_digest(log_content: str, top_n: int = TOP_N_GROUPS, max_exemplars: int = MAX_EXEMPLARS) -> Dict:
+    """Deterministic counts, top message groups, time span, components and exemplars."""
+    records = parse_log_records(log_content)
+    timed = [r for r in records if r["time"]]
+
+    # Group non-INFO records by level + component + normalized message
+    groups = {}
+    for record in records:
+        if record["level"] not in DIGEST_LEVELS:
+            continue
+        key = (record["level"], record["component"], normalize_message(record["message"]))
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {"level": record["level"], "component": record["component"],
+                           "message": record["message"], "count": 1,
+                           "first": record["timestamp"], "last": record["timestamp"], "exemplar": record}
+        else:
+            group["count"] += 1
+            group["last"] = record["timestamp"]
+
+    ranked = sorted(groups.values(), key=lambda g: (_severity_rank(g["level"]), -g["count"], g["first"]))
+
+    components = Counter(r["component"] for r in records if r["level"] in DIGEST_LEVELS and r["component"])
+    statuses = Counter(f"{r['status'] // 100}xx" for r in records if r["status"] is not None)
+
+    return {
+        "records": len(records),
+        "level_counts": dict(Counter(r["level"] for r in records)),
+        "status_counts": dict(statuses),
+        "first_timestamp": timed[0]["timestamp"] if timed else None,
+        "last_timestamp": timed[-1]["timestamp"] if timed else None,
+        "duration_s": int((timed[-1]["time"] - timed[0]["time"]).total_seconds()) if timed else 0,
+        "components": components.most_common(),
+        "groups": ranked[:top_n],
+        "other_groups": max(0, len(ranked) - top_n),
+        "exemplars": _exemplars(ranked, max_exemplars)
+    }
+
+
+def format_digest(digest: Dict) -> str:
+    """Compact text digest for prompts."""
+    levels = digest["level_counts"]
+    lines = [
+        "LOG DIGEST (exact counts computed from every line - do not recount)",
+        f"Time span: {digest['first_timestamp']} → {digest['last_timestamp']} ({digest['duration_s']}s)",
+        f"Entries: {digest['records']} | " + ", ".join(
+            f"{level}: {levels[level]}" for level in SEVERITY_ORDER if levels.get(level))
+    ]
+    if digest["status_counts"]:
+        lines.append("HTTP status: " + ", ".join(f"{k}: {v}" for k, v in sorted(digest["status_counts"].items())))
+    if digest["components"]:
+        lines.append("Affected components: " + ", ".join(f"{c} ({n})" for c, n in digest["components"]))
+
+    lines.append("")
+    lines.append("Top message groups (level | count | first [→ last] | component | message):")
+    for g in digest["groups"]:
+        seen = g["first"] if g["count"] == 1 else f"{g['first']} → {g['last']}"
+        lines.append(f"- {g['level']} | {g['count']}x | {seen} | {g['component'] or '-'} | {g['message'][:120]}")
+    if digest["other_groups"]:
+        lines.append(f"- ... {digest['other_groups']} more groups")
+    if not digest["groups"]:
+        lines.append("- none")
+
+    if digest["exemplars"]:
+        lines.append("")
+        lines.append("Exemplar lines (first occurrence, verbatim):")
+        for exemplar in digest["exemplars"]:
+            lines.append(exemplar)
+
+    return "\n".join(lines)
+
+
+def log_digest(log_content: str) -> str:
+    """Build and format the digest in one call."""
+    return format_digest(build_digest(log_content))
+
+
+def _exemplars(ranked, max_exemplars: int):
+    """
+    Group lines already carry the message; exemplars add the multi-line context (tracebacks etc.).
+    Single-line logs have no such context, so their top groups get one verbatim line each.
+    """
+    multi_line = [_exemplar_lines(g["exemplar"]) for g in ranked if g["exemplar"]["continuation"]]
+    if multi_line:
+        return multi_line[:max_exemplars]
+    return [_exemplar_lines(g["exemplar"]) for g in ranked[:min(SINGLE_LINE_EXEMPLARS, max_exemplars)]]
+
+
+def _severity_rank(level: str) -> int:
+    return SEVERITY_ORDER.index(level) if level in SEVERITY_ORDER else len(SEVERITY_ORDER)
+
+
+def _exemplar_lines(record: Dict) -> str:
+    """Original line (re-assembled) plus the first continuation lines, e.g. a traceback head."""
+    tag = f"[{record['component']}] " if record["component"] else ""
+    head = f"{record['timestamp']} {record['level']} {tag}{record['message']}"
+    return "\n".join([head] + record["continuation"][:EXEMPLAR_CONTINUATION_LINES])
@@ -0,0 +1,165 @@
+"""
+Sparse Timestamp Index
+Sidecar index (timestamp → byte offset every N KB) for fast time-range reads of large logs
+"""
+from bisect import bisect_left
+import hashlib
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from .log_parser import TIMESTAMP_FORMAT, parse_timestamp
+from .logger import get_logger
+
+logger = get_logger("log_index")
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx.json"
+INDEX_INTERVAL_BYTES = 64 * 1024
+HEAD_BYTES = 4096  # Used to detect rotated / rewritten files
+
+TIMESTAMP_BYTES_RE = re.compile(rb"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})")
+
+
+def index_path(log_file: Path) -> Path:
+    """Sidecar path: app.log → app.log.idx.json"""
+    log_file = Path(log_file)
+    return log_file.with_name(log_file.name + INDEX_SUFFIX)
+
+
+def get_index(log_file: Path, interval: int = INDEX_INTERVAL_BYTES) -> Dict:
+    """Load the sidecar index, building it on first use and extending it when the log grew."""
+    log_file = Path(log_file)
+    size = log_file.stat().st_size
+    head = _head_hash(log_file)
+
+    index = _load(log_file)
+    if index and index["head"] == head and index["interval"] == interval and size >= index["scanned_to"]:
+        if size == index["scanned_to"]:
+            return index
+        logger.info(f"Updating index for {log_file.name} ({index['scanned_to']} → {size} bytes)")
+    else:
+        logger.info(f"Building index for {log_file.name} ({size} bytes)")
+        index = {"version": INDEX_VERSION, "interval": interval, "head": head, "scanned_to": 0, "entries": []}
+
+    _scan(log_file, index)
+    _save(log_file, index)
+    return index
+
+
+def parse_time_arg(value: Optional[str], reference: Optional[datetime] = None,
+                   end: bool = False) -> Optional[datetime]:
+    """
+    Parse --since/--until values.
+    Accepts "YYYY-MM-DD HH:MM[:SS]" or "HH:MM[:SS]" (date taken from reference).
+    With end=True a value without seconds covers the whole minute (14:20 → 14:20:59).
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    for fmt in (TIMESTAMP_FORMAT, "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M", "%H:%M:%S", "%H:%M"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+
+        if not fmt.startswith("%Y"):
+            base = reference or datetime.now()
+            parsed = datetime.combine(base.date(), parsed.time())
+        if end and not fmt.endswith("%S"):
+            parsed = parsed.replace(second=59)
+        return parsed
+
+    raise ValueError(f"Invalid time '{value}'. Use 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'.")
+
+
+def read_log_range(log_file: Path, since: str = None, until: str = None) -> str:
+    """
+    Read only the records between since and until (inclusive).
+    Seeks straight to the nearest indexed offset instead of reading the whole file.
+    """
+    log_file = Path(log_file)
+    if not since and not until:
+        return log_file.read_text(encoding="utf-8")
+
+    index = get_index(log_file)
+    entries = index["entries"]
+    reference = parse_timestamp(entries[0][0]) if entries else None
+    start_time = parse_time_arg(since, reference)
+    end_time = parse_time_arg(until, reference, end=True)
+
+    # Last indexed point strictly before the range start
+    offset = 0
+    if start_time:
+        position = bisect_left([e[0] for e in entries], start_time.strftime(TIMESTAMP_FORMAT))
+        offset = entries[position - 1][1] if position > 0 else 0
+
+    lines = []
+    including = start_time is None
+
+    with open(log_file, "rb") as f:
+        f.seek(offset)
+        for raw in f:
+            match = TIMESTAMP_BYTES_RE.match(raw)
+            if match:
+                ts = parse_timestamp(match.group(1).decode())
+                if ts:
+                    if start_time and not including and ts >= start_time:
+                        including = True
+                    if end_time and ts > end_time:
+                        break
+            if including:
+                lines.append(raw.decode("utf-8", errors="replace"))
+
+    logger.info(f"Read {len(lines)} lines from {log_file.name} ({since or 'start'} → {until or 'end'}, "
+                f"seek offset {offset})")
+    return "".join(lines)
+
+
+def _scan(log_file: Path, index: Dict):
+    """Scan from scanned_to, adding an entry every `interval` bytes."""
+    entries = index["entries"]
+    last_entry_offset = entries[-1][1] if entries else -index["interval"]
+    offset = index["scanned_to"]
+
+    with open(log_file, "rb") as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # Partial last line, pick it up on the next update
+
+            if offset - last_entry_offset >= index["interval"]:
+                match = TIMESTAMP_BYTES_RE.match(raw)
+                if match:
+                    entries.append([match.group(1).decode(), offset])
+                    last_entry_offset = offset
+
+            offset += len(raw)
+
+    index["scanned_to"] = offset
+
+
+def _head_hash(log_file: Path) -> str:
+    with open(log_file, "rb") as f:
+        return hashlib.sha1(f.read(HEAD_BYTES)).hexdigest()
+
+
+def _load(log_file: Path) -> Optional[Dict]:
+    path = index_path(log_file)
+    if not path.exists():
+        return None
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+        return index if index.get("version") == INDEX_VERSION else None
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def _save(log_file: Path, index: Dict):
+    try:
+        index_path(log_file).write_text(json.dumps(index), encoding="utf-8")
+    except OSError as e:
+        # Read-only log directories still work, just without a persisted index
+        logger.warning(f"Could not save index for {log_file.name}: {e}")
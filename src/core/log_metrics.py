@@ -0,0 +1,203 @@
+"""
+Log Metrics
+Vectorized numeric analysis of access and slow-query logs (percentiles, error bursts, outliers)
+"""
+import re
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from .log_parser import parse_log_records
+from .fingerprint import normalize_message
+
+ERROR_LEVELS = {"ERROR", "CRITICAL"}
+
+BURST_WINDOW = "60s"
+BURST_MIN_ERRORS = 3
+OUTLIER_Z = 3.5      # Robust z-score (median / MAD) threshold
+MAX_TABLE_ROWS = 8
+
+DURATION_RE = re.compile(r"\bduration=(\d+(?:\.\d+)?)(ms|s)\b")
+ROWS_RE = re.compile(r"\brows=(\d+)\b")
+QUERY_RE = re.compile(r'\bquery="(.*)"')
+
+# /api/v1/users/123 → /api/v1/users/{id}
+PATH_ID_RE = re.compile(r"/(?:\d+|[0-9a-f]{8}-[0-9a-f-]{27}|[0-9a-f]{16,})(?=/|$)", re.I)
+
+
+def build_frames(log_content: str) -> Dict[str, pd.DataFrame]:
+    """Records → DataFrames: all timed records, access requests and slow queries."""
+    records = [r for r in parse_log_records(log_content) if r["time"]]
+
+    events = pd.DataFrame({
+        "time": [r["time"] for r in records],
+        "is_error": [r["level"] in ERROR_LEVELS for r in records]
+    })
+
+    access = pd.DataFrame([
+        {"time": r["time"], "endpoint": PATH_ID_RE.sub("/{id}", r["component"]),
+         "status": r["status"], "latency_ms": r["latency_ms"]}
+        for r in records if r["status"] is not None
+    ], columns=["time", "endpoint", "status", "latency_ms"])
+
+    queries = []
+    for r in records:
+        duration = DURATION_RE.search(r["message"]) if r["level"] == "SLOW_QUERY" else None
+        if not duration:
+            continue
+        value, unit = float(duration.group(1)), duration.group(2)
+        rows = ROWS_RE.search(r["message"])
+        query = QUERY_RE.search(r["message"])
+        queries.append({
+            "time": r["time"],
+            "query": normalize_message(query.group(1) if query else r["message"])[:60],
+            "duration_ms": value * 1000 if unit == "s" else value,
+            "rows": int(rows.group(1)) if rows else np.nan
+        })
+    queries = pd.DataFrame(queries, columns=["time", "query", "duration_ms", "rows"])
+
+    return {"events": events, "access": access, "queries": queries}
+
+
+def percentile_table(df: pd.DataFrame, key: str, value: str) -> pd.DataFrame:
+    """Per-key count and p50/p95/p99 of value, slowest p95 first."""
+    grouped = df.groupby(key)[value]
+    table = pd.DataFrame({
+        "count": grouped.count(),
+        "p50": grouped.quantile(0.50),
+        "p95": grouped.quantile(0.95),
+        "p99": grouped.quantile(0.99),
+        "max": grouped.max()
+    })
+    return table.sort_values("p95", ascending=False)
+
+
+def find_error_bursts(events: pd.DataFrame, window: str = BURST_WINDOW,
+                      min_errors: int = BURST_MIN_ERRORS) -> List[Dict]:
+    """Sliding-window error counts; consecutive hot windows are merged into one burst."""
+    if events.empty or not events["is_error"].any():
+        return []
+
+    series = events.sort_values("time").set_index("time")["is_error"].astype(int)
+    windows = pd.DataFrame({"errors": series.rolling(window).sum()})
+    windows["rate"] = windows["errors"] / series.rolling(window).count()
+
+    hot = (windows["errors"] >= min_errors).to_numpy()
+    if not hot.any():
+        return []
+
+    bursts = []
+    block_ids = np.cumsum(np.r_[True, hot[1:] != hot[:-1]])[hot]
+    for _, block in windows[hot].groupby(block_ids):
+        end = block.index[-1]
+        span = series.loc[block.index[0] - pd.Timedelta(window):end]
+        bursts.append({
+            "start": span.index[span.to_numpy() == 1][0],
+            "end": end,
+            "errors": int(span.sum()),
+            "events": int(len(span)),
+            "peak_errors": int(block["errors"].max()),
+            "peak_rate": float(block["rate"].max())
+        })
+
+    return bursts
+
+
+def find_outliers(df: pd.DataFrame, value: str, label: str, threshold: float = OUTLIER_Z) -> List[Dict]:
+    """Values far from the median using the robust (MAD-based) z-score."""
+    if len(df) < 3:
+        return []
+
+    values = df[value].to_numpy(dtype=float)
+    median = np.median(values)
+    mad = np.median(np.abs(values - median))
+    if mad == 0:
+        mad = np.mean(np.abs(values - median)) * 1.2533  # ≈ MAD for normal data
+    if mad == 0:
+        return []
+
+    z = 0.6745 * (values - median) / mad
+    flagged = df.assign(z=z)[z > threshold].sort_values(value, ascending=False)
+
+    return [
+        {"time": row.time, "label": getattr(row, label), "value": getattr(row, value), "z": row.z}
+        for row in flagged.itertuples()
+    ]
+
+
+def extract_log_metrics(log_content: str) -> Dict:
+    """Compute all numeric findings for one log."""
+    frames = build_frames(log_content)
+    access, queries = frames["access"], frames["queries"]
+
+    metrics = {"requests": len(access), "slow_queries": len(queries)}
+
+    if not access.empty:
+        access = access.assign(is_5xx=access["status"] >= 500)
+        endpoints = percentile_table(access, "endpoint", "latency_ms")
+        endpoints["error_rate"] = access.groupby("endpoint")["is_5xx"].mean()
+        metrics["endpoints"] = endpoints
+        metrics["latency_outliers"] = find_outliers(access, "latency_ms", "endpoint")
+
+    if not queries.empty:
+        query_table = percentile_table(queries, "query", "duration_ms")
+        query_table["max_rows"] = queries.groupby("query")["rows"].max()
+        metrics["queries"] = query_table
+        metrics["duration_outliers"] = find_outliers(queries, "duration_ms", "query")
+
+    metrics["bursts"] = find_error_bursts(frames["events"])
+    return metrics
+
+
+def top_endpoints(endpoints: pd.DataFrame, max_rows: int = MAX_TABLE_ROWS) -> pd.DataFrame:
+    """Every endpoint with 5xx responses (highest rate first), then the slowest p95 up to max_rows."""
+    failing = endpoints[endpoints["error_rate"] > 0].sort_values(["error_rate", "p95"], ascending=False)
+    healthy = endpoints[~(endpoints["error_rate"] > 0)]
+    return pd.concat([failing, healthy.head(max(0, max_rows - len(failing)))])
+
+
+def format_metrics(metrics: Dict, max_rows: int = MAX_TABLE_ROWS) -> str:
+    """Small plain-text table for the analysis prompt ('' when there is nothing numeric)."""
+    lines = []
+
+    if "endpoints" in metrics:
+        lines.append(f"Endpoint latency ({metrics['requests']} requests, ms):")
+        lines.append("endpoint | count | p50 | p95 | p99 | max | 5xx rate")
+        shown = top_endpoints(metrics["endpoints"], max_rows)
+        for endpoint, row in shown.iterrows():
+            lines.append(f"{endpoint} | {row['count']:.0f} | {row['p50']:.0f} | {row['p95']:.0f} | "
+                         f"{row['p99']:.0f} | {row['max']:.0f} | {row['error_rate']:.0%}")
+        if len(metrics["endpoints"]) > len(shown):
+            lines.append(f"... {len(metrics['endpoints']) - len(shown)} more endpoints (no 5xx, lower p95)")
+        lines.append("")
+
+    if "queries" in metrics:
+        lines.append(f"Slow queries ({metrics['slow_queries']} total, duration in s):")
+        lines.append("query | count | p50 | p95 | p99 | max | max rows")
+        for query, row in metrics["queries"].head(max_rows).iterrows():
+            max_rows_value = "-" if pd.isna(row["max_rows"]) else f"{row['max_rows']:.0f}"
+            lines.append(f"{query} | {row['count']:.0f} | {row['p50'] / 1000:.1f} | {row['p95'] / 1000:.1f} | "
+                         f"{row['p99'] / 1000:.1f} | {row['max'] / 1000:.1f} | {max_rows_value}")
+        lines.append("")
+
+    outliers = metrics.get("latency_outliers", []) + metrics.get("duration_outliers", [])
+    if outliers:
+        lines.append(f"Outliers (robust z > {OUTLIER_Z}):")
+        for o in outliers[:max_rows]:
+            lines.append(f"- {o['time']:%H:%M:%S} {o['label']}: {o['value']:.0f}ms (z={o['z']:.1f})")
+        lines.append("")
+
+    if metrics.get("bursts"):
+        lines.append(f"Error bursts (≥{BURST_MIN_ERRORS} errors within {BURST_WINDOW}):")
+        for b in metrics["bursts"][:max_rows]:
+            lines.append(f"- {b['start']:%H:%M:%S} → {b['end']:%H:%M:%S}: {b['errors']}/{b['events']} events failed "
+                         f"(peak {b['peak_errors']} errors, {b['peak_rate']:.0%})")
+        lines.append("")
+
+    if not lines:
+        return ""
+    return "PRE-COMPUTED METRICS (exact, from every line of the log):\n" + "\n".join(lines).strip()
+
+
+def log_metrics_table(log_content: str) -> str:
+    """Metrics table for a log, '' when there is nothing numeric to report."""
+    return format_metrics(extract_log_metrics(log_content))
@@ -0,0 +1,133 @@
+"""
+Log Parser
+Deterministic parsing of the log formats in data/logs into records
+"""
+import re
+from datetime import datetime
+from typing import List, Dict, Optional
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Every supported format starts with "YYYY-MM-DD HH:MM:SS"
+TIMESTAMP_RE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s+(.*)$")
+
+# 2026-01-04 10:24:12 ERROR [payment] Payment processing failed
+LEVEL_FIRST_RE = re.compile(r"^(DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL|FATAL)\s+(?:\[([^\]]+)\]\s*)?(.*)$")
+
+# 2026-01-08 14:15:23 [ERROR] Database connection timeout   /   [kernel] Out of memory
+BRACKET_RE = re.compile(r"^\[([^\]]+)\]\s*(.*)$")
+
+# 2026-01-04 14:15:23 GET /api/v1/users/123 200 45ms ...
+ACCESS_RE = re.compile(r"^(GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS)\s+(\S+)\s+(\d{3})\s+(\d+)ms\b(.*)$")
+
+# [disk] ERROR: Cannot write to disk
+INLINE_LEVEL_RE = re.compile(r"^(DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL|FATAL):\s*(.*)$")
+
+LEVEL_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}
+KNOWN_LEVELS = {"DEBUG", "INFO", "WARN", "WARNING", "ERROR", "CRITICAL", "FATAL", "SLOW_QUERY"}
+
+# Messages without an explicit level that still indicate failure
+CRITICAL_HINTS = re.compile(r"out of memory|killed process|crash|fatal|sigsegv|marked as failed", re.I)
+ERROR_HINTS = re.compile(r"failed|exception|error|unhealthy|no space left|timeout", re.I)
+
+
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """Parse a 'YYYY-MM-DD HH:MM:SS' timestamp, None if invalid."""
+    try:
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_log_records(log_content: str, source: str = "") -> List[Dict]:
+    """
+    Parse log text into records.
+
+    Each record: timestamp, time, level, component, message, status,
+    latency_ms, line_no, source and continuation (traceback lines etc.).
+    Lines without a timestamp are attached to the previous record.
+    """
+    records = []
+    current = None
+
+    for line_no, line in enumerate(log_content.splitlines(), 1):
+        match = TIMESTAMP_RE.match(line)
+
+        if not match:
+            if current is not None and line.strip():
+                current["continuation"].append(line)
+            continue
+
+        current = _parse_line(match.group(1), match.group(2), line_no, source)
+        records.append(current)
+
+    return records
+
+
+def _parse_line(timestamp: str, rest: str, line_no: int, source: str) -> Dict:
+    """Parse the part of a log line after the timestamp."""
+    record = {
+        "timestamp": timestamp,
+        "time": parse_timestamp(timestamp),
+        "level": "INFO",
+        "component": "",
+        "message": rest.strip(),
+        "status": None,
+        "latency_ms": None,
+        "line_no": line_no,
+        "source": source,
+        "continuation": []
+    }
+
+    # Access log line
+    access = ACCESS_RE.match(rest)
+    if access:
+        method, path, status, latency, _ = access.groups()
+        status = int(status)
+        record["component"] = path
+        record["status"] = status
+        record["latency_ms"] = int(latency)
+        record["level"] = "ERROR" if status >= 500 else "WARNING" if status >= 400 else "INFO"
+        return record
+
+    # "LEVEL [component] message"
+    level_first = LEVEL_FIRST_RE.match(rest)
+    if level_first:
+        level, component, message = level_first.groups()
+        record["level"] = LEVEL_ALIASES.get(level, level)
+        record["component"] = component or ""
+        record["message"] = message.strip()
+        return record
+
+    # "[LEVEL] message" or "[component] message"
+    bracket = BRACKET_RE.match(rest)
+    if bracket:
+        tag, message = bracket.groups()
+        if tag.upper() in KNOWN_LEVELS:
+            record["level"] = LEVEL_ALIASES.get(tag.upper(), tag.upper())
+            if record["level"] == "SLOW_QUERY":
+                record["component"] = "database"
+        else:
+            record["component"] = tag
+            record["level"] = _infer_level(message)
+        record["message"] = message.strip()
+        inline = INLINE_LEVEL_RE.match(record["message"])
+        if inline:
+            record["level"] = LEVEL_ALIASES.get(inline.group(1), inline.group(1))
+            record["message"] = inline.group(2).strip()
+        return record
+
+    record["level"] = _infer_level(rest)
+    return record
+
+
+def _infer_level(message: str) -> str:
+    """Infer level for lines that carry no explicit level."""
+    inline = INLINE_LEVEL_RE.match(message.strip())
+    if inline:
+        return LEVEL_ALIASES.get(inline.group(1), inline.group(1))
+    if CRITICAL_HINTS.search(message):
+        return "CRITICAL"
+    if ERROR_HINTS.search(message):
+        return "ERROR"
+    return "INFO"
@@ -0,0 +1,91 @@
+"""
+Error Window Extraction
+Keeps only the log regions around errors so prompts scale with incidents, not log length
+"""
+import re
+from typing import List, Tuple
+
+# Lines that anchor a window: explicit error levels, slow queries, 5xx responses, tracebacks
+ANCHOR_RE = re.compile(
+    r"\b(ERROR|CRITICAL|FATAL|SLOW_QUERY)\b"
+    r"|Traceback \(most recent call last\)"
+    r"|\s5\d\d\s+\d+ms\b"
+)
+
+# Used only when a log has no error anchors at all
+WARNING_RE = re.compile(r"\b(WARN|WARNING)\b|\s4\d\d\s+\d+ms\b")
+
+TIMESTAMP_PREFIX_RE = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\s+")
+
+CONTEXT_LINES = 3
+MAX_CONTINUATION_LINES = 20  # Traceback / multi-line record lines kept after an anchor
+
+
+def find_anchors(lines: List[str]) -> List[int]:
+    """Indexes of anchor lines (falls back to warnings when there are no errors)."""
+    anchors = [i for i, line in enumerate(lines) if ANCHOR_RE.search(line)]
+    if not anchors:
+        anchors = [i for i, line in enumerate(lines) if WARNING_RE.search(line)]
+    return anchors
+
+
+def merge_windows(anchors: List[int], context_lines: int, lines: List[str]) -> List[Tuple[int, int]]:
+    """Turn anchors into [start, end] windows, merging overlapping/adjacent ones."""
+    windows = []
+    for i in anchors:
+        start = max(0, i - context_lines)
+        end = min(len(lines) - 1, _record_end(lines, i) + context_lines)
+
+        if windows and start <= windows[-1][1] + 1:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+
+    return windows
+
+
+def _record_end(lines: List[str], i: int) -> int:
+    """Last line of the record starting at i (follows traceback continuation lines)."""
+    end = i
+    while (end + 1 < len(lines) and end - i < MAX_CONTINUATION_LINES
+           and lines[end + 1].strip() and not TIMESTAMP_PREFIX_RE.match(lines[end + 1])):
+        end += 1
+    return end
+
+
+def extract_error_windows(log_content: str, context_lines: int = CONTEXT_LINES) -> str:
+    """
+    Return only the lines around ERROR/CRITICAL/5xx/slow-query anchors.
+    Windows are separated by a marker showing the original line numbers.
+    """
+    lines = log_content.splitlines()
+    anchors = find_anchors(lines)
+
+    if not anchors:
+        # Nothing interesting: a short head is enough context
+        return "\n".join(lines[:2 * context_lines + 1])
+
+    windows = merge_windows(anchors, context_lines, lines)
+
+    parts = []
+    for start, end in windows:
+        parts.append(f"--- lines {start + 1}-{end + 1} of {len(lines)} ---")
+        parts.extend(line for line in lines[start:end + 1] if line.strip())
+
+    return "\n".join(parts)
+
+
+def extract_anchor_query(log_content: str, max_chars: int = 500) -> str:
+    """Distinct anchor lines (timestamps stripped) for knowledge-base / memory search."""
+    lines = log_content.splitlines()
+
+    seen = set()
+    query_lines = []
+    for i in find_anchors(lines):
+        text = TIMESTAMP_PREFIX_RE.sub("", lines[i]).strip()
+        if text and text not in seen:
+            seen.add(text)
+            query_lines.append(text)
+
+    query = "\n".join(query_lines) or log_content
+    return query[:max_chars]
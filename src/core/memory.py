@@ -2,6 +2,7 @@
 Memory Management for Agents
 Provides short-term (conversation) and long-term (persistent) memory
 """
+import uuid
 from typing import List, Dict
 from datetime import datetime
 from .vector_store import load_vector_store
@@ -63,9 +64,10 @@ class PersistentMemory:
         self.vector_store = load_vector_store()
         logger.info(f"Initialized persistent memory (collection: {collection_name})")
     
-    def store_interaction(self, interaction: str, metadata: Dict = None):
+    def store_interaction(self, interaction: str, metadata: Dict = None) -> str:
         """
         Store an interaction in long-term memory.
+        Every entry is keyed by the embedding of its own text, so all stored vectors share one basis.
         """
         if metadata is None:
             metadata = {}
@@ -75,19 +77,26 @@ class PersistentMemory:
             metadata["timestamp"] = datetime.now().isoformat()
 
         # Store in vector database
+        interaction_id = str(uuid.uuid4())
         self.vector_store.add_texts(
             texts=[interaction],
-            metadatas=[metadata]
+            metadatas=[metadata],
+            ids=[interaction_id]
         )
 
         logger.info(f"Stored interaction in long-term memory")
         logger.debug(f"Metadata: {metadata}")
+        return interaction_id
     
-    def retrieve_similar(self, query: str, top_k: int = 3) -> List[Dict]:
+    def retrieve_similar(self, query: str, top_k: int = 3, embedding: List[float] = None) -> List[Dict]:
         """
         Retrieve similar past interactions.
+        With a precomputed `embedding` the query text is not embedded again.
         """
-        results = self.vector_store.similarity_search_with_score(query, k=top_k)
+        if embedding is not None:
+            results = self.vector_store.similarity_search_by_vector_with_relevance_scores(embedding, k=top_k)
+        else:
+            results = self.vector_store.similarity_search_with_score(query, k=top_k)
 
         retrieved = []
         for doc, score in results:
@@ -100,18 +109,20 @@ class PersistentMemory:
         logger.info(f"Retrieved {len(retrieved)} similar interactions")
         return retrieved
     
-    def get_context(self, query: str, top_k: int = 3) -> str:
-        """Get relevant past interactions as formatted string."""
-        results = self.retrieve_similar(query, top_k)
-
-        if not results:
-            return ""
+    def get_context_items(self, query: str, top_k: int = 3, embedding: List[float] = None) -> List[Dict]:
+        """Relevant past interactions as [{"text", "score"}] (for token-budgeted prompts)."""
+        results = self.retrieve_similar(query, top_k, embedding=embedding)
 
-        context_parts = []
+        context_items = []
         for i, result in enumerate(results, 1):
             timestamp = result["metadata"].get("timestamp", "Unknown")
-            context_parts.append(
-                f"[Past Interaction {i} - {timestamp}]\\n{result['content']}\\n"
-            )
+            context_items.append({
+                "text": f"[Past Interaction {i} - {timestamp}]\\n{result['content']}\\n",
+                "score": result["similarity"]
+            })
 
-        return "\n---\n".join(context_parts)
\ No newline at end of file
+        return context_items
+
+    def get_context(self, query: str, top_k: int = 3, embedding: List[float] = None) -> str:
+        """Get relevant past interactions as formatted string."""
+        return "\n---\n".join(item["text"] for item in self.get_context_items(query, top_k, embedding=embedding))
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""
+Requirement Sections
+Splits a requirement document into independent sections (numbered criteria,
+labelled bullet blocks such as "Edge Cases:") and generates test cases per
+section in parallel, with a result cache entry per section. Test cases that fail
+validation are repaired item by item instead of regenerating the section
+"""
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Set
+from dotenv import load_dotenv
+from .logger import get_logger
+from .testcase_manifest import TestCaseManifest
+from .testcase_schema import parse_test_cases, validate_test_cases
+from .speculative import speculate_batch
+from .json_stream import stream_items, STREAM_PARSE
+from .structured_output import is_structured
+
+load_dotenv()
+
+logger = get_logger("requirement_sections")
+
+# Set REQUIREMENT_SPLIT=off to send the whole document in one prompt
+REQUIREMENT_SPLIT = os.getenv("REQUIREMENT_SPLIT", "on").lower() not in ("off", "0", "false")
+SECTION_CONCURRENCY = int(os.getenv("SECTION_CONCURRENCY", 4))
+
+SECTION_HEADING_RE = re.compile(r"^(\d+)[.)]\s+(\S.*)$")   # "3. Price Range Filter"
+LABEL_RE = re.compile(r"^(\S[^:]{0,60}):\s*$")              # "Edge Cases:", "Expected Error Response (400):"
+BULLET_RE = re.compile(r"^\s*[-*•]\s+")
+
+WHOLE_DOCUMENT_CASES = 5
+
+
+def split_requirement(text: str) -> Dict:
+    """
+    {"context": shared background (feature, user story, API contract, responses),
+     "sections": [{"title", "text", "hash"}]}
+    A document with fewer than two sections comes back as a single section.
+    """
+    blocks = [{"kind": "context", "title": "", "lines": []}]
+    seen_section = False
+
+    for line in text.splitlines():
+        heading = SECTION_HEADING_RE.match(line)
+        if heading:
+            blocks.append({"kind": "section", "title": heading.group(2).strip(), "lines": [line]})
+            seen_section = True
+        elif seen_section and LABEL_RE.match(line):
+            # Labels before the first section ("User Story:", "Request Body:") are plain context
+            blocks.append({"kind": "label", "title": LABEL_RE.match(line).group(1), "lines": [line]})
+        else:
+            blocks[-1]["lines"].append(line)
+
+    sections, context = [], []
+    for block in blocks:
+        body = "\n".join(block["lines"]).strip()
+        if not body:
+            continue
+        has_bullets = any(BULLET_RE.match(line) for line in block["lines"])
+        if block["kind"] == "section" or (block["kind"] == "label" and has_bullets):
+            sections.append(_section(block["title"], body))
+        else:
+            context.append(body)
+
+    if len(sections) < 2:
+        return {"context": "", "sections": [_section("Full requirement", text.strip())]}
+
+    logger.info(f"Split requirement into {len(sections)} sections")
+    return {"context": "\n\n".join(context), "sections": sections}
+
+
+def _section(title: str, text: str) -> Dict:
+    normalized = "\n".join(line.rstrip() for line in text.strip().splitlines())
+    return {"title": title, "text": text, "hash": hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]}
+
+
+def num_cases(section: Dict) -> int:
+    """Roughly one test per two criteria, 2-4 per section (5 for an unsplit document)."""
+    if section["title"] == "Full requirement":
+        return WHOLE_DOCUMENT_CASES
+    criteria = sum(1 for line in section["text"].splitlines() if BULLET_RE.match(line))
+    return max(2, min(4, (criteria + 1) // 2))
+
+
+def section_prompt(context: str, section: Dict, feedback: str = "") -> str:
+    """Shared background + the one section to test (+ the reviewer's reason for a rejection)."""
+    prompt = f"{context}\n\n---\n\nSection to test:\n{section['text']}" if context else section["text"]
+    if feedback:
+        prompt += f"\n\n---\n\nReviewer feedback on the previous test cases (address it):\n{feedback}"
+    return prompt
+
+
+def valid_cases(test_cases) -> bool:
+    """Non-empty and every item passes the TestCase schema."""
+    if not isinstance(test_cases, list) or not test_cases:
+        return False
+    return not validate_test_cases(test_cases)[1]
+
+
+def usable_output(output: str) -> bool:
+    """A raw section response that parses and passes validation."""
+    try:
+        return valid_cases(parse_test_cases(output))
+    except Exception:
+        return False
+
+
+def stream_section(chain, inputs: Dict, count: int) -> str:
+    """
+    Streamed generation of one section: each test case is checked as soon as it closes.
+    Stops after `count` test cases. Malformed JSON aborts the call (an error, so the retry
+    regenerates the section without paying for the rest of the response); well-formed test
+    cases that fail the schema are kept for validate_tests and the targeted repair.
+    """
+    result = stream_items(chain.stream(inputs), validate=_malformed, max_items=count)
+    if result["stopped"] == "invalid":
+        raise ValueError(f"test case {len(result['items']) + 1} malformed: {'; '.join(result['errors'])}")
+    # No top-level array recognised (e.g. a wrapper object): leave it to the normal parser
+    return json.dumps(result["items"]) if result["items"] else result["text"]
+
+
+def _malformed(item) -> List[str]:
+    """Items that are not JSON objects even after repair_json come back as raw text."""
+    return [] if isinstance(item, dict) else [f"not a JSON object: {str(item)[:80]}"]
+
+
+def _stream_batch(chain, inputs: List[Dict], counts: List[int], max_concurrency: int) -> List:
+    """stream_section for every input in parallel; exceptions are returned like chain.batch does."""
+    def run(args):
+        try:
+            return stream_section(chain, *args)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        return list(pool.map(run, zip(inputs, counts)))
+
+
+def merge_sections(sections: List[Dict], results: Dict[int, List[Dict]], manifest=None,
+                   carried: Set[int] = frozenset()) -> List[Dict]:
+    """
+    Concatenate in document order with deterministic IDs.
+    Carried-over sections (indices in `carried`) keep their IDs; the rest get IDs from the manifest
+    (TC-001.. in document order when there is no previous run).
+    """
+    manifest = manifest or TestCaseManifest()
+    merged = []
+    for i, section in enumerate(sections):
+        test_cases = results.get(i, [])
+        if i not in carried:
+            test_cases = manifest.assign_ids(section, test_cases)
+        section["test_ids"] = [case["id"] for case in test_cases]
+        merged.extend({**case, "section": section["title"]} for case in test_cases)
+    return merged
+
+
+def generate_by_section(chain, requirement: str, build_input: Callable[[str, int], Dict],
+                        cache=None, use_cache: bool = True, manifest: TestCaseManifest = None,
+                        candidates: List[Dict] = None, feedback: str = "",
+                        max_concurrency: int = SECTION_CONCURRENCY) -> Dict:
+    """
+    Generate test cases section by section.
+    build_input(section_prompt, num_cases) → chain input. Sections unchanged since the
+    manifest's last approved run are carried over, cached sections are reused, the rest
+    run in parallel via chain.batch, streamed with early stop (STREAM_PARSE, text chains only), or as a race
+    between the speculative candidates when given.
+    Only valid section results are cached, so a retry regenerates just the sections that failed.
+    feedback (a reviewer's rejection reason) is added to every section prompt.
+    Returns {"test_cases", "errors", "sections" ([{title, hash, key, test_ids}]), "carried", "cached"}.
+    """
+    split = split_requirement(requirement) if REQUIREMENT_SPLIT else {
+        "context": "", "sections": [_section("Full requirement", requirement.strip())]
+    }
+    context, sections = split["context"], split["sections"]
+    for section in sections:
+        # Manifest and cache key: a changed context changes every section's key
+        section["key"] = _section_key(context, section)
+    manifest = manifest or TestCaseManifest()
+    manifest.begin(sections)
+
+    results, pending, carried = {}, [], set()
+    for i, section in enumerate(sections):
+        previous = manifest.carried(section) if use_cache else None
+        if previous is not None:
+            results[i] = previous
+            carried.add(i)
+            continue
+
+        key = section["key"]
+        cached = cache.get(key) if cache is not None and use_cache else None
+        if cached:
+            results[i] = cached["value"]["test_cases"]
+        else:
+            pending.append((i, key, section))
+
+    logger.info(f"Sections: {len(sections)} total, {len(carried)} unchanged, "
+                f"{len(results) - len(carried)} cached, {len(pending)} to generate")
+
+    errors = []
+    if pending:
+        inputs = [build_input(section_prompt(context, section, feedback), num_cases(section)) for _, _, section in pending]
+        if candidates:
+            outputs = speculate_batch(candidates, inputs, accept=usable_output)
+        elif STREAM_PARSE and not is_structured(chain):
+            # Native structured output arrives in one piece: streaming it saves nothing
+            counts = [num_cases(section) for _, _, section in pending]
+            outputs = _stream_batch(chain, inputs, counts, max_concurrency)
+        else:
+            outputs = chain.batch(inputs, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+
+        for (i, key, section), output in zip(pending, outputs):
+            try:
+                if isinstance(output, Exception):
+                    raise output
+                test_cases = parse_test_cases(output)
+            except Exception as e:
+                logger.error(f"Section '{section['title']}' failed: {e}")
+                errors.append(f"Section '{section['title']}': {e}")
+                continue
+
+            results[i] = test_cases
+            if cache is not None and valid_cases(test_cases):
+                cache.put(key, {"test_cases": test_cases})
+
+    test_cases = merge_sections(sections, results, manifest, carried)
+    return {
+        "test_cases": test_cases,
+        "errors": errors,
+        "sections": [{key: section[key] for key in ("title", "hash", "key", "test_ids")} for section in sections],
+        "carried": len(carried),
+        "cached": len(sections) - len(pending) - len(carried)
+    }
+
+
+def repair_test_cases(chain, test_cases: List[Dict], invalid: List[Dict], requirement: str) -> Dict:
+    """
+    One LLM call for the invalid items only (each with its validation errors); valid items are kept.
+    chain input: {"requirement": sections the items came from, "items": JSON}. IDs and sections
+    are kept so the manifest still matches. Returns {"test_cases", "repaired", "invalid"}.
+    """
+    titles = {item["test_case"].get("section") for item in invalid if isinstance(item["test_case"], dict)}
+    split = split_requirement(requirement)
+    texts = [section["text"] for section in split["sections"] if section["title"] in titles]
+    source = "\n\n".join(filter(None, [split["context"], *texts])) if texts else requirement
+
+    items = [{"test_case": item["test_case"], "errors": item["errors"]} for item in invalid]
+    fixed = parse_test_cases(chain.invoke({"requirement": source, "items": json.dumps(items, indent=2)}))
+    if len(fixed) != len(invalid):
+        raise ValueError(f"Repair returned {len(fixed)} test cases for {len(invalid)} invalid ones")
+
+    repaired = list(test_cases)
+    for item, case in zip(invalid, fixed):
+        original = item["test_case"] if isinstance(item["test_case"], dict) else {}
+        if isinstance(case, dict):
+            case = {**case, **{key: original[key] for key in ("id", "section") if original.get(key)}}
+        repaired[item["index"]] = case
+
+    still_invalid = validate_test_cases(repaired)[1]
+    logger.info(f"Repaired {len(invalid) - len(still_invalid)}/{len(invalid)} invalid test cases "
+                f"({len(test_cases) - len(invalid)} kept as-is)")
+    return {"test_cases": repaired, "repaired": len(invalid) - len(still_invalid), "invalid": still_invalid}
+
+
+def _section_key(context: str, section: Dict) -> str:
+    """Changes when the section or the shared background changes."""
+    context_hash = hashlib.sha1(context.encode("utf-8")).hexdigest()[:12]
+    return f"{context_hash}:{section['hash']}"
@@ -0,0 +1,119 @@
+"""
+Result Cache
+Persistent SQLite store for analysis results keyed by fingerprint
+"""
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from .logger import get_logger
+
+load_dotenv()
+
+logger = get_logger("result_cache")
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_DB = ROOT / "data" / "cache" / "results.db"
+
+# Set RESULT_CACHE=off to always recompute
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE", "on").lower() not in ("off", "0", "false")
+RESULT_CACHE_TTL_DAYS = int(os.getenv("RESULT_CACHE_TTL_DAYS", 30))
+
+
+class ResultCache:
+    def __init__(self, namespace: str, db_path: Path = CACHE_DB, ttl_days: int = RESULT_CACHE_TTL_DAYS):
+        """
+        Initialize result cache for one pipeline (namespace).
+        """
+        self.namespace = namespace
+        self.db_path = Path(db_path)
+        self.ttl = timedelta(days=ttl_days)
+        self.enabled = RESULT_CACHE_ENABLED
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_hit_at TEXT,
+                    hits INTEGER DEFAULT 0,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the cache thread-safe
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return cached value (with its created_at) or None."""
+        if not self.enabled or not key:
+            return None
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM results WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+            if row is None:
+                logger.info(f"Cache MISS [{self.namespace}] {key}")
+                return None
+
+            value, created_at = row
+            if datetime.now() - datetime.fromisoformat(created_at) > self.ttl:
+                logger.info(f"Cache EXPIRED [{self.namespace}] {key}")
+                return None
+
+            conn.execute(
+                "UPDATE results SET hits = hits + 1, last_hit_at = ? WHERE namespace = ? AND key = ?",
+                (datetime.now().isoformat(), self.namespace, key)
+            )
+
+        logger.info(f"Cache HIT [{self.namespace}] {key}")
+        return {"value": json.loads(value), "created_at": created_at}
+
+    def put(self, key: str, value: Dict):
+        """Store (or replace) a value."""
+        if not self.enabled or not key:
+            return
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (namespace, key, value, created_at, hits) VALUES (?, ?, ?, ?, 0)",
+                (self.namespace, key, json.dumps(value), datetime.now().isoformat())
+            )
+
+        logger.info(f"Cached result [{self.namespace}] {key}")
+
+
+def refresh_cached_analysis(cached: Dict, fingerprint: str, triage: Dict) -> Dict:
+    """
+    Reuse a cached log analysis for a new occurrence of the same incident.
+    Only the timestamp-specific parts are refreshed.
+    """
+    result = cached["value"]
+    start, end = triage.get("first_timestamp"), triage.get("last_timestamp")
+
+    note = (f"[Recurring incident {fingerprint}: analysis reused from {cached['created_at'][:19]}. "
+            f"This occurrence: {start} → {end}]\n\n")
+
+    analysis_json = dict(result.get("analysis_json", {}))
+    analysis_json.update({
+        "fingerprint": fingerprint,
+        "cached_from": cached["created_at"],
+        "time_range": {"start": start, "end": end}
+    })
+
+    return {
+        "analysis_text": note + result.get("analysis_text", ""),
+        "analysis_json": analysis_json,
+        "executive_summary": result.get("executive_summary", "")
+    }
@@ -0,0 +1,129 @@
+"""
+Speculative Generation
+Races K generations per input (different models / providers) concurrently.
+The first result that passes validation wins and the others are cancelled;
+extra candidates are only launched while the estimated cost fits the cap.
+With a model cascade (CASCADE_MODELS) each tier races K samples of its own model,
+so escalating a tier changes the models that run
+"""
+import asyncio
+import os
+from typing import Callable, Dict, List
+from dotenv import load_dotenv
+from .llm_client import get_langchain_llm, parse_model_spec, MODEL, CASCADE_MODELS
+from .cost_tracker import calculate_cost
+from .tokens import estimate_tokens
+from .concurrency import llm_slot
+from .structured_output import testcase_chain
+from .logger import get_logger
+
+load_dotenv()
+
+logger = get_logger("speculative")
+
+SPECULATIVE_MODE = os.getenv("SPECULATIVE_MODE", "off").lower() in ("on", "1", "true")
+SPECULATIVE_K = int(os.getenv("SPECULATIVE_K", 3))
+# Comma-separated, optionally provider-qualified: "gpt-4o-mini,gpt-5-nano,google:gemini-2.5-flash"
+SPECULATIVE_MODELS = [m.strip() for m in os.getenv("SPECULATIVE_MODELS", "").split(",") if m.strip()] or [MODEL]
+SPECULATIVE_MAX_COST = float(os.getenv("SPECULATIVE_MAX_COST", 0.05))  # USD per generation step
+
+OUTPUT_TOKENS = 800          # Expected response size, for the cost estimate
+REPEAT_TEMPERATURE = 0.7     # A model listed fewer times than K reruns with some variety
+
+
+def speculative_candidates(prompt_template, parser, k: int = SPECULATIVE_K,
+                           models: List[str] = SPECULATIVE_MODELS) -> List[Dict]:
+    """K chains cycling through models; the first listed model is the primary candidate."""
+    candidates = []
+    for i in range(k):
+        provider, model = parse_model_spec(models[i % len(models)])
+        temperature = 0 if i < len(models) else REPEAT_TEMPERATURE
+
+        llm = get_langchain_llm(model, provider=provider, temperature=temperature)
+        candidates.append({
+            "name": f"{provider}:{model}" + (f"@{temperature}" if temperature else ""),
+            "provider": provider,
+            "model": model,
+            "chain": testcase_chain(prompt_template, llm, parser)
+        })
+    return candidates
+
+
+def tier_candidates(prompt_template, parser, k: int = SPECULATIVE_K) -> List[List[Dict]]:
+    """
+    Candidates per cascade tier (index = model_tier).
+    Without a cascade: one entry racing SPECULATIVE_MODELS. With one: each tier races
+    K samples of its CASCADE_MODELS entry, so the cascade stats credit the model that ran.
+    """
+    if len(CASCADE_MODELS) < 2:
+        return [speculative_candidates(prompt_template, parser, k)]
+
+    logger.info(f"⚡ Speculative + cascade: each tier races {k} samples of its own model "
+                f"(SPECULATIVE_MODELS not used)")
+    return [speculative_candidates(prompt_template, parser, k, models=[model]) for model in CASCADE_MODELS]
+
+
+def estimate_cost(candidate: Dict, inputs: Dict) -> float:
+    """Rough USD cost of one call: prompt inputs + a typical response."""
+    prompt_tokens = estimate_tokens(" ".join(str(value) for value in inputs.values()))
+    return calculate_cost(candidate["provider"], candidate["model"], prompt_tokens, OUTPUT_TOKENS)
+
+
+def speculate_batch(candidates: List[Dict], inputs: List[Dict], accept: Callable[[str], bool],
+                    max_cost: float = SPECULATIVE_MAX_COST) -> List:
+    """
+    Race the candidates for every input at once; accept(output) → True for a usable result.
+    Returns one output per input: the first accepted one, otherwise the last response
+    (or exception) so the caller's normal validation / retry still applies.
+    """
+    plans = _plan(candidates, inputs, max_cost)
+    return asyncio.run(_race_all(plans, inputs, accept))
+
+
+def _plan(candidates: List[Dict], inputs: List[Dict], max_cost: float) -> List[List[Dict]]:
+    """The primary candidate always runs; extras are admitted round-robin while the estimate fits."""
+    plans = [[candidates[0]] for _ in inputs]
+    budget = max_cost - sum(estimate_cost(candidates[0], x) for x in inputs)
+
+    for candidate in candidates[1:]:
+        for plan, x in zip(plans, inputs):
+            cost = estimate_cost(candidate, x)
+            if cost <= budget:
+                plan.append(candidate)
+                budget -= cost
+
+    launched = sum(len(plan) for plan in plans)
+    logger.info(f"⚡ Speculative: {launched} calls for {len(inputs)} inputs "
+                f"({len(candidates) * len(inputs) - launched} skipped by the ${max_cost} cap)")
+    return plans
+
+
+async def _race_all(plans: List[List[Dict]], inputs: List[Dict], accept: Callable) -> List:
+    return await asyncio.gather(*(_race(plan, x, accept) for plan, x in zip(plans, inputs)))
+
+
+async def _race(plan: List[Dict], inputs: Dict, accept: Callable):
+    async def attempt(candidate: Dict):
+        try:
+            async with llm_slot(candidate["provider"]):
+                return candidate, await candidate["chain"].ainvoke(inputs)
+        except Exception as e:
+            return candidate, e
+
+    tasks = [asyncio.create_task(attempt(candidate)) for candidate in plan]
+    last = None
+    try:
+        for finished in asyncio.as_completed(tasks):
+            candidate, output = await finished
+            if not isinstance(output, Exception) and accept(output):
+                logger.info(f"✅ {candidate['name']} won ({len(plan)} candidates)")
+                return output
+
+            logger.warning(f"{candidate['name']} lost: "
+                           f"{output if isinstance(output, Exception) else 'invalid output'}")
+            last = output
+        return last
+    finally:
+        # Cancels the in-flight requests of the losers
+        for task in tasks:
+            task.cancel()
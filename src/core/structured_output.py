@@ -0,0 +1,170 @@
+"""
+Structured Output
+Provider-native JSON schema / tool calling for the test case and log analyzer
+chains, validated against pydantic models, with the text + fence parser as fallback
+"""
+import json
+import os
+from typing import List
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field, ValidationError
+from langchain_core.runnables import RunnableLambda
+from .testcase_schema import TestCase, repair_json
+from .json_stream import stream_items, STREAM_PARSE
+from .logger import get_logger
+
+load_dotenv()
+
+logger = get_logger("structured_output")
+
+# auto: native structured output where the provider supports it | off: text + fence parsing only
+STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", "auto").lower() != "off"
+
+EXECUTIVE_MARKER = "---EXECUTIVE---"
+
+# Tag of chains whose primary path is native structured output
+STRUCTURED_TAG = "structured_output"
+
+
+class CriticalError(BaseModel):
+    timestamp: str
+    message: str
+    severity: str
+
+
+class LogReport(BaseModel):
+    """The JSON part of a log analysis."""
+    summary: str = Field(description="Brief one-line summary")
+    error_count: int
+    critical_errors: List[CriticalError]
+    root_causes: List[str]
+    affected_systems: List[str]
+    recommendations: List[str]
+    severity: str = Field(description="high, medium or low")
+
+
+class LogAnalysis(BaseModel):
+    """All three parts of a log analysis in one object."""
+    analysis_text: str = Field(description="Detailed plain-text analysis")
+    report: LogReport
+    executive_summary: str = Field(description="3-5 sentences, no technical jargon")
+
+
+class TestCaseList(BaseModel):
+    """Providers want an object at the top level, not a bare array."""
+    test_cases: List[TestCase]
+
+
+def split_response(response: str) -> tuple:
+    """Text report, JSON report and executive summary from a three-part text response."""
+    text_report = response
+    json_report = {}
+    exec_summary = "Executive summary not generated."
+
+    # Split by ```json markdown fence
+    if "```json" in response:
+        parts = response.split("```json", 1)
+        text_report = parts[0].strip()
+        remainder = parts[1]
+
+        # Extract JSON
+        if "```" in remainder:
+            json_block = remainder.split("```")[0].strip()
+            try:
+                json_report = json.loads(json_block)
+            except json.JSONDecodeError:
+                try:
+                    json_report = json.loads(repair_json(json_block))
+                except json.JSONDecodeError:
+                    json_report = {"error": "Failed to parse JSON"}
+
+            # Extract executive summary
+            after_json = remainder.split("```", 1)[1]
+            if EXECUTIVE_MARKER in after_json:
+                exec_summary = after_json.split(EXECUTIVE_MARKER, 1)[1].strip()
+
+    return text_report, json_report, exec_summary
+
+
+def stream_log_analysis(text_chain, inputs: dict) -> tuple:
+    """
+    Stream the three-part text response, validating each critical_errors entry as it closes.
+    A malformed entry stops the call and comes back as an unparsed report (the cascade escalates).
+    """
+    result = stream_items(text_chain.stream(inputs), key="critical_errors", start_marker="```json",
+                          validate=_critical_error_errors)
+    if result["stopped"] == "invalid":
+        text_report = result["text"].split("```json", 1)[0].strip()
+        return text_report, {"error": f"Invalid critical_errors entry: {'; '.join(result['errors'])}"}, \
+            "Executive summary not generated."
+    return split_response(result["text"])
+
+
+def _critical_error_errors(entry) -> List[str]:
+    try:
+        CriticalError.model_validate(entry)
+        return []
+    except ValidationError as e:
+        return [f"{'.'.join(str(loc) for loc in err['loc']) or 'entry'}: {err['msg']}" for err in e.errors()]
+
+
+def report_parsed(json_report: dict) -> bool:
+    """False when the JSON part is missing or could not be parsed."""
+    return bool(json_report) and "error" not in json_report
+
+
+def _structured_llm(llm, schema):
+    """llm.with_structured_output(schema), or None where the provider / wrapper has no native mode."""
+    if not STRUCTURED_OUTPUT:
+        return None
+    try:
+        return llm.with_structured_output(schema)
+    except (NotImplementedError, AttributeError):
+        # e.g. the Ollama completion wrapper
+        logger.info(f"{type(llm).__name__} has no structured output - using the text parser")
+        return None
+
+
+def testcase_chain(prompt_template, llm, parser):
+    """
+    prompt | llm → JSON array string of test cases (what the section generator parses).
+    Uses native structured output when available and falls back to the plain text chain.
+    """
+    text_chain = prompt_template | llm | parser
+    structured = _structured_llm(llm, TestCaseList)
+    if structured is None:
+        return text_chain
+
+    to_json = RunnableLambda(lambda result: json.dumps([case.model_dump() for case in result.test_cases]))
+    chain = (prompt_template | structured | to_json).with_fallbacks([text_chain])
+    return chain.with_config(tags=[STRUCTURED_TAG])
+
+
+def is_structured(chain) -> bool:
+    """
+    True for chains built on native structured output: the object arrives in one piece,
+    so streaming them (STREAM_PARSE) cannot stop early - callers use batch / invoke instead.
+    """
+    return STRUCTURED_TAG in ((getattr(chain, "config", None) or {}).get("tags") or [])
+
+
+def log_analysis_chain(structured_template, text_template, llm, parser):
+    """
+    prompt | llm → (text_report, json_report, exec_summary).
+    Uses native structured output when available and falls back to the three-part text prompt.
+    STREAM_PARSE only applies to the text prompt (the fallback, or the only path with
+    STRUCTURED_OUTPUT=off / providers without native support): a structured response
+    arrives as one object, so there is nothing to stop early.
+    """
+    raw_chain = text_template | llm | parser
+    if STREAM_PARSE:
+        # critical_errors entries are validated while the response streams
+        text_chain = RunnableLambda(lambda inputs: stream_log_analysis(raw_chain, inputs))
+    else:
+        text_chain = raw_chain | RunnableLambda(split_response)
+    structured = _structured_llm(llm, LogAnalysis)
+    if structured is None:
+        return text_chain
+
+    to_parts = RunnableLambda(lambda result: (result.analysis_text, result.report.model_dump(), result.executive_summary))
+    return (structured_template | structured | to_parts).with_fallbacks([text_chain])
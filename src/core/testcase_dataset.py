@@ -0,0 +1,60 @@
+"""
+Test Case Dataset
+Combines per-requirement test cases into one deduplicated dataset (batch mode)
+"""
+import json
+import re
+from pathlib import Path
+from typing import Dict, List
+import pandas as pd
+from .logger import get_logger
+
+logger = get_logger("testcase_dataset")
+
+
+def case_key(case: Dict) -> str:
+    """Normalized title + steps + expected: same test written twice → same key."""
+    steps = case.get("steps", [])
+    if isinstance(steps, list):
+        steps = " ".join(str(s) for s in steps)
+    text = f"{case.get('title', '')} {steps} {case.get('expected', '')}".lower()
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+def combine_test_cases(sources: Dict[str, List[Dict]]) -> List[Dict]:
+    """
+    Merge {requirement name: test cases} into one list.
+    IDs are prefixed with the requirement; a duplicate keeps its first occurrence
+    and lists every requirement it came from.
+    """
+    combined = {}
+    for requirement, test_cases in sorted(sources.items()):
+        for case in test_cases:
+            key = case_key(case)
+            if key in combined:
+                combined[key]["requirements"].append(requirement)
+                continue
+            combined[key] = {**case, "id": f"{requirement}/{case.get('id', 'N/A')}", "requirements": [requirement]}
+
+    total = sum(len(cases) for cases in sources.values())
+    logger.info(f"Combined {total} test cases from {len(sources)} requirements → {len(combined)} unique "
+                f"({total - len(combined)} duplicates dropped)")
+    return list(combined.values())
+
+
+def write_test_case_dataset(test_cases: List[Dict], out_dir: Path) -> Path:
+    """Write the combined dataset as JSON and CSV. Returns the CSV path."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    (out_dir / "test_cases.json").write_text(json.dumps(test_cases, indent=2), encoding="utf-8")
+
+    df = pd.DataFrame(test_cases)
+    for column in ("steps", "requirements"):
+        if column in df.columns:
+            df[column] = df[column].apply(lambda x: " | ".join(x) if isinstance(x, list) else x)
+
+    csv_file = out_dir / "test_cases.csv"
+    df.to_csv(csv_file, index=False)
+    logger.info(f"Test case dataset saved: {csv_file}")
+    return csv_file
@@ -0,0 +1,92 @@
+"""
+Test Case Manifest
+Per-requirement record of section key → approved test cases, so a re-run only
+regenerates changed or new sections and test IDs stay stable across runs.
+The key covers the section text and the shared context (user story, API contract)
+that goes into every section prompt: editing the context regenerates every section
+"""
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from .logger import get_logger
+
+logger = get_logger("testcase_manifest")
+
+ROOT = Path(__file__).resolve().parents[2]
+MANIFEST_DIR = ROOT / "data" / "manifests"
+
+
+class TestCaseManifest:
+    def __init__(self, requirement_file: str = "", pipeline: str = "testcase", manifest_dir: Path = MANIFEST_DIR):
+        """
+        Load the manifest of one requirement file (empty if it has none yet).
+        Without a requirement_file the manifest only numbers IDs (TC-001..) and is never saved.
+        """
+        self.path = _manifest_path(requirement_file, pipeline, manifest_dir) if requirement_file else None
+        self.requirement_file = requirement_file
+        self.pipeline = pipeline
+        self.data = {"next_id": 1, "sections": {}}
+
+        if self.path and self.path.exists():
+            self.data = json.loads(self.path.read_text(encoding="utf-8"))
+            logger.info(f"Loaded manifest: {len(self.data['sections'])} sections ({self.path.name})")
+
+        self._stale_by_title = {}
+
+    def begin(self, sections: List[Dict]):
+        """Sections of the previous version that changed: their IDs are reused by the new version."""
+        current = {section["key"] for section in sections}
+        self._stale_by_title = {
+            entry["title"]: [tc["id"] for tc in entry["test_cases"]]
+            for digest, entry in self.data["sections"].items() if digest not in current
+        }
+
+    def carried(self, section: Dict) -> Optional[List[Dict]]:
+        """Approved test cases of an unchanged section (with their IDs), or None."""
+        entry = self.data["sections"].get(section["key"])
+        return entry["test_cases"] if entry else None
+
+    def assign_ids(self, section: Dict, test_cases: List[Dict]) -> List[Dict]:
+        """Edited section → its previous IDs first; new tests → next free ID (IDs are never reused)."""
+        reuse = list(self._stale_by_title.pop(section["title"], []))
+        assigned = []
+        for case in test_cases:
+            if reuse:
+                test_id = reuse.pop(0)
+            else:
+                test_id = f"TC-{self.data['next_id']:03d}"
+                self.data["next_id"] += 1
+            assigned.append({**case, "id": test_id})
+        return assigned
+
+    def save(self, sections: List[Dict], test_cases: List[Dict]):
+        """Record the approved test cases of each section as the new baseline."""
+        if self.path is None:
+            return
+
+        by_id = {tc["id"]: tc for tc in test_cases}
+        self.data.update({
+            "requirement": self.requirement_file,
+            "pipeline": self.pipeline,
+            "updated_at": datetime.now().isoformat(),
+            "sections": {
+                section["key"]: {
+                    "title": section["title"],
+                    "test_cases": [by_id[test_id] for test_id in section["test_ids"] if test_id in by_id]
+                }
+                for section in sections
+            }
+        })
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.data, indent=2), encoding="utf-8")
+        logger.info(f"Saved manifest: {len(sections)} sections ({self.path.name})")
+
+
+def _manifest_path(requirement_file: str, pipeline: str, manifest_dir: Path) -> Path:
+    """Stem + short path hash, one directory per pipeline."""
+    path = Path(requirement_file)
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:8]
+    return Path(manifest_dir) / pipeline / f"{path.stem}_{digest}.json"
@@ -0,0 +1,83 @@
+"""
+Test Case Retry
+The retry step shared by the test case pipelines: a failed validation escalates to the
+next cascade tier and repairs only the invalid items (or regenerates the failed sections);
+a human rejection regenerates every section on the same tier, with the reviewer's feedback
+"""
+from typing import Callable, Dict, List
+from .cascade import next_tier
+from .requirement_sections import repair_test_cases
+from .logger import get_logger
+
+logger = get_logger("testcase_retry")
+
+
+def retry_generation(state: Dict, generate: Callable[[bool, int], Dict], repair_chains: List,
+                     label: str = "") -> Dict:
+    """
+    generate(use_cache, tier, feedback) → generate_by_section result; repair_chains[tier] fixes invalid items.
+    label completes the log line ("Regenerated 6 test cases with RAG").
+    Returns the retry node's state updates.
+    """
+    retry_count = state.get("retry_count", 0) + 1
+    logger.warning(f"🔄 Retry attempt {retry_count}/3")
+
+    # A human rejection regenerates every section, a failed validation only the broken ones
+    rejected = state.get("human_approval") == "rejected"
+    use_cache = not rejected
+
+    # A failed validation escalates to the next cascade tier, a human rejection stays on it
+    tier = state.get("model_tier", 0)
+    if use_cache:
+        tier = next_tier(tier)
+
+    updates = {"retry_count": retry_count, "model_tier": tier}
+
+    # Only some items are broken: repair just those, keep the rest
+    if use_cache and state.get("invalid_cases"):
+        return {**updates, **_repair_invalid(state, repair_chains[tier])}
+
+    # The reviewer's reason shapes the regeneration (and later regenerations of failed sections)
+    feedback = state.get("human_feedback", "")
+    if rejected:
+        logger.info(f"Regenerating with reviewer feedback: {feedback or 'none given'}")
+        # Handled: later validation retries repair and escalate again
+        updates["human_approval"] = "pending"
+    return {**updates, **_regenerate(generate, use_cache, tier, feedback, label)}
+
+
+def _regenerate(generate: Callable, use_cache: bool, tier: int, feedback: str, label: str) -> Dict:
+    try:
+        result = generate(use_cache, tier, feedback)
+    except Exception as e:
+        logger.error(f"LLM call failed: {e}")
+        return {"test_cases": [], "errors": [f"LLM error: {e}"], "validation_status": "fail"}
+
+    if result["errors"]:
+        # Valid sections are cached: the next retry only regenerates the failed ones
+        return {"test_cases": [], "errors": result["errors"], "validation_status": "fail"}
+
+    test_cases = result["test_cases"]
+    logger.info(f"Regenerated {len(test_cases)} test cases{label} "
+                f"({len(result['sections'])} sections, {result['carried']} unchanged, {result['cached']} from cache)")
+    return {
+        "test_cases": test_cases,
+        "sections": result["sections"],
+        "errors": [],
+        "validation_status": "pending"
+    }
+
+
+def _repair_invalid(state: Dict, chain) -> Dict:
+    """One repair call for the invalid test cases (with their validation errors)."""
+    invalid = state["invalid_cases"]
+    logger.info(f"Repairing {len(invalid)}/{len(state['test_cases'])} invalid test cases...")
+
+    try:
+        result = repair_test_cases(chain, state["test_cases"], invalid, state["requirement"])
+        return {"test_cases": result["test_cases"], "errors": [], "validation_status": "pending"}
+
+    except Exception as e:
+        # Keep the test cases: the next retry regenerates the requirement instead
+        logger.error(f"Repair failed: {e}")
+        return {"errors": [f"Repair error: {e}"], "invalid_cases": [], "validation_status": "fail"}
@@ -0,0 +1,81 @@
+"""
+Test Case Schema
+Pydantic model for one test case, per-item validation and local JSON repair
+(fences, surrounding prose, trailing commas) before any LLM is asked again
+"""
+import json
+import re
+from typing import Dict, List, Tuple
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from .logger import get_logger
+
+logger = get_logger("testcase_schema")
+
+FENCE_RE = re.compile(r"```[a-zA-Z]*\s*(.*?)```", re.DOTALL)
+TRAILING_COMMA_RE = re.compile(r",\s*([\]}])")
+
+
+class TestCase(BaseModel):
+    """Same rules as the validate node: required fields, 2+ steps. Extra keys are kept."""
+    model_config = ConfigDict(extra="allow")
+
+    id: str = Field(min_length=1)
+    title: str = Field(min_length=1)
+    steps: List[str] = Field(min_length=2)
+    expected: str = Field(min_length=1)
+    priority: str = Field(min_length=1)
+
+
+def repair_json(text: str) -> str:
+    """Cheap fixes for common LLM JSON mistakes: markdown fences, prose around the JSON, trailing commas."""
+    fenced = FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+
+    starts = [i for i in (text.find("["), text.find("{")) if i != -1]
+    if starts:
+        start = min(starts)
+        end = text.rfind("]" if text[start] == "[" else "}")
+        if end > start:
+            text = text[start:end + 1]
+
+    return TRAILING_COMMA_RE.sub(r"\1", text).strip()
+
+
+def parse_test_cases(text: str) -> List[Dict]:
+    """JSON array of test cases from an LLM response, repaired locally if needed."""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = json.loads(repair_json(text))
+        logger.info("Repaired malformed JSON locally")
+
+    if isinstance(data, dict):
+        data = data.get("test_cases", [data])
+    if not isinstance(data, list):
+        raise ValueError(f"Expected a JSON array of test cases, got {type(data).__name__}")
+    return data
+
+
+def validate_test_cases(test_cases: List) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Validate each item on its own.
+    Returns (valid, invalid) where invalid = [{"index", "test_case", "errors"}].
+    """
+    valid, invalid = [], []
+    for index, case in enumerate(test_cases):
+        try:
+            if not isinstance(case, dict):
+                raise ValueError(f"expected an object, got {type(case).__name__}")
+            TestCase.model_validate(case)
+            valid.append(case)
+        except (ValidationError, ValueError) as e:
+            invalid.append({"index": index, "test_case": case, "errors": _error_messages(e)})
+    return valid, invalid
+
+
+def _error_messages(error: Exception) -> List[str]:
+    """'steps: List should have at least 2 items after validation, not 1'"""
+    if not isinstance(error, ValidationError):
+        return [str(error)]
+    return [f"{'.'.join(str(loc) for loc in e['loc']) or 'test case'}: {e['msg']}" for e in error.errors()]
@@ -0,0 +1,40 @@
+"""
+Token Estimation
+Cheap, provider-independent token counts for prompt budgeting
+"""
+import re
+
+CHARS_PER_TOKEN = 4  # Rough: 1 token ≈ 4 characters
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+|\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text."""
+    return len(text or "") // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = "\n... [truncated]") -> str:
+    """Cut text to roughly max_tokens, preferring a line boundary."""
+    text = text or ""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max(0, max_chars - len(marker))]
+    if "\n" in cut:
+        cut = cut[:cut.rfind("\n")]
+    return cut + marker
+
+
+def truncate_to_sentences(text: str, max_tokens: int, marker: str = " [...]") -> str:
+    """Cut text to roughly max_tokens at the last sentence (or line) end; line cut if there is none."""
+    text = text or ""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max(0, max_chars - len(marker))]
+    ends = [m.start() for m in SENTENCE_END_RE.finditer(cut) if m.start() > 0]
+    if not ends:
+        return truncate_to_tokens(text, max_tokens)
+    return cut[:ends[-1]].rstrip() + marker
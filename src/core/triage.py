@@ -0,0 +1,95 @@
+"""
+Log Triage
+Deterministic pre-triage that decides how much LLM work a log needs
+"""
+from collections import Counter
+from typing import Dict, Tuple
+from .log_parser import parse_log_records
+
+# Classification → action
+#   clean    → skip the LLM, emit templated report
+#   minor    → small/cheap model
+#   incident → full pipeline
+TRIAGE_ACTIONS = {"clean": "skip", "minor": "small", "incident": "full"}
+
+# An incident needs at least this many ERROR records (or any CRITICAL / 5xx burst)
+INCIDENT_ERROR_THRESHOLD = 3
+INCIDENT_5XX_THRESHOLD = 2
+
+
+def triage_log(log_content: str) -> Dict:
+    """Classify a log as clean, minor or incident from levels and status codes."""
+    records = parse_log_records(log_content)
+    levels = Counter(r["level"] for r in records)
+    statuses = [r["status"] for r in records if r["status"] is not None]
+
+    errors = levels.get("ERROR", 0)
+    criticals = levels.get("CRITICAL", 0)
+    warnings = levels.get("WARNING", 0) + levels.get("SLOW_QUERY", 0)
+    server_errors = sum(1 for s in statuses if s >= 500)
+    client_errors = sum(1 for s in statuses if 400 <= s < 500)
+
+    if not records and log_content.strip():
+        # Unknown format: never silently skip
+        level, reason = "incident", "unrecognized log format"
+    elif criticals or server_errors >= INCIDENT_5XX_THRESHOLD or errors >= INCIDENT_ERROR_THRESHOLD:
+        level, reason = "incident", f"{criticals} critical, {errors} errors, {server_errors} 5xx"
+    elif errors or warnings or client_errors:
+        level, reason = "minor", f"{errors} errors, {warnings} warnings, {client_errors} 4xx"
+    else:
+        level, reason = "clean", "no errors or warnings"
+
+    timestamps = [r["timestamp"] for r in records]
+
+    return {
+        "level": level,
+        "action": TRIAGE_ACTIONS[level],
+        "reason": reason,
+        "records": len(records),
+        "level_counts": dict(levels),
+        "status_counts": {"2xx": sum(1 for s in statuses if s < 400), "4xx": client_errors, "5xx": server_errors},
+        "first_timestamp": timestamps[0] if timestamps else None,
+        "last_timestamp": timestamps[-1] if timestamps else None
+    }
+
+
+def render_clean_report(triage: Dict) -> Tuple[str, Dict, str]:
+    """Templated (text, json, executive summary) report for clean logs."""
+    time_range = f"{triage['first_timestamp']} → {triage['last_timestamp']}"
+    requests = triage["status_counts"]["2xx"]
+
+    text_report = f"""Summary
+No errors or warnings found in {triage['records']} log entries ({time_range}).
+
+Critical Errors
+None.
+
+Root Cause
+Not applicable - the system operated normally.
+
+Impact
+No user impact detected{f' ({requests} successful requests)' if requests else ''}.
+
+Recommendations
+No action required.
+
+Prevention
+Continue routine monitoring.
+
+(Generated by deterministic triage - no LLM call was made.)"""
+
+    json_report = {
+        "summary": "No issues detected",
+        "error_count": 0,
+        "critical_errors": [],
+        "root_causes": [],
+        "affected_systems": [],
+        "recommendations": [],
+        "severity": "none",
+        "triage": triage["level"]
+    }
+
+    exec_summary = (f"The system ran normally between {time_range}. "
+                    "No errors were found and no users were affected. No action is needed.")
+
+    return text_report, json_report, exec_summary
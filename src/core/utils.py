@@ -1,5 +1,6 @@
 # Utility Function for file and Json Handling
 
+import glob
 import json
 from pathlib import Path
 from typing import List, Dict
@@ -17,6 +18,24 @@ def pick_requirement(file_path: str = None, req_dir: str= "data/requirements") -
         raise FileNotFoundError(f"No requirement files found in directory {req_dir}.")
     return txt_files[0]
 
+def pick_requirement_files(target: str = None, req_dir: str = "data/requirements") -> List[Path]:
+    """Resolve a requirement file, directory or glob pattern to a sorted list of .txt files."""
+    if not target:
+        target = str(req_dir)
+
+    path = Path(target)
+    if path.is_file():
+        return [path]
+
+    if path.is_dir():
+        req_files = sorted(path.glob("*.txt"))
+    else:
+        req_files = sorted(Path(p) for p in glob.glob(target) if Path(p).is_file())
+
+    if not req_files:
+        raise FileNotFoundError(f"No requirement files found for {target}.")
+    return req_files
+
 def parse_json_safely(text: str, raw_file: Path) -> List[Dict]:
     raw_file.parent.mkdir(parents=True, exist_ok=True)
     raw_file.write_text(text, encoding="utf-8")
@@ -58,6 +77,25 @@ def pick_log_file(file_path: str = None, log_dir: str = "data/logs") -> Path:
         raise FileNotFoundError(f"No log files found in directory {log_dir}.")
     return log_files[0]
 
+def pick_log_files(target: str = None, log_dir: str = "data/logs") -> List[Path]:
+    """Resolve a file, directory or glob pattern to a sorted list of log files."""
+    if not target:
+        target = str(log_dir)
+
+    path = Path(target)
+    if path.is_file():
+        return [path]
+
+    if path.is_dir():
+        log_files = sorted(path.glob("*.log"))
+    else:
+        # Treat as glob pattern, e.g. "data/logs/*_error.log"
+        log_files = sorted(Path(p) for p in glob.glob(target) if Path(p).is_file())
+
+    if not log_files:
+        raise FileNotFoundError(f"No log files found for {target}.")
+    return log_files
+
 def print_summary(duration: float, metadata: dict, llm_calls: int = 1, status: str = "Success"):
     """Print performance summary."""
     print("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -8,6 +8,7 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
 import os
+from typing import List
 from dotenv import load_dotenv
 from .logger import get_logger
 
@@ -75,10 +76,23 @@ def load_vector_store():
         embedding_function=embeddings
     )
 
-def search_vector_store(query: str, top_k: int = 3):
-    """Search vector store for relevant documents."""
+def search_vector_store(query: str, top_k: int = 3, embedding: List[float] = None):
+    """
+    Search vector store for relevant documents.
+    Pass a precomputed `embedding` (see embed_query) to skip the embedding API call.
+    """
 
     vector_store = load_vector_store()
+    if embedding is not None:
+        # Same (doc, distance) pairs as similarity_search_with_score
+        return vector_store.similarity_search_by_vector_with_relevance_scores(embedding, k=top_k)
+
     results = vector_store.similarity_search_with_score(query, k=top_k)
 
     return results
+
+def embed_query(text: str) -> List[float]:
+    """Embed a query once so several searches (KB, memory) can reuse the vector."""
+    vector = embeddings.embed_query(text)
+    logger.info(f"Embedded query ({len(text)} chars → {len(vector)} dims)")
+    return vector
@@ -0,0 +1,172 @@
+"""
+Checkpoints - Durable LangGraph runs
+Every completed node is saved to SQLite under a run ID (the LangGraph thread_id),
+so a crashed run resumes from its last completed node instead of re-calling the LLM,
+and a run whose LLM calls failed re-runs from the node that recorded the error.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.types import Command
+from src.core import get_logger
+
+load_dotenv()
+
+logger = get_logger("checkpoints")
+
+ROOT = Path(__file__).resolve().parents[2]
+CHECKPOINT_DB = Path(os.getenv("CHECKPOINT_DB") or ROOT / "outputs" / "checkpoints.sqlite")
+
+_checkpointer = None
+_lock = threading.Lock()
+
+
+def get_checkpointer() -> SqliteSaver:
+    """Process-wide SQLite checkpointer (shared by all graphs and threads)."""
+    global _checkpointer
+    with _lock:
+        if _checkpointer is None:
+            CHECKPOINT_DB.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(CHECKPOINT_DB), check_same_thread=False)
+            _checkpointer = SqliteSaver(conn)
+            logger.info(f"💾 Checkpoints: {CHECKPOINT_DB}")
+    return _checkpointer
+
+
+@asynccontextmanager
+async def aget_checkpointer():
+    """Async SQLite checkpointer for graphs run with ainvoke."""
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    CHECKPOINT_DB.parent.mkdir(parents=True, exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(str(CHECKPOINT_DB)) as saver:
+        logger.info(f"💾 Checkpoints: {CHECKPOINT_DB}")
+        yield saver
+
+
+def new_run_id(prefix: str) -> str:
+    """Readable default run ID, e.g. log_analyzer_20250101_141500."""
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+def add_checkpoint_args(parser):
+    """--run-id / --resume flags shared by the drivers."""
+    parser.add_argument("--run-id", default="", help="Checkpoint key for this run (default: generated)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue --run-id from its last completed node instead of starting over")
+
+
+def resolve_run_id(parser, args, prefix: str) -> str:
+    """--run-id, or a fresh one; --resume needs to know which run to continue."""
+    if args.resume and not args.run_id:
+        parser.error("--resume requires --run-id")
+    return args.run_id or new_run_id(prefix)
+
+
+def run_config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def invoke_checkpointed(app, init_state: dict, thread_id: str, resume: bool = False) -> dict:
+    """
+    Run a checkpointed graph. With resume, completed nodes are not executed again:
+    the run continues from its saved checkpoint (or returns it if it already finished).
+    Nodes that caught an LLM error (left in "errors") count as not completed: the run
+    forks from the checkpoint before the first of them and re-runs from there.
+    """
+    config = run_config(thread_id)
+
+    if resume:
+        snapshot = app.get_state(config)
+        if _resumable(thread_id, snapshot):
+            failed = _failed_checkpoint(thread_id, _lineage(app, snapshot) if _has_errors(snapshot) else [])
+            if failed:
+                return app.invoke(None, failed.config)
+            if not snapshot.next:
+                logger.info(f"✅ {thread_id} already completed - returning saved state")
+                return snapshot.values
+            logger.info(f"↻ Resuming {thread_id} at {', '.join(snapshot.next)}")
+            return app.invoke(None, config)
+
+    logger.info(f"💾 Run ID: {thread_id}")
+    return app.invoke(init_state, config)
+
+
+async def ainvoke_checkpointed(app, init_state: dict, thread_id: str, resume: bool = False) -> dict:
+    """Async counterpart of invoke_checkpointed."""
+    config = run_config(thread_id)
+
+    if resume:
+        snapshot = await app.aget_state(config)
+        if _resumable(thread_id, snapshot):
+            failed = _failed_checkpoint(thread_id, await _alineage(app, snapshot) if _has_errors(snapshot) else [])
+            if failed:
+                return await app.ainvoke(None, failed.config)
+            if not snapshot.next:
+                logger.info(f"✅ {thread_id} already completed - returning saved state")
+                return snapshot.values
+            logger.info(f"↻ Resuming {thread_id} at {', '.join(snapshot.next)}")
+            return await app.ainvoke(None, config)
+
+    logger.info(f"💾 Run ID: {thread_id}")
+    return await app.ainvoke(init_state, config)
+
+
+def resume_with(app, thread_id: str, value) -> dict:
+    """Continue a run paused by interrupt(); `value` becomes interrupt()'s return value."""
+    logger.info(f"↻ Resuming {thread_id} with decision")
+    return app.invoke(Command(resume=value), run_config(thread_id))
+
+
+def pending_interrupt(app, thread_id: str):
+    """Payload of the interrupt a run is paused on, or None if it is not paused."""
+    snapshot = app.get_state(run_config(thread_id))
+    if snapshot.next and snapshot.interrupts:
+        return snapshot.interrupts[0].value
+    return None
+
+
+def _resumable(thread_id: str, snapshot) -> bool:
+    if not snapshot.values:
+        logger.warning(f"No checkpoint for {thread_id} - starting a fresh run")
+        return False
+    return True
+
+
+def _has_errors(snapshot) -> bool:
+    """Errors left in the latest state (a run paused on interrupt() just continues)."""
+    return bool(snapshot.values.get("errors")) and not snapshot.interrupts
+
+
+def _lineage(app, snapshot) -> list:
+    """Checkpoints of this run's branch, oldest first (earlier resumes forked other branches)."""
+    lineage = [snapshot]
+    while lineage[-1].parent_config:
+        lineage.append(app.get_state(lineage[-1].parent_config))
+    return lineage[::-1]
+
+
+async def _alineage(app, snapshot) -> list:
+    lineage = [snapshot]
+    while lineage[-1].parent_config:
+        lineage.append(await app.aget_state(lineage[-1].parent_config))
+    return lineage[::-1]
+
+
+def _failed_checkpoint(thread_id: str, lineage: list):
+    """Checkpoint right before the node that recorded the first error still in the final state."""
+    if not lineage:
+        return None
+
+    final_errors = lineage[-1].values.get("errors") or []
+    for parent, child in zip(lineage, lineage[1:]):
+        before = parent.values.get("errors") or []
+        if any(error in final_errors and error not in before for error in child.values.get("errors") or []):
+            logger.info(f"↻ {thread_id} failed at {', '.join(parent.next)} - re-running from there")
+            return parent
+    return None
@@ -0,0 +1,126 @@
+"""
+Driver for the Test Case Approval Queue
+Reviews runs paused at human approval (APPROVAL_MODE=queue) and resumes their graphs.
+
+Usage:
+    python -m src.graph.drivers.run_approval_queue                          (list pending)
+    python -m src.graph.drivers.run_approval_queue --show <run_id>
+    python -m src.graph.drivers.run_approval_queue --approve <run_id> [<run_id> ...]
+    python -m src.graph.drivers.run_approval_queue --reject <run_id> --feedback "Missing negative cases"
+    python -m src.graph.drivers.run_approval_queue --approve-all
+    python -m src.graph.drivers.run_approval_queue --approve-all --policy validation_pass
+"""
+import argparse
+import importlib
+from src.graph.checkpoints import get_checkpointer, resume_with, pending_interrupt
+from src.core import get_logger, ApprovalQueue, auto_approval
+
+logger = get_logger("approval_queue_driver")
+
+# Pipeline name (as queued by the drivers) → graph module
+PIPELINES = {
+    "testcase": "src.graph.test_case_generator.graph",
+    "testcase_rag": "src.graph.testcase_rag.graph",
+    "testcase_memory": "src.graph.testcase_memory.graph",
+}
+
+_apps = {}
+
+
+def get_app(pipeline: str):
+    """Checkpointed graph per pipeline, built once."""
+    if pipeline not in _apps:
+        module = importlib.import_module(PIPELINES[pipeline])
+        _apps[pipeline] = module.build_graph(checkpointer=get_checkpointer())
+    return _apps[pipeline]
+
+
+def show_pending(queue: ApprovalQueue):
+    pending = queue.list("pending")
+    print(f"\n📋 {len(pending)} run(s) awaiting approval\n")
+    for item in pending:
+        preview = item["preview"]
+        print(f"  {item['run_id']}  [{item['pipeline']}]  {len(preview.get('test_cases', []))} test cases, "
+              f"validation: {preview.get('validation_status')}, retries: {preview.get('retry_count')}  "
+              f"(queued {item['created_at'][:19]})")
+    print()
+
+
+def show_details(queue: ApprovalQueue, run_id: str):
+    item = queue.get(run_id)
+    if item is None:
+        logger.error(f"Unknown run: {run_id}")
+        return
+
+    print(f"\n{'='*60}\n{run_id} [{item['pipeline']}] - {item['status']}\n{'='*60}")
+    for i, tc in enumerate(item["preview"].get("test_cases", []), 1):
+        print(f"\n[{i}] {tc.get('id', 'N/A')}: {tc.get('title', 'N/A')} ({tc.get('priority', 'N/A')})")
+        for j, step in enumerate(tc.get("steps", []), 1):
+            print(f"    {j}. {step}")
+        print(f"    Expected: {tc.get('expected', 'N/A')}")
+    print()
+
+
+def resume(queue: ApprovalQueue, run_id: str):
+    """Hand the recorded decision back to the paused graph."""
+    item = queue.get(run_id)
+    app = get_app(item["pipeline"])
+
+    final_state = resume_with(app, run_id, {"decision": item["status"], "feedback": item["feedback"]})
+    queue.mark_resumed(run_id)
+
+    # A rejection regenerates and pauses at approval again
+    preview = pending_interrupt(app, run_id)
+    if preview is not None:
+        queue.submit(run_id, item["pipeline"], preview)
+        return
+
+    logger.info(f"✅ {run_id}: {final_state.get('human_approval')} "
+                f"({len(final_state.get('test_cases', []))} test cases)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test case approval queue")
+    parser.add_argument("--show", metavar="RUN_ID", help="Show full details of a queued run")
+    parser.add_argument("--approve", nargs="+", default=[], metavar="RUN_ID")
+    parser.add_argument("--reject", nargs="+", default=[], metavar="RUN_ID")
+    parser.add_argument("--feedback", default="", help="Reason given to the regeneration step on reject")
+    parser.add_argument("--approve-all", action="store_true", help="Approve every pending run")
+    parser.add_argument("--policy", choices=["all", "validation_pass"], default="all",
+                        help="With --approve-all: which pending runs to approve")
+    args = parser.parse_args()
+
+    queue = ApprovalQueue()
+
+    if args.show:
+        show_details(queue, args.show)
+        return
+
+    approve = list(args.approve)
+    if args.approve_all:
+        approve += [item["run_id"] for item in queue.list("pending")
+                    if auto_approval(item["preview"], policy=args.policy)]
+
+    for run_id in approve:
+        queue.decide(run_id, "approved", "Approved via approval queue")
+    for run_id in args.reject:
+        queue.decide(run_id, "rejected", args.feedback)
+
+    # Everything decided but not yet resumed (including runs left over from a crash)
+    decided = [item["run_id"] for status in ("approved", "rejected") for item in queue.list(status)]
+
+    if not decided:
+        show_pending(queue)
+        return
+
+    logger.info(f"🚀 Resuming {len(decided)} run(s)...")
+    for run_id in decided:
+        try:
+            resume(queue, run_id)
+        except Exception as e:
+            logger.error(f"❌ {run_id} failed to resume: {e}")
+
+    show_pending(queue)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Driver for Model Cascade Stats
+Shows how often each CASCADE_MODELS tier produced output that passed validation.
+
+Usage:
+    python -m src.graph.drivers.run_cascade_stats
+    python -m src.graph.drivers.run_cascade_stats --pipeline testcase_rag
+"""
+import argparse
+from src.core import get_logger, CascadeStats, CASCADE_MODELS
+
+logger = get_logger("cascade_stats_driver")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model cascade hit rates")
+    parser.add_argument("--pipeline", default=None, help="Only this pipeline (e.g. testcase, log_analyzer)")
+    args = parser.parse_args()
+
+    rows = CascadeStats().hit_rates(args.pipeline)
+    if not rows:
+        logger.info(f"No cascade attempts recorded (CASCADE_MODELS: {', '.join(CASCADE_MODELS)})")
+        return
+
+    print(f"\n{'Pipeline':<22}{'Tier':<6}{'Model':<28}{'Attempts':>10}{'Accepted':>10}{'Hit rate':>10}")
+    print("-" * 86)
+    for row in rows:
+        print(f"{row['pipeline']:<22}{row['tier']:<6}{row['model']:<28}"
+              f"{row['attempts']:>10}{row['accepted']:>10}{row['hit_rate']:>10.0%}")
+    print()
+
+if __name__ == "__main__":
+    main()
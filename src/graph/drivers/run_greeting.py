@@ -1,45 +1,55 @@
 """
 Driver for Greeting Generator
+
+Usage:
+    python -m src.graph.drivers.run_greeting [--run-id <id> --resume]
 """
+import argparse
 from pprint import pprint
 from src.graph.greeting_generator.graph import build_graph
+from src.graph.checkpoints import get_checkpointer, add_checkpoint_args, resolve_run_id, invoke_checkpointed
 
 def main():
+    parser = argparse.ArgumentParser(description="Greeting Generator")
+    add_checkpoint_args(parser)
+    args = parser.parse_args()
+    run_id = resolve_run_id(parser, args, "greeting")
+
     print(" Greeting Generator Graph\n")
 
     # Build graph
-    app = build_graph()
+    app = build_graph(checkpointer=get_checkpointer())
 
     # Test 1: Valid name
     print("Test 1: Valid name")
-    result = app.invoke({
+    result = invoke_checkpointed(app, {
         "name": "Alice",
         "is_valid": False,
         "greeting": "",
         "timestamp": ""
-    })
+    }, f"{run_id}/test1", args.resume)
     pprint(result)
     print()
 
     # Test 2: Name with spaces
     print("Test 2: Name with spaces")
-    result = app.invoke({
+    result = invoke_checkpointed(app, {
         "name": "  Bob  ",
         "is_valid": False,
         "greeting": "",
         "timestamp": ""
-    })
+    }, f"{run_id}/test2", args.resume)
     pprint(result)
     print()
 
     # Test 3: Empty name
     print("Test 3: Empty name (validation fails)")
-    result = app.invoke({
+    result = invoke_checkpointed(app, {
         "name": "",
         "is_valid": False,
         "greeting": "",
         "timestamp": ""
-    })
+    }, f"{run_id}/test3", args.resume)
     pprint(result)
 
 if __name__ == "__main__":
@@ -1,10 +1,21 @@
 """
 Driver for Incident Response Multi-Agent System
+
+Usage:
+    python -m src.graph.drivers.run_incident_response [log_file] [--since 14:15] [--until 14:20]
+    python -m src.graph.drivers.run_incident_response data/logs --workers 4   (batch)
+    python -m src.graph.drivers.run_incident_response "data/logs/*.log"       (batch)
+    python -m src.graph.drivers.run_incident_response data/logs --correlate   (one correlated incident)
+    python -m src.graph.drivers.run_incident_response --run-id <id> --resume  (continue a failed run)
 """
-import sys
+import argparse
 from pathlib import Path
 from src.graph.incident_response.graph import build_incident_response_graph
-from src.core import get_logger, pick_log_file
+from src.graph.checkpoints import get_checkpointer, add_checkpoint_args, resolve_run_id, invoke_checkpointed, new_run_id
+from src.core import (
+    get_logger, pick_log_file, pick_log_files, parse_files, run_batch, batch_output_dir, write_batch_index,
+    read_log_range, build_correlated_timeline
+)
 
 logger = get_logger("incident_response_driver")
 
@@ -14,35 +25,61 @@ LOG_DIR = ROOT / "data" / "logs"
 OUT_DIR = ROOT / "outputs" / "incident_response"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-def main():
-    logger.info("🚀 Starting Incident Response Multi-Agent System...")
-
-    # Pick log file
-    file_arg = sys.argv[1] if len(sys.argv) > 1 else None
-    log_file = pick_log_file(file_arg, LOG_DIR)
-    log_content = log_file.read_text(encoding="utf-8")
-
-    logger.info(f"Processing log: {log_file.name}")
-    logger.info(f"Log size: {len(log_content)} characters")
 
-    # Build multi-agent graph
-    app = build_incident_response_graph()
-
-    # Initialize state
-    init_state = {
+def build_init_state(log_content: str, correlated: bool = False, report_path: Path = None,
+                     parsed: dict = None) -> dict:
+    """Initial state for one incident (parsed: fields from parse_files, reused by the router)."""
+    state = {
         "log_content": log_content,
+        "focused_log": "",
+        "metrics": None,
+        "incident_context": {},
+        "execution_mode": "",
+        "correlated": correlated,
         "next_agent": "",
+        "triage": {},
+        "fingerprint": "",
+        "cache_hit": False,
         "log_analysis": None,
         "root_cause": None,
         "solution": None,
         "incident_report": "",
+        "report_path": str(report_path or ""),
         "steps_completed": [],
         "errors": []
     }
+    state.update({key: value for key, value in (parsed or {}).items() if key in state})
+    return state
+
+
+def run_single(app, log_file: Path, since: str = "", until: str = "", run_id: str = "", resume: bool = False):
+    """Run the multi-agent workflow for one log file."""
+    log_content = read_log_range(log_file, since, until)
+
+    logger.info(f"Processing log: {log_file.name}")
+    logger.info(f"Log size: {len(log_content)} characters")
+
+    report_file = OUT_DIR / "incident_report.txt"
+    run_incident(app, build_init_state(log_content, report_path=report_file), run_id, resume)
+
+
+def run_correlated(app, log_files, since: str = "", until: str = "", window: int = 120,
+                   run_id: str = "", resume: bool = False):
+    """Run the workflow once on a correlated timeline of several logs."""
+    timeline = build_correlated_timeline(log_files, since, until, window_seconds=window)
+
+    logger.info(f"Correlating logs: {', '.join(f.name for f in log_files)}")
+    logger.info(f"Timeline size: {len(timeline)} characters")
+
+    report_file = OUT_DIR / "correlated_incident_report.txt"
+    run_incident(app, build_init_state(timeline, correlated=True, report_path=report_file), run_id, resume)
 
+
+def run_incident(app, init_state: dict, run_id: str = "", resume: bool = False):
+    """Invoke the graph (which writes the report) and print a preview."""
     # Run multi-agent workflow
     logger.info("=" * 70)
-    final_state = app.invoke(init_state)
+    final_state = invoke_checkpointed(app, init_state, run_id or new_run_id("incident"), resume)
     logger.info("=" * 70)
 
     # Save incident report
@@ -51,9 +88,8 @@ def main():
     else:
         logger.info("✅ Workflow completed successfully!")
 
-    # Save report to file
-    report_file = OUT_DIR / "incident_report.txt"
-    report_file.write_text(final_state["incident_report"], encoding="utf-8")
+    # Report file is written by the graph as sections finish
+    report_file = Path(init_state["report_path"])
     logger.info(f"📄 Incident report saved: {report_file.relative_to(ROOT)}")
 
     # Show summary
@@ -65,5 +101,68 @@ def main():
     logger.info("="*70)
     print(final_state["incident_report"][:500] + "...\\n")
 
+
+def run_many(app, log_files, workers: int, since: str = "", until: str = "", run_id: str = "", resume: bool = False):
+    """Run the workflow for many log files concurrently (one checkpoint thread per file)."""
+    # Reading / triage / windows / metrics run in processes, the LLM waits in threads
+    items, parsed = parse_files(log_files, since, until, max_workers=min(workers, len(log_files)))
+    run_id = run_id or new_run_id("incident")
+    run_dir = OUT_DIR / "batch" / run_id
+
+    def respond(item: dict) -> dict:
+        log_file = Path(item["file"])
+        out_dir = batch_output_dir(run_dir, log_file)
+        report_file = out_dir / "incident_report.txt"
+        fields = parsed.pop(item["file"])
+        init_state = build_init_state(fields["log_content"], report_path=report_file, parsed=fields)
+        final_state = invoke_checkpointed(app, init_state, f"{run_id}/{out_dir.name}", resume)
+
+        return {
+            "status": "failed" if final_state.get("errors") else "success",
+            "report": str(report_file.relative_to(ROOT)),
+            "steps_completed": final_state.get("steps_completed", []),
+            "errors": final_state.get("errors", [])
+        }
+
+    results = run_batch(items, respond, max_workers=workers)
+    index_file = write_batch_index(results, run_dir)
+
+    failed = [r for r in results if r["status"] != "success"]
+    logger.info(f"✅ Batch complete: {len(results) - len(failed)}/{len(results)} succeeded")
+    logger.info(f"📄 Index: {index_file.relative_to(ROOT)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incident Response Multi-Agent System")
+    parser.add_argument("target", nargs="?", default=None, help="Log file, directory or glob")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent incidents in batch mode")
+    parser.add_argument("--since", default="", help="Range start: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    parser.add_argument("--until", default="", help="Range end: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    parser.add_argument("--correlate", action="store_true", help="Merge all logs into one correlated incident")
+    parser.add_argument("--window", type=int, default=120, help="Correlation window in seconds")
+    add_checkpoint_args(parser)
+    args = parser.parse_args()
+    run_id = resolve_run_id(parser, args, "incident")
+
+    logger.info("🚀 Starting Incident Response Multi-Agent System...")
+
+    # Build multi-agent graph
+    app = build_incident_response_graph(checkpointer=get_checkpointer())
+
+    # Single file (or default first log) → classic run
+    if args.target is None or Path(args.target).is_file():
+        run_single(app, pick_log_file(args.target, LOG_DIR), args.since, args.until, run_id, args.resume)
+        return
+
+    log_files = pick_log_files(args.target, LOG_DIR)
+
+    # Directory or glob → one correlated incident
+    if args.correlate:
+        run_correlated(app, log_files, args.since, args.until, args.window, run_id, args.resume)
+        return
+
+    # Directory or glob → batch run
+    run_many(app, log_files, args.workers, args.since, args.until, run_id, args.resume)
+
 if __name__ == "__main__":
     main()
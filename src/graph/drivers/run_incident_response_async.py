@@ -0,0 +1,90 @@
+"""
+Driver for Incident Response Multi-Agent System - Async Mode
+Triages many service logs concurrently (e.g. during an outage) with the async agent nodes.
+
+Usage:
+    python -m src.graph.drivers.run_incident_response_async data/logs --max-concurrency 16
+    python -m src.graph.drivers.run_incident_response_async "data/logs/*.log" --since 14:15 --until 14:30
+    python -m src.graph.drivers.run_incident_response_async data/logs --run-id <id> --resume
+
+LLM calls are additionally capped globally and per provider
+(MAX_CONCURRENT_LLM_CALLS, OPENAI_CONCURRENCY, GOOGLE_CONCURRENCY, OLLAMA_CONCURRENCY).
+"""
+import argparse
+import asyncio
+from pathlib import Path
+from src.graph.incident_response.graph import build_incident_response_graph
+from src.graph.checkpoints import aget_checkpointer, add_checkpoint_args, resolve_run_id, ainvoke_checkpointed, new_run_id
+from src.graph.drivers.run_incident_response import build_init_state
+from src.core import (
+    get_logger, pick_log_files, parse_files, arun_batch, batch_output_dir, write_batch_index
+)
+
+logger = get_logger("incident_response_async_driver")
+
+# Paths
+ROOT = Path(__file__).resolve().parents[3]
+LOG_DIR = ROOT / "data" / "logs"
+OUT_DIR = ROOT / "outputs" / "incident_response" / "batch"
+
+
+async def respond_all(log_files, max_concurrency: int, since: str = "", until: str = "",
+                      run_id: str = "", resume: bool = False) -> Path:
+    """Run every log through the async graph, max_concurrency incidents at a time."""
+    run_id = run_id or new_run_id("incident_async")
+    async with aget_checkpointer() as checkpointer:
+        app = build_incident_response_graph(use_async=True, checkpointer=checkpointer)
+        return await _respond_all(app, log_files, max_concurrency, since, until, run_id, resume)
+
+
+async def _respond_all(app, log_files, max_concurrency: int, since: str, until: str,
+                       run_id: str, resume: bool) -> Path:
+    # Parsing runs in a process pool, largest / most error-heavy logs start first
+    items, parsed = parse_files(log_files, since, until, max_workers=min(4, len(log_files)))
+    run_dir = OUT_DIR / run_id
+
+    async def respond(item: dict) -> dict:
+        log_file = Path(item["file"])
+        out_dir = batch_output_dir(run_dir, log_file)
+        report_file = out_dir / "incident_report.txt"
+        fields = parsed.pop(item["file"])
+
+        # One checkpoint thread per file: --resume only re-runs the incidents that did not finish
+        init_state = build_init_state(fields["log_content"], report_path=report_file, parsed=fields)
+        final_state = await ainvoke_checkpointed(app, init_state, f"{run_id}/{out_dir.name}", resume)
+
+        return {
+            "status": "failed" if final_state.get("errors") else "success",
+            "report": str(report_file.relative_to(ROOT)),
+            "execution_mode": final_state.get("execution_mode") or final_state["triage"].get("action"),
+            "steps_completed": final_state.get("steps_completed", []),
+            "errors": final_state.get("errors", [])
+        }
+
+    results = await arun_batch(items, respond, max_concurrency=max_concurrency)
+    index_file = write_batch_index(results, run_dir)
+
+    failed = [r for r in results if r["status"] != "success"]
+    logger.info(f"✅ Async batch complete: {len(results) - len(failed)}/{len(results)} succeeded")
+    return index_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incident Response Multi-Agent System (async batch)")
+    parser.add_argument("target", nargs="?", default=None, help="Log file, directory or glob (default: data/logs)")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="Incidents processed at the same time")
+    parser.add_argument("--since", default="", help="Range start: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    parser.add_argument("--until", default="", help="Range end: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    add_checkpoint_args(parser)
+    args = parser.parse_args()
+    run_id = resolve_run_id(parser, args, "incident_async")
+
+    logger.info("🚀 Starting Incident Response Multi-Agent System (async)...")
+
+    log_files = pick_log_files(args.target, LOG_DIR)
+    index_file = asyncio.run(respond_all(log_files, args.max_concurrency, args.since, args.until,
+                                         run_id, args.resume))
+    logger.info(f"📄 Index: {index_file.relative_to(ROOT)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Driver for Log Analyzer Pipeline - Batch Mode
+Analyzes every log in a directory (or glob) concurrently.
+
+Usage:
+    python -m src.graph.drivers.run_log_analyzer_batch data/logs --pipeline rag --workers 4
+    python -m src.graph.drivers.run_log_analyzer_batch "data/logs/*_error.log"
+    python -m src.graph.drivers.run_log_analyzer_batch data/logs --run-id <id> --resume   (finish a failed batch)
+"""
+import argparse
+import importlib
+from pathlib import Path
+from src.graph.checkpoints import get_checkpointer, add_checkpoint_args, resolve_run_id, invoke_checkpointed
+from src.core import (
+    get_logger, pick_log_files, parse_files, run_batch, batch_output_dir, write_batch_index
+)
+
+logger = get_logger("log_analyzer_batch_driver")
+
+# Paths
+ROOT = Path(__file__).resolve().parents[3]
+LOG_DIR = ROOT / "data" / "logs"
+OUT_DIR = ROOT / "outputs" / "log_analyzer" / "batch"
+
+# Pipeline name → graph module
+PIPELINES = {
+    "basic": "src.graph.log_analyzer.graph",
+    "rag": "src.graph.log_analyzer_rag.graph",
+    "memory": "src.graph.log_analyzer_memory.graph",
+}
+
+
+def build_init_state(log_file: str, output_dir: str, since: str = "", until: str = "",
+                     parsed: dict = None) -> dict:
+    """Initial state shared by all log analyzer graphs (parsed: fields from parse_files)."""
+    state = {
+        "log_file": log_file,
+        "output_dir": output_dir,
+        "since": since,
+        "until": until,
+        "log_content": "",
+        "triage": {},
+        "focused_log": "",
+        "metrics": "",
+        "log_digest": "",
+        "fingerprint": "",
+        "cache_hit": False,
+        "retrieved_context": "",
+        "retrieved_docs": [],
+        "conversation_history": [],
+        "past_incidents": "",
+        "past_matches": [],
+        "stage_timings": {},
+        "analysis_text": "",
+        "analysis_json": {},
+        "executive_summary": "",
+        "errors": []
+    }
+    state.update(parsed or {})
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch log analysis")
+    parser.add_argument("target", nargs="?", default=str(LOG_DIR), help="Log file, directory or glob")
+    parser.add_argument("--pipeline", choices=sorted(PIPELINES), default="basic")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent LLM pipelines")
+    parser.add_argument("--since", default="", help="Range start: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    parser.add_argument("--until", default="", help="Range end: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    add_checkpoint_args(parser)
+    args = parser.parse_args()
+    run_id = resolve_run_id(parser, args, args.pipeline)
+
+    logger.info(f"🚀 Starting Log Analyzer batch ({args.pipeline})...")
+
+    log_files = pick_log_files(args.target, LOG_DIR)
+    # Reading / triage / windows / metrics run in processes, the LLM waits in threads
+    items, parsed = parse_files(log_files, args.since, args.until, max_workers=min(args.workers, len(log_files)))
+
+    # Build graph once, compiled graphs are safe to invoke from many threads
+    app = importlib.import_module(PIPELINES[args.pipeline]).build_graph(checkpointer=get_checkpointer())
+
+    # One checkpoint thread per file: --resume only re-runs the files that did not finish
+    run_dir = OUT_DIR / run_id
+
+    def analyze(item: dict) -> dict:
+        out_dir = batch_output_dir(run_dir, Path(item["file"]))
+        init_state = build_init_state(item["file"], str(out_dir), args.since, args.until,
+                                      parsed=parsed.pop(item["file"]))
+        final_state = invoke_checkpointed(app, init_state, f"{run_id}/{out_dir.name}", args.resume)
+
+        analysis = final_state.get("analysis_json", {})
+        return {
+            "status": "failed" if final_state.get("errors") else "success",
+            "output_dir": str(out_dir.relative_to(ROOT)),
+            "severity": analysis.get("severity", "unknown"),
+            "error_count": analysis.get("error_count", 0),
+            "summary": analysis.get("summary", ""),
+            "errors": final_state.get("errors", [])
+        }
+
+    results = run_batch(items, analyze, max_workers=args.workers)
+    index_file = write_batch_index(results, run_dir)
+
+    failed = [r for r in results if r["status"] != "success"]
+    logger.info(f"✅ Batch complete: {len(results) - len(failed)}/{len(results)} succeeded")
+    logger.info(f"📄 Index: {index_file.relative_to(ROOT)}")
+
+    for r in failed:
+        logger.error(f"{Path(r['file']).name}: {r.get('errors')}")
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,43 @@
 """
 Driver for Log Analyzer Pipeline
+
+Usage:
+    python -m src.graph.drivers.run_log_analyzer_rag_pipeline [log_file] [--since 14:15] [--until 14:20]
+    python -m src.graph.drivers.run_log_analyzer_rag_pipeline --run-id <id> --resume   (continue a failed run)
 """
+import argparse
 from src.graph.log_analyzer_rag.graph import build_graph
+from src.graph.checkpoints import get_checkpointer, add_checkpoint_args, resolve_run_id, invoke_checkpointed
 from src.core import get_logger
 
 logger = get_logger("log_analyzer_driver")
 
 def main():
+    parser = argparse.ArgumentParser(description="Log Analyzer pipeline")
+    parser.add_argument("log_file", nargs="?", default="", help="Log file (default: first in data/logs)")
+    parser.add_argument("--since", default="", help="Range start: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    parser.add_argument("--until", default="", help="Range end: 'YYYY-MM-DD HH:MM[:SS]' or 'HH:MM[:SS]'")
+    add_checkpoint_args(parser)
+    args = parser.parse_args()
+    run_id = resolve_run_id(parser, args, "log_analyzer_rag")
+
     logger.info("🚀 Starting Log Analyzer pipeline...")
 
     # Build graph
-    app = build_graph()
+    app = build_graph(checkpointer=get_checkpointer())
 
     # Initialize empty state
     init_state = {
+        "log_file": args.log_file,
+        "since": args.since,
+        "until": args.until,
         "log_content": "",
+        "triage": {},
+        "focused_log": "",
+        "metrics": "",
+        "log_digest": "",
+        "fingerprint": "",
+        "cache_hit": False,
         "retrieved_context": "",
         "analysis_text": "",
         "analysis_json": {},
@@ -23,7 +46,7 @@ def main():
     }
 
     # Run pipeline
-    final_state = app.invoke(init_state)
+    final_state = invoke_checkpointed(app, init_state, run_id, args.resume)
 
     # Show results
     logger.info(f"✅ Pipeline complete!")
@@ -0,0 +1,133 @@
+"""
+Driver for TestCase Generator Pipeline - Batch Mode
+Generates test cases for every requirement in a directory (or glob) concurrently
+and combines them into one deduplicated dataset.
+
+Usage:
+    APPROVAL_POLICY=validation_pass python -m src.graph.drivers.run_test_case_batch data/requirements --pipeline rag
+    APPROVAL_MODE=queue python -m src.graph.drivers.run_test_case_batch "data/requirements/*.txt" --workers 8
+    python -m src.graph.drivers.run_test_case_batch data/requirements --run-id <id> --resume   (after approvals / failures)
+
+Batch runs never block on input(): use APPROVAL_MODE=queue (review with run_approval_queue)
+or an auto-approve APPROVAL_POLICY.
+"""
+import argparse
+import importlib
+from pathlib import Path
+from src.graph.checkpoints import (
+    get_checkpointer, add_checkpoint_args, resolve_run_id, invoke_checkpointed, pending_interrupt
+)
+from src.core import (
+    get_logger, pick_requirement_files, run_batch, batch_output_dir, write_batch_index,
+    combine_test_cases, write_test_case_dataset, ApprovalQueue, APPROVAL_MODE, APPROVAL_POLICY
+)
+
+logger = get_logger("testcase_batch_driver")
+
+# Paths
+ROOT = Path(__file__).resolve().parents[3]
+REQ_DIR = ROOT / "data" / "requirements"
+OUT_DIR = ROOT / "outputs" / "testcase_generated" / "batch"
+
+# Pipeline name → graph module (names match the approval queue)
+PIPELINES = {
+    "testcase": "src.graph.test_case_generator.graph",
+    "testcase_rag": "src.graph.testcase_rag.graph",
+    "testcase_memory": "src.graph.testcase_memory.graph",
+}
+
+
+def build_init_state(requirement_file: str, output_dir: str) -> dict:
+    """Initial state shared by all test case graphs."""
+    return {
+        "requirement_file": requirement_file,
+        "output_dir": output_dir,
+        "requirement": "",
+        "retrieved_context": "",
+        "retrieved_docs": [],
+        "conversation_history": [],
+        "past_patterns": "",
+        "past_matches": [],
+        "stage_timings": {},
+        "test_cases": [],
+        "sections": [],
+        "invalid_cases": [],
+        "errors": [],
+        "validation_status": "pending",
+        "retry_count": 0,
+        "model_tier": 0,
+        "human_approval": "pending",
+        "human_feedback": ""
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch test case generation")
+    parser.add_argument("target", nargs="?", default=str(REQ_DIR), help="Requirement file, directory or glob")
+    parser.add_argument("--pipeline", choices=sorted(PIPELINES), default="testcase")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent LLM pipelines")
+    add_checkpoint_args(parser)
+    args = parser.parse_args()
+    run_id = resolve_run_id(parser, args, args.pipeline)
+
+    if APPROVAL_MODE != "queue" and APPROVAL_POLICY == "manual":
+        parser.error("batch mode cannot ask on the terminal: set APPROVAL_MODE=queue or APPROVAL_POLICY")
+
+    logger.info(f"🚀 Starting TestCase Generator batch ({args.pipeline})...")
+
+    req_files = pick_requirement_files(args.target, REQ_DIR)
+    app = importlib.import_module(PIPELINES[args.pipeline]).build_graph(checkpointer=get_checkpointer())
+    queue = ApprovalQueue()
+
+    # One checkpoint thread per requirement: --resume skips the ones that already finished
+    run_dir = OUT_DIR / run_id
+    generated = {}
+
+    def generate(item: dict) -> dict:
+        req_file = Path(item["file"])
+        out_dir = batch_output_dir(run_dir, req_file)
+        thread_id = f"{run_id}/{out_dir.name}"
+
+        final_state = invoke_checkpointed(app, build_init_state(str(req_file), str(out_dir)), thread_id, args.resume)
+
+        preview = pending_interrupt(app, thread_id)
+        if preview is not None:
+            queue.submit(thread_id, args.pipeline, preview)
+            return {"status": "awaiting_approval", "run_id": thread_id}
+
+        test_cases = final_state.get("test_cases", []) if final_state.get("human_approval") == "approved" else []
+        if test_cases:
+            # Same file name in two directories: out_dir.name (stem + path hash) keeps both
+            generated[out_dir.name] = test_cases
+
+        return {
+            "status": "failed" if final_state.get("errors") else "success",
+            "output_dir": str(out_dir.relative_to(ROOT)),
+            "test_cases": len(test_cases),
+            "retries": final_state.get("retry_count", 0),
+            "errors": final_state.get("errors", [])
+        }
+
+    items = [{"file": str(f)} for f in req_files]
+    results = run_batch(items, generate, max_workers=args.workers)
+    index_file = write_batch_index(results, run_dir)
+
+    # One deduplicated dataset across all approved requirements
+    csv_file = write_test_case_dataset(combine_test_cases(generated), run_dir)
+
+    paused = [r for r in results if r["status"] == "awaiting_approval"]
+    failed = [r for r in results if r["status"] == "failed"]
+    logger.info(f"✅ Batch complete: {len(generated)}/{len(results)} requirements approved, "
+                f"{len(paused)} awaiting approval, {len(failed)} failed")
+    logger.info(f"📄 Index: {index_file.relative_to(ROOT)}")
+    logger.info(f"📄 Dataset: {csv_file.relative_to(ROOT)}")
+
+    if paused:
+        logger.info(f"⏸️ Review: python -m src.graph.drivers.run_approval_queue, "
+                    f"then rerun with --run-id {run_id} --resume to complete the dataset")
+
+    for r in failed:
+        logger.error(f"{Path(r['file']).name}: {r.get('errors')}")
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,62 @@
 """
 Driver for TestCase Generator Pipeline
+
+Usage:
+    python -m src.graph.drivers.run_test_case_memory_pipeline
+    python -m src.graph.drivers.run_test_case_memory_pipeline --run-id <id> --resume   (continue a failed run)
+    APPROVAL_MODE=queue python -m src.graph.drivers.run_test_case_memory_pipeline        (queue for approval, don't wait)
 """
+import argparse
 from src.graph.testcase_memory.graph import build_graph
-from src.core import get_logger
+from src.graph.checkpoints import (
+    get_checkpointer, add_checkpoint_args, resolve_run_id, invoke_checkpointed, pending_interrupt
+)
+from src.core import get_logger, ApprovalQueue
 
 logger = get_logger("testcase_driver")
 
 def main():
+    parser = argparse.ArgumentParser(description="TestCase Generator pipeline")
+    add_checkpoint_args(parser)
+    args = parser.parse_args()
+    run_id = resolve_run_id(parser, args, "testcase_memory")
+
     logger.info("🚀 Starting TestCase Generator pipeline (with Human Approval)...")
 
     # Build graph
-    app = build_graph()
+    app = build_graph(checkpointer=get_checkpointer())
 
     # Initialize state with new fields
     init_state = {
+        "requirement_file": "",
+        "output_dir": "",
         "requirement": "",
         "retrieved_context": "",
+        "retrieved_docs": [],
         "conversation_history": [],  # NEW
         "past_patterns": "",  # NEW
+        "past_matches": [],
+        "stage_timings": {},
         "test_cases": [],
+        "sections": [],
+        "invalid_cases": [],
         "errors": [],
         "validation_status": "pending",
         "retry_count": 0,
+        "model_tier": 0,
         "human_approval": "pending",
         "human_feedback": ""
     }
 
     # Run pipeline
-    final_state = app.invoke(init_state)
+    final_state = invoke_checkpointed(app, init_state, run_id, args.resume)
+
+    # APPROVAL_MODE=queue: the run is paused at approval, a reviewer resumes it later
+    preview = pending_interrupt(app, run_id)
+    if preview is not None:
+        ApprovalQueue().submit(run_id, "testcase_memory", preview)
+        logger.info("⏸️ Awaiting approval: python -m src.graph.drivers.run_approval_queue")
+        return
 
     # Show results
     logger.info(f"✅ Pipeline complete!")
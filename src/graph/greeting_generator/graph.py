@@ -5,7 +5,7 @@ from langgraph.graph import StateGraph, END
 from .state import GreetingState
 from .nodes import validate_name, generate_greeting, add_timestamp
 
-def build_graph():
+def build_graph(checkpointer=None):
     # Create Graph
     workflow = StateGraph(GreetingState)
     
@@ -21,4 +21,4 @@ def build_graph():
     workflow.add_edge("timestamp", END)
     
     # Compile graph
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile(checkpointer=checkpointer)
\ No newline at end of file
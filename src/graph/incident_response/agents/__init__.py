@@ -1,12 +1,21 @@
 """
 Incident Response Agents
 """
-from .log_analyzer import log_analyzer_agent
-from .root_cause_investigator import root_cause_investigator_agent
-from .solution_recommender import solution_recommender_agent
+from .log_analyzer import log_analyzer_agent, alog_analyzer_agent
+from .root_cause_investigator import root_cause_investigator_agent, aroot_cause_investigator_agent
+from .solution_recommender import solution_recommender_agent, asolution_recommender_agent
+from .fused_responder import fused_responder_agent, afused_responder_agent
+from .pipelined_responder import pipelined_responder_agent, apipelined_responder_agent
 
 __all__ = [
     "log_analyzer_agent",
     "root_cause_investigator_agent",
-    "solution_recommender_agent"
+    "solution_recommender_agent",
+    "fused_responder_agent",
+    "pipelined_responder_agent",
+    "alog_analyzer_agent",
+    "aroot_cause_investigator_agent",
+    "asolution_recommender_agent",
+    "afused_responder_agent",
+    "apipelined_responder_agent"
 ]
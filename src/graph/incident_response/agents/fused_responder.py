@@ -0,0 +1,108 @@
+"""
+Fused Responder Agent - Log analysis, root cause and solution in one call
+"""
+from src.core import get_logger, get_langchain_llm, SMALL_MODEL, estimate_tokens, llm_slot
+from src.prompts import FUSED_INCIDENT_PROMPT, FUSED_SECTION_MARKERS
+from langchain_core.output_parsers import StrOutputParser
+from ..context import context_for, with_findings
+from ..report import write_progress
+
+logger = get_logger("fused_responder")
+
+# Initialize LLM and chain
+llm = get_langchain_llm()
+parser = StrOutputParser()
+chain = llm | parser
+
+# Cheaper chain for logs triaged as "minor"
+small_chain = get_langchain_llm(SMALL_MODEL) | parser
+
+SECTION_KEYS = ("log_analysis", "root_cause", "solution")
+
+
+def fused_responder_agent(state):
+    """Single structured call that fills all three agent results."""
+    logger.info("⚡ Fused Responder running...")
+    prompt, active_chain = _prepare(state)
+
+    try:
+        response = active_chain.invoke(prompt)
+        return _success(state, response)
+
+    except Exception as e:
+        return _failure(state, e)
+
+
+async def afused_responder_agent(state):
+    """Async variant: ainvoke under the global / per-provider concurrency caps."""
+    logger.info("⚡ Fused Responder running (async)...")
+    prompt, active_chain = _prepare(state)
+
+    try:
+        async with llm_slot():
+            response = await active_chain.ainvoke(prompt)
+        return _success(state, response)
+
+    except Exception as e:
+        return _failure(state, e)
+
+
+def _prepare(state):
+    log_content = context_for(state["incident_context"], "fused_responder")["log_content"]
+    logger.info(f"Input ≈{estimate_tokens(log_content)} tokens")
+
+    # Minor logs go to the small model
+    active_chain = small_chain if state["triage"]["action"] == "small" else chain
+    return FUSED_INCIDENT_PROMPT.format(log_content=log_content), active_chain
+
+
+def _success(state, response):
+    sections = split_sections(response)
+
+    updates = {key: sections[key] for key in SECTION_KEYS if sections.get(key)}
+    write_progress(state, **updates)
+
+    # Missing sections stay empty and the run leaves fused mode, so the router
+    # sends them to the specialist agents instead of back to this node
+    missing = [key for key in SECTION_KEYS if not sections.get(key)]
+    if missing:
+        logger.warning(f"⚠️ Fused answer missing sections: {', '.join(missing)} - falling back to agents")
+        updates["execution_mode"] = "full"
+    else:
+        logger.info(f"✅ Fused response complete ({len(response)} chars)")
+
+    context = state["incident_context"]
+    if sections.get("log_analysis"):
+        context = with_findings(context, "log_analyzer", sections["log_analysis"])
+    if sections.get("root_cause"):
+        context = with_findings(context, "root_cause_investigator", sections["root_cause"])
+
+    return {
+        **updates,
+        "incident_context": context,
+        "steps_completed": state["steps_completed"] + ["fused_responder"]
+    }
+
+
+def _failure(state, e):
+    logger.error(f"❌ Fused Responder failed: {e} - falling back to agents")
+    return {
+        "steps_completed": state["steps_completed"] + ["fused_responder"],
+        "execution_mode": "full"
+    }
+
+
+def split_sections(response: str) -> dict:
+    """Split the fused answer on its marker lines."""
+    positions = sorted(
+        (response.find(marker), marker, key)
+        for marker, key in zip(FUSED_SECTION_MARKERS, SECTION_KEYS)
+        if marker in response
+    )
+
+    sections = {}
+    for i, (start, marker, key) in enumerate(positions):
+        end = positions[i + 1][0] if i + 1 < len(positions) else len(response)
+        sections[key] = response[start + len(marker):end].strip()
+
+    return sections
@@ -1,9 +1,11 @@
 """
 Log Analyzer Agent - Analyzes error logs
 """
-from src.core import get_logger, get_langchain_llm
-from src.prompts import LOG_ANALYZER_PROMPT
+from src.core import get_logger, get_langchain_llm, SMALL_MODEL, estimate_tokens, llm_slot
+from src.prompts import LOG_ANALYZER_PROMPT, LOG_ANALYZER_DIGEST_PROMPT
 from langchain_core.output_parsers import StrOutputParser
+from ..context import context_for, with_findings
+from ..report import write_progress
 
 logger = get_logger("log_analyzer_agent")
 
@@ -12,28 +14,64 @@ llm = get_langchain_llm()
 parser = StrOutputParser()
 chain = llm | parser
 
+# Cheaper chain for logs triaged as "minor"
+small_chain = get_langchain_llm(SMALL_MODEL) | parser
+
 def log_analyzer_agent(state):
     """Analyze error logs and identify critical issues."""
     logger.info("🔍 Log Analyzer running...")
-
-    log_content = state["log_content"]
+    prompt, active_chain = _prepare(state)
 
     try:
         # Call LLM to analyze log
-        prompt = LOG_ANALYZER_PROMPT.format(log_content=log_content)
-        analysis = chain.invoke(prompt)
+        analysis = active_chain.invoke(prompt)
+        return _success(state, analysis)
 
-        logger.info(f"✅ Log analysis complete ({len(analysis)} chars)")
+    except Exception as e:
+        return _failure(state, e)
 
-        return {
-            "log_analysis": analysis,
-            "steps_completed": state["steps_completed"] + ["log_analyzer"]
-        }
+async def alog_analyzer_agent(state):
+    """Async variant: ainvoke under the global / per-provider concurrency caps."""
+    logger.info("🔍 Log Analyzer running (async)...")
+    prompt, active_chain = _prepare(state)
+
+    try:
+        async with llm_slot():
+            analysis = await active_chain.ainvoke(prompt)
+        return _success(state, analysis)
 
     except Exception as e:
-        logger.error(f"❌ Log Analyzer failed: {e}")
-        return {
-            "log_analysis": f"Error: {e}",
-            "steps_completed": state["steps_completed"] + ["log_analyzer"],
-            "errors": state["errors"] + [f"Log Analyzer: {e}"]
-        }
+        return _failure(state, e)
+
+def _prepare(state):
+    """Prompt (from the shared incident context) and chain for this incident."""
+    context = state["incident_context"]
+    log_content = context_for(context, "log_analyzer")["log_content"]
+    logger.info(f"Input ≈{estimate_tokens(log_content)} tokens")
+
+    if context["use_digest"]:
+        prompt = LOG_ANALYZER_DIGEST_PROMPT.format(log_digest=log_content)
+    else:
+        prompt = LOG_ANALYZER_PROMPT.format(log_content=log_content)
+
+    # Minor logs go to the small model
+    active_chain = small_chain if state["triage"]["action"] == "small" else chain
+    return prompt, active_chain
+
+def _success(state, analysis):
+    logger.info(f"✅ Log analysis complete ({len(analysis)} chars)")
+    write_progress(state, log_analysis=analysis)
+
+    return {
+        "log_analysis": analysis,
+        "incident_context": with_findings(state["incident_context"], "log_analyzer", analysis),
+        "steps_completed": state["steps_completed"] + ["log_analyzer"]
+    }
+
+def _failure(state, e):
+    logger.error(f"❌ Log Analyzer failed: {e}")
+    return {
+        "log_analysis": f"Error: {e}",
+        "steps_completed": state["steps_completed"] + ["log_analyzer"],
+        "errors": state["errors"] + [f"Log Analyzer: {e}"]
+    }
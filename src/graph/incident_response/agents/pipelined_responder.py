@@ -0,0 +1,218 @@
+"""
+Pipelined Responder - Streams the three agents with prefix hand-off
+Each stage starts as soon as the previous one has emitted a stable prefix,
+so latency approaches the slowest stage instead of the sum of all three.
+"""
+import asyncio
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from src.core import get_logger, get_langchain_llm, SMALL_MODEL, llm_slot
+from src.prompts import LOG_ANALYZER_PROMPT, LOG_ANALYZER_DIGEST_PROMPT, ROOT_CAUSE_DIGEST_PROMPT, SOLUTION_PROMPT
+from langchain_core.output_parsers import StrOutputParser
+from ..context import context_for, with_findings
+from ..report import write_progress
+
+logger = get_logger("pipelined_responder")
+
+# Initialize LLM and chain
+llm = get_langchain_llm()
+parser = StrOutputParser()
+chain = llm | parser
+
+# Cheaper chain for logs triaged as "minor"
+small_chain = get_langchain_llm(SMALL_MODEL) | parser
+
+# The prefix before these lines is stable enough to hand downstream:
+#   log analysis → once "Top issues" is done and the affected systems section starts
+#   root cause   → once the root cause statement is done and the technical explanation starts
+HANDOFF_MARKERS = {
+    "log_analyzer": re.compile(r"^\W*(?:4[.)]\W*)?affected (?:systems|services)", re.I | re.M),
+    "root_cause_investigator": re.compile(r"^\W*(?:2[.)]\W*)?technical explanation", re.I | re.M),
+}
+
+STAGES = [("log_analysis", "Log Analyzer"),
+          ("root_cause", "Root Cause Investigator"),
+          ("solution", "Solution Recommender")]
+
+
+def pipelined_responder_agent(state):
+    """Run log analysis, root cause and solution as overlapping streams (threads)."""
+    logger.info("⇢ Pipelined Responder running...")
+
+    context = state["incident_context"]
+    active_chain = small_chain if state["triage"]["action"] == "small" else chain
+
+    analysis_prefix, root_cause_prefix = Future(), Future()
+    finish = _progress_writer(state)
+
+    def analyze():
+        analysis = stream_with_handoff(active_chain, _analysis_prompt(context), analysis_prefix,
+                                       HANDOFF_MARKERS["log_analyzer"])
+        finish("log_analysis", analysis)
+        return analysis
+
+    def investigate():
+        prompt = _root_cause_prompt(context, analysis_prefix.result())
+        root_cause = stream_with_handoff(active_chain, prompt, root_cause_prefix,
+                                         HANDOFF_MARKERS["root_cause_investigator"])
+        finish("root_cause", root_cause)
+        return root_cause
+
+    def recommend():
+        prompt = _solution_prompt(context, analysis_prefix.result(), root_cause_prefix.result())
+        solution = active_chain.invoke(prompt)
+        finish("solution", solution)
+        return solution
+
+    outcomes = []
+    with ThreadPoolExecutor(max_workers=len(STAGES)) as pool:
+        for future in [pool.submit(stage) for stage in (analyze, investigate, recommend)]:
+            try:
+                outcomes.append(future.result())
+            except Exception as e:
+                outcomes.append(e)
+
+    return _result(state, outcomes)
+
+
+async def apipelined_responder_agent(state):
+    """Async variant: the same hand-off with astream / asyncio tasks under the concurrency caps."""
+    logger.info("⇢ Pipelined Responder running (async)...")
+
+    context = state["incident_context"]
+    active_chain = small_chain if state["triage"]["action"] == "small" else chain
+
+    loop = asyncio.get_running_loop()
+    analysis_prefix, root_cause_prefix = loop.create_future(), loop.create_future()
+    finish = _progress_writer(state)
+
+    async def analyze():
+        async with llm_slot():
+            analysis = await astream_with_handoff(active_chain, _analysis_prompt(context), analysis_prefix,
+                                                  HANDOFF_MARKERS["log_analyzer"])
+        finish("log_analysis", analysis)
+        return analysis
+
+    async def investigate():
+        prompt = _root_cause_prompt(context, await analysis_prefix)
+        async with llm_slot():
+            root_cause = await astream_with_handoff(active_chain, prompt, root_cause_prefix,
+                                                    HANDOFF_MARKERS["root_cause_investigator"])
+        finish("root_cause", root_cause)
+        return root_cause
+
+    async def recommend():
+        prompt = _solution_prompt(context, await analysis_prefix, await root_cause_prefix)
+        async with llm_slot():
+            solution = await active_chain.ainvoke(prompt)
+        finish("solution", solution)
+        return solution
+
+    outcomes = await asyncio.gather(analyze(), investigate(), recommend(), return_exceptions=True)
+    return _result(state, list(outcomes))
+
+
+def stream_with_handoff(active_chain, prompt: str, prefix: Future, marker: re.Pattern) -> str:
+    """
+    Stream a response; resolve `prefix` with the text before the first marker line
+    (or the whole text if the marker never shows up). Failures propagate downstream.
+    """
+    text = ""
+    try:
+        for chunk in active_chain.stream(prompt):
+            text += chunk
+            _maybe_handoff(text, prefix, marker)
+    except Exception as e:
+        if not prefix.done():
+            prefix.set_exception(e)
+        raise
+
+    if not prefix.done():
+        prefix.set_result(text)
+    return text
+
+
+async def astream_with_handoff(active_chain, prompt: str, prefix: asyncio.Future, marker: re.Pattern) -> str:
+    """Async counterpart of stream_with_handoff."""
+    text = ""
+    try:
+        async for chunk in active_chain.astream(prompt):
+            text += chunk
+            _maybe_handoff(text, prefix, marker)
+    except Exception as e:
+        if not prefix.done():
+            prefix.set_exception(e)
+        raise
+
+    if not prefix.done():
+        prefix.set_result(text)
+    return text
+
+
+def _maybe_handoff(text: str, prefix, marker: re.Pattern):
+    if prefix.done():
+        return
+    match = marker.search(text)
+    if match:
+        logger.info(f"⇢ Stable prefix handed off ({match.start()} chars)")
+        prefix.set_result(text[:match.start()])
+
+
+def _analysis_prompt(context: dict) -> str:
+    log_content = context_for(context, "log_analyzer")["log_content"]
+    if context["use_digest"]:
+        return LOG_ANALYZER_DIGEST_PROMPT.format(log_digest=log_content)
+    return LOG_ANALYZER_PROMPT.format(log_content=log_content)
+
+
+def _root_cause_prompt(context: dict, analysis_prefix: str) -> str:
+    prefix_context = with_findings(context, "log_analyzer", analysis_prefix)
+    return ROOT_CAUSE_DIGEST_PROMPT.format(**context_for(prefix_context, "root_cause_investigator"))
+
+
+def _solution_prompt(context: dict, analysis_prefix: str, root_cause_prefix: str) -> str:
+    prefix_context = with_findings(context, "log_analyzer", analysis_prefix)
+    prefix_context = with_findings(prefix_context, "root_cause_investigator", root_cause_prefix)
+    return SOLUTION_PROMPT.format(**context_for(prefix_context, "solution_recommender"))
+
+
+def _progress_writer(state):
+    """Progressive report: every finished section is written immediately."""
+    finished = {}
+    lock = threading.Lock()
+
+    def finish(key: str, text: str):
+        with lock:
+            finished[key] = text
+            write_progress(state, **finished)
+
+    return finish
+
+
+def _result(state, outcomes: list) -> dict:
+    """State update from the three stage outcomes (text or exception)."""
+    results, errors = {}, []
+    for (key, name), outcome in zip(STAGES, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"❌ {name} failed: {outcome}")
+            results[key] = f"Error: {outcome}"
+            errors.append(f"{name}: {outcome}")
+        else:
+            results[key] = outcome
+
+    if not errors:
+        logger.info("✅ Pipelined response complete")
+
+    context = state["incident_context"]
+    if not isinstance(outcomes[0], Exception):
+        context = with_findings(context, "log_analyzer", results["log_analysis"])
+    if not isinstance(outcomes[1], Exception):
+        context = with_findings(context, "root_cause_investigator", results["root_cause"])
+
+    return {
+        **results,
+        "incident_context": context,
+        "steps_completed": state["steps_completed"] + ["pipelined_responder"],
+        "errors": state["errors"] + errors
+    }
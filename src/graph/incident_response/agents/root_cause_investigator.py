@@ -1,9 +1,11 @@
 """
 Root Cause Investigator Agent - Finds root cause
 """
-from src.core import get_logger, get_langchain_llm
-from src.prompts import ROOT_CAUSE_PROMPT
+from src.core import get_logger, get_langchain_llm, SMALL_MODEL, estimate_tokens, llm_slot
+from src.prompts import ROOT_CAUSE_DIGEST_PROMPT
 from langchain_core.output_parsers import StrOutputParser
+from ..context import context_for, with_findings
+from ..report import write_progress
 
 logger = get_logger("root_cause_investigator")
 
@@ -12,32 +14,58 @@ llm = get_langchain_llm()
 parser = StrOutputParser()
 chain = llm | parser
 
+# Cheaper chain for logs triaged as "minor"
+small_chain = get_langchain_llm(SMALL_MODEL) | parser
+
 def root_cause_investigator_agent(state):
     """Investigate and determine root cause."""
     logger.info("Root Cause Investigator running...")
-
-    log_analysis = state.get("log_analysis", "")
-    log_content = state["log_content"]
+    prompt, active_chain = _prepare(state)
 
     try:
         # Call LLM to find root cause
-        prompt = ROOT_CAUSE_PROMPT.format(
-            log_analysis=log_analysis,
-            log_content=log_content
-        )
-        root_cause = chain.invoke(prompt)
+        root_cause = active_chain.invoke(prompt)
+        return _success(state, root_cause)
 
-        logger.info(f"✅ Root cause identified ({len(root_cause)} chars)")
+    except Exception as e:
+        return _failure(state, e)
 
-        return {
-            "root_cause": root_cause,
-            "steps_completed": state["steps_completed"] + ["root_cause_investigator"]
-        }
+async def aroot_cause_investigator_agent(state):
+    """Async variant: ainvoke under the global / per-provider concurrency caps."""
+    logger.info("Root Cause Investigator running (async)...")
+    prompt, active_chain = _prepare(state)
+
+    try:
+        async with llm_slot():
+            root_cause = await active_chain.ainvoke(prompt)
+        return _success(state, root_cause)
 
     except Exception as e:
-        logger.error(f"❌ Root Cause Investigator failed: {e}")
-        return {
-            "root_cause": f"Error: {e}",
-            "steps_completed": state["steps_completed"] + ["root_cause_investigator"],
-            "errors": state["errors"] + [f"Root Cause Investigator: {e}"]
-        }
+        return _failure(state, e)
+
+def _prepare(state):
+    """Log analyzer findings + digest instead of the full analysis and original log."""
+    inputs = context_for(state["incident_context"], "root_cause_investigator")
+    logger.info(f"Input ≈{sum(estimate_tokens(v) for v in inputs.values())} tokens")
+
+    # Minor logs go to the small model
+    active_chain = small_chain if state["triage"]["action"] == "small" else chain
+    return ROOT_CAUSE_DIGEST_PROMPT.format(**inputs), active_chain
+
+def _success(state, root_cause):
+    logger.info(f"✅ Root cause identified ({len(root_cause)} chars)")
+    write_progress(state, root_cause=root_cause)
+
+    return {
+        "root_cause": root_cause,
+        "incident_context": with_findings(state["incident_context"], "root_cause_investigator", root_cause),
+        "steps_completed": state["steps_completed"] + ["root_cause_investigator"]
+    }
+
+def _failure(state, e):
+    logger.error(f"❌ Root Cause Investigator failed: {e}")
+    return {
+        "root_cause": f"Error: {e}",
+        "steps_completed": state["steps_completed"] + ["root_cause_investigator"],
+        "errors": state["errors"] + [f"Root Cause Investigator: {e}"]
+    }
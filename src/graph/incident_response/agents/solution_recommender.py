@@ -1,9 +1,11 @@
 """
 Solution Recommender Agent - Suggests fixes
 """
-from src.core import get_logger, get_langchain_llm
+from src.core import get_logger, get_langchain_llm, SMALL_MODEL, estimate_tokens, llm_slot
 from src.prompts import SOLUTION_PROMPT
 from langchain_core.output_parsers import StrOutputParser
+from ..context import context_for
+from ..report import write_progress
 
 logger = get_logger("solution_recommender")
 
@@ -12,32 +14,57 @@ llm = get_langchain_llm()
 parser = StrOutputParser()
 chain = llm | parser
 
+# Cheaper chain for logs triaged as "minor"
+small_chain = get_langchain_llm(SMALL_MODEL) | parser
+
 def solution_recommender_agent(state):
     """Provide actionable fix recommendations."""
     logger.info("💡 Solution Recommender running...")
-
-    root_cause = state.get("root_cause", "")
-    log_analysis = state.get("log_analysis", "")
+    prompt, active_chain = _prepare(state)
 
     try:
         # Call LLM to recommend solutions
-        prompt = SOLUTION_PROMPT.format(
-            root_cause=root_cause,
-            log_analysis=log_analysis
-        )
-        solution = chain.invoke(prompt)
+        solution = active_chain.invoke(prompt)
+        return _success(state, solution)
 
-        logger.info(f"✅ Solutions recommended ({len(solution)} chars)")
+    except Exception as e:
+        return _failure(state, e)
 
-        return {
-            "solution": solution,
-            "steps_completed": state["steps_completed"] + ["solution_recommender"]
-        }
+async def asolution_recommender_agent(state):
+    """Async variant: ainvoke under the global / per-provider concurrency caps."""
+    logger.info("💡 Solution Recommender running (async)...")
+    prompt, active_chain = _prepare(state)
+
+    try:
+        async with llm_slot():
+            solution = await active_chain.ainvoke(prompt)
+        return _success(state, solution)
 
     except Exception as e:
-        logger.error(f"❌ Solution Recommender failed: {e}")
-        return {
-            "solution": f"Error: {e}",
-            "steps_completed": state["steps_completed"] + ["solution_recommender"],
-            "errors": state["errors"] + [f"Solution Recommender: {e}"]
-        }
+        return _failure(state, e)
+
+def _prepare(state):
+    """Findings of the previous agents, not their full answers."""
+    inputs = context_for(state["incident_context"], "solution_recommender")
+    logger.info(f"Input ≈{sum(estimate_tokens(v) for v in inputs.values())} tokens")
+
+    # Minor logs go to the small model
+    active_chain = small_chain if state["triage"]["action"] == "small" else chain
+    return SOLUTION_PROMPT.format(**inputs), active_chain
+
+def _success(state, solution):
+    logger.info(f"✅ Solutions recommended ({len(solution)} chars)")
+    write_progress(state, solution=solution)
+
+    return {
+        "solution": solution,
+        "steps_completed": state["steps_completed"] + ["solution_recommender"]
+    }
+
+def _failure(state, e):
+    logger.error(f"❌ Solution Recommender failed: {e}")
+    return {
+        "solution": f"Error: {e}",
+        "steps_completed": state["steps_completed"] + ["solution_recommender"],
+        "errors": state["errors"] + [f"Solution Recommender: {e}"]
+    }
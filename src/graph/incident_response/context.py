@@ -0,0 +1,103 @@
+"""
+Incident Context - Size-bounded context shared by all agents
+Built once by the router; each agent reads its own budgeted view instead of raw strings
+"""
+import re
+from src.core import build_digest, format_digest, PROMPT_MODE
+from src.core import estimate_tokens, truncate_to_tokens
+
+# Input token budget per agent (prompt instructions not included)
+AGENT_TOKEN_BUDGETS = {
+    "log_analyzer": 3000,
+    "fused_responder": 3000,
+    "root_cause_investigator": 1500,
+    "solution_recommender": 1000,
+}
+
+# Headings, numbered items and bullets carry the findings of an agent's answer
+FINDING_LINE_RE = re.compile(r"^\s*(#{1,6}\s|\d+[.)]\s|[-*•]\s|\*\*[^*]+\*\*)")
+
+
+def build_incident_context(focused_log: str, metrics: str, log_content: str) -> dict:
+    """Digest (built once), evidence for the log analyzer and an empty findings slot per agent."""
+    digest = build_digest(log_content)
+    digest_text = format_digest(digest)
+
+    return {
+        "digest": digest,
+        "digest_text": digest_text,
+        "metrics": metrics,
+        # PROMPT_MODE=digest: the log analyzer reads the digest instead of the error windows
+        "evidence": digest_text if PROMPT_MODE == "digest" else focused_log,
+        "use_digest": PROMPT_MODE == "digest",
+        "findings": {}
+    }
+
+
+def extract_findings(text: str) -> str:
+    """Structured part of an agent answer: headings, list items and each paragraph's lead sentence."""
+    kept = []
+    paragraph_start = True
+
+    for line in text.splitlines():
+        if not line.strip():
+            paragraph_start = True
+            continue
+        if FINDING_LINE_RE.match(line):
+            kept.append(line.rstrip())
+            # A heading starts a new paragraph
+            paragraph_start = line.lstrip().startswith("#") or line.rstrip().endswith((":", ":**"))
+            continue
+        if paragraph_start:
+            kept.append(line.strip().split(". ")[0].rstrip("."))
+        paragraph_start = False
+
+    return "\n".join(kept)
+
+
+def with_findings(context: dict, agent: str, text: str) -> dict:
+    """New context with an agent's findings added."""
+    return {**context, "findings": {**context["findings"], agent: extract_findings(text)}}
+
+
+def context_for(context: dict, agent: str) -> dict:
+    """Budgeted prompt inputs for one agent."""
+    budget = AGENT_TOKEN_BUDGETS[agent]
+    findings = context["findings"]
+
+    if agent in ("log_analyzer", "fused_responder"):
+        metrics = truncate_to_tokens(context["metrics"], budget // 4) if context["metrics"] else ""
+        evidence = truncate_to_tokens(context["evidence"], budget - estimate_tokens(metrics))
+        return {"log_content": f"{metrics}\n\n{evidence}" if metrics else evidence}
+
+    if agent == "root_cause_investigator":
+        return {
+            "log_analysis": truncate_to_tokens(findings.get("log_analyzer", ""), budget // 2),
+            "log_digest": fit_digest(context, budget // 2)
+        }
+
+    if agent == "solution_recommender":
+        return {
+            "root_cause": truncate_to_tokens(findings.get("root_cause_investigator", ""), budget * 2 // 3),
+            "log_analysis": truncate_to_tokens(findings.get("log_analyzer", ""), budget // 3)
+        }
+
+    raise ValueError(f"Unknown agent: {agent}")
+
+
+def fit_digest(context: dict, max_tokens: int) -> str:
+    """Digest text within max_tokens, dropping lower-ranked groups and exemplars first."""
+    digest = context["digest"]
+    text = context["digest_text"]
+    top_n = len(digest["groups"])
+
+    while estimate_tokens(text) > max_tokens and top_n > 3:
+        top_n = max(3, top_n // 2)
+        text = format_digest({
+            **digest,
+            "groups": digest["groups"][:top_n],
+            "other_groups": digest["other_groups"] + len(digest["groups"]) - top_n,
+            "exemplars": digest["exemplars"][:top_n // 3]
+        })
+
+    return truncate_to_tokens(text, max_tokens)
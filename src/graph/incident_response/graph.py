@@ -7,16 +7,37 @@ from .supervisor import supervisor_router, supervisor_compile, route_next
 from .agents import (
     log_analyzer_agent,
     root_cause_investigator_agent,
-    solution_recommender_agent
+    solution_recommender_agent,
+    fused_responder_agent,
+    pipelined_responder_agent,
+    alog_analyzer_agent,
+    aroot_cause_investigator_agent,
+    asolution_recommender_agent,
+    afused_responder_agent,
+    apipelined_responder_agent
 )
 from src.core import get_logger
 
 logger = get_logger("incident_response_graph")
 
-def build_incident_response_graph():
-    """Build multi-agent graph with central router (supervisor pattern)."""
+# Agent node → (sync, async) implementation
+AGENT_NODES = {
+    "log_analyzer": (log_analyzer_agent, alog_analyzer_agent),
+    "root_cause_investigator": (root_cause_investigator_agent, aroot_cause_investigator_agent),
+    "solution_recommender": (solution_recommender_agent, asolution_recommender_agent),
+    "fused_responder": (fused_responder_agent, afused_responder_agent),
+    "pipelined_responder": (pipelined_responder_agent, apipelined_responder_agent),
+}
 
-    logger.info("Building incident response graph...")
+def build_incident_response_graph(use_async: bool = False, checkpointer=None):
+    """
+    Build multi-agent graph with central router (supervisor pattern).
+    use_async=True uses the ainvoke agent nodes (run with ainvoke / abatch).
+    checkpointer (see src.graph.checkpoints) makes runs resumable by run ID.
+    """
+
+    logger.info(f"Building incident response graph{' (async agents)' if use_async else ''}...")
+    agents = {name: nodes[1] if use_async else nodes[0] for name, nodes in AGENT_NODES.items()}
 
     workflow = StateGraph(IncidentState)
 
@@ -24,9 +45,15 @@ def build_incident_response_graph():
     workflow.add_node("router", supervisor_router)
 
     # Add specialist agent nodes
-    workflow.add_node("log_analyzer", log_analyzer_agent)
-    workflow.add_node("root_cause_investigator", root_cause_investigator_agent)
-    workflow.add_node("solution_recommender", solution_recommender_agent)
+    workflow.add_node("log_analyzer", agents["log_analyzer"])
+    workflow.add_node("root_cause_investigator", agents["root_cause_investigator"])
+    workflow.add_node("solution_recommender", agents["solution_recommender"])
+
+    # Single-call alternative for minor / small incidents
+    workflow.add_node("fused_responder", agents["fused_responder"])
+
+    # Same three agents, streaming into each other (prefix hand-off)
+    workflow.add_node("pipelined_responder", agents["pipelined_responder"])
 
     # Add compilation node (supervisor compiles final report)
     workflow.add_node("compile_report", supervisor_compile)
@@ -42,6 +69,8 @@ def build_incident_response_graph():
             "log_analyzer": "log_analyzer",
             "root_cause_investigator": "root_cause_investigator",
             "solution_recommender": "solution_recommender",
+            "fused_responder": "fused_responder",
+            "pipelined_responder": "pipelined_responder",
             "FINISH": "compile_report"
         }
     )
@@ -50,9 +79,11 @@ def build_incident_response_graph():
     workflow.add_edge("log_analyzer", "router")
     workflow.add_edge("root_cause_investigator", "router")
     workflow.add_edge("solution_recommender", "router")
+    workflow.add_edge("fused_responder", "router")
+    workflow.add_edge("pipelined_responder", "router")
 
     # Compile and end
     workflow.add_edge("compile_report", END)
 
     logger.info("✅ Graph built successfully")
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile(checkpointer=checkpointer)
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Incident Report - Rendering and progressive writing
+Sections are written to report_path as soon as each one finishes
+"""
+import threading
+from pathlib import Path
+from src.core import get_logger
+
+logger = get_logger("incident_report")
+
+SECTIONS = [
+    ("log_analysis", "SECTION 1: LOG ANALYSIS", "No analysis available"),
+    ("root_cause", "SECTION 2: ROOT CAUSE INVESTIGATION", "No root cause identified"),
+    ("solution", "SECTION 3: SOLUTION RECOMMENDATIONS", "No solution recommended"),
+]
+
+PENDING = "(in progress...)"
+
+# Pipelined stages finish on different threads
+_write_lock = threading.Lock()
+
+
+def render_incident_report(state, final: bool = True) -> str:
+    """Full report text; unfinished sections show a placeholder unless final."""
+    triage = state["triage"]
+    occurrence = f"Occurrence: {triage['first_timestamp']} → {triage['last_timestamp']}"
+    if state.get("cache_hit"):
+        occurrence += f" (recurring incident {state['fingerprint']}, cached analysis)"
+
+    steps = state.get("steps_completed", [])
+    if "fused_responder" in steps:
+        agents = "Fused Responder (single call)"
+    elif "pipelined_responder" in steps or state.get("execution_mode") == "pipelined":
+        agents = "Log Analyzer ⇢ Root Cause Investigator ⇢ Solution Recommender (pipelined)"
+    else:
+        agents = "Log Analyzer → Root Cause Investigator → Solution Recommender"
+
+    body = []
+    for key, title, missing in SECTIONS:
+        body.append(f"""{title}
+{'-'*70}
+{state.get(key) or (missing if final else PENDING)}
+
+{'='*70}
+""")
+
+    sections = "\n".join(body)
+
+    return f"""
+{'='*70}
+                    INCIDENT RESPONSE REPORT
+{'='*70}
+{occurrence}
+
+{sections}Report generated by Multi-Agent Incident Response System
+Agents: {agents}
+{'='*70}
+"""
+
+
+def write_progress(state, **sections):
+    """Re-write report_path with the sections finished so far (no-op without report_path)."""
+    report_path = state.get("report_path")
+    if not report_path:
+        return
+
+    write_report(report_path, render_incident_report({**state, **sections}, final=False))
+    logger.info(f"📝 Report updated: {', '.join(sections)}")
+
+
+def write_report(report_path, report: str):
+    """Atomically replace the report file (readers never see a half-written file)."""
+    path = Path(report_path)
+    with _write_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(report, encoding="utf-8")
+        tmp.replace(path)
@@ -8,9 +8,17 @@ class IncidentState(TypedDict):
 
     # Input
     log_content: str                      # Original error log
+    focused_log: str                      # Error windows extracted by router
+    metrics: Optional[str]                # Exact metrics table (None until computed)
+    incident_context: Dict                # Shared digest, metrics and findings (see context.py)
+    correlated: bool                      # log_content is a cross-log correlated timeline
 
     # Routing
     next_agent: str                       # Which agent to call next
+    triage: Dict                          # Deterministic pre-triage (clean | minor | incident)
+    execution_mode: str                   # fused (single call) | pipelined | full (three agents)
+    fingerprint: str                      # Incident fingerprint (result cache key)
+    cache_hit: bool                       # True when agent results came from the cache
 
     # Agent Results
     log_analysis: Optional[str]           # From Log Analyzer
@@ -19,6 +27,7 @@ class IncidentState(TypedDict):
 
     # Final Output
     incident_report: str                  # Compiled by Supervisor
+    report_path: str                      # Optional: report file, updated as sections finish
 
     # Metadata
     steps_completed: List[str]            # Track progress
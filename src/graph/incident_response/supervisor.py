@@ -1,17 +1,92 @@
 """
 Supervisor - Routes and coordinates agents
 """
-from src.core import get_logger
+import os
+from src.core import get_logger, triage_log, render_clean_report, extract_error_windows
+from src.core import incident_fingerprint, ResultCache, log_metrics_table, estimate_tokens
+from .context import build_incident_context
+from .report import render_incident_report, write_report
 
 logger = get_logger("supervisor")
 
+# auto      → fused single call for minor / small non-critical incidents, pipelined agents otherwise
+# fused     → always one call
+# pipelined → three agents streaming into each other
+# full      → three agents, strictly one after another
+INCIDENT_MODE = os.getenv("INCIDENT_MODE", "auto").lower()
+FUSED_MAX_TOKENS = int(os.getenv("FUSED_MAX_TOKENS", 2000))  # Evidence size limit for auto fused mode
+
+# Agent results of recurring incidents, keyed by fingerprint
+result_cache = ResultCache(namespace="incident_response")
+
 def supervisor_router(state):
-    """Router node - just passes state through for routing decision."""
-    return state
+    """Router node - triages the log once, then passes state through for routing."""
+    if state.get("incident_context") or state.get("cache_hit") or state.get("triage", {}).get("action") == "skip":
+        return {}
+
+    # Batch runs arrive with triage / windows / metrics already computed in the process pool
+    log_content = state["log_content"]
+    triage = state.get("triage") or triage_log(log_content)
+    logger.info(f"Triage: {triage['level'].upper()} → {triage['action']} ({triage['reason']})")
+
+    # Agents only see the regions around errors (a correlated timeline is already compact)
+    if state.get("correlated"):
+        focused_log = log_content
+    elif state.get("focused_log"):
+        focused_log = state["focused_log"]
+    else:
+        focused_log = extract_error_windows(log_content)
+        logger.info(f"Extracted error windows: {len(focused_log)}/{len(log_content)} chars")
+
+    updates = {"triage": triage, "focused_log": focused_log}
+    if triage["action"] == "skip":
+        return updates
+
+    # Recurring incident → reuse all three agent results
+    fingerprint = incident_fingerprint(log_content)["fingerprint"]
+    cached = result_cache.get(fingerprint)
+    updates.update({"fingerprint": fingerprint, "cache_hit": bool(cached)})
+
+    if cached:
+        logger.info(f"♻️ Recurring incident {fingerprint} - reusing agent results from {cached['created_at'][:19]}")
+        updates.update(cached["value"])
+    else:
+        # Digest, metrics and evidence are built once and shared by all agents
+        metrics = state["metrics"] if state.get("metrics") is not None else log_metrics_table(log_content)
+        context = build_incident_context(focused_log, metrics, log_content)
+        updates["incident_context"] = context
+        updates["execution_mode"] = choose_execution_mode(triage, context)
+        logger.info(f"Execution mode: {updates['execution_mode']}")
+
+    return updates
+
+def choose_execution_mode(triage, context):
+    """fused (one LLM call) or pipelined (three agents) based on severity and size."""
+    if INCIDENT_MODE in ("fused", "pipelined", "full"):
+        return INCIDENT_MODE
+
+    criticals = triage["level_counts"].get("CRITICAL", 0)
+    small = estimate_tokens(context["evidence"]) <= FUSED_MAX_TOKENS
+
+    if triage["level"] == "minor" or (not criticals and small):
+        return "fused"
+    return "pipelined"
 
 def route_next(state):
     """Decide which agent to call next (routing logic)."""
 
+    if state["triage"]["action"] == "skip":
+        logger.info("→ Clean log, no agents needed. Compiling report...")
+        return "FINISH"
+
+    if not state.get("log_analysis") and state.get("execution_mode") == "fused":
+        logger.info("→ Routing to: fused_responder")
+        return "fused_responder"
+
+    if not state.get("log_analysis") and state.get("execution_mode") == "pipelined":
+        logger.info("→ Routing to: pipelined_responder")
+        return "pipelined_responder"
+
     if not state.get("log_analysis"):
         logger.info("→ Routing to: log_analyzer")
         return "log_analyzer"
@@ -31,39 +106,56 @@ def supervisor_compile(state):
     """Supervisor compiles final incident report."""
     logger.info("📋 Supervisor compiling final report...")
 
+    if state["triage"]["action"] == "skip":
+        return _compile_clean_report(state)
+
     log_analysis = state.get("log_analysis", "No analysis available")
     root_cause = state.get("root_cause", "No root cause identified")
     solution = state.get("solution", "No solution recommended")
 
-    # Compile professional incident report
-    report = f"""
-{'='*70}
-                    INCIDENT RESPONSE REPORT
-{'='*70}
+    # Store fresh results for recurring incidents
+    if state.get("fingerprint") and not state.get("cache_hit") and not state.get("errors"):
+        result_cache.put(state["fingerprint"], {
+            "log_analysis": log_analysis,
+            "root_cause": root_cause,
+            "solution": solution
+        })
 
-SECTION 1: LOG ANALYSIS
-{'-'*70}
-{log_analysis}
+    report = render_incident_report(state)
+    if state.get("report_path"):
+        write_report(state["report_path"], report)
 
-{'='*70}
+    logger.info("✅ Final report compiled")
+
+    return {
+        "incident_report": report,
+        "steps_completed": state["steps_completed"] + ["supervisor"]
+    }
 
-SECTION 2: ROOT CAUSE INVESTIGATION
-{'-'*70}
-{root_cause}
 
+def _compile_clean_report(state):
+    """Templated report for clean logs (no LLM calls)."""
+    text_report, _, exec_summary = render_clean_report(state["triage"])
+
+    report = f"""
+{'='*70}
+                    INCIDENT RESPONSE REPORT
 {'='*70}
 
-SECTION 3: SOLUTION RECOMMENDATIONS
+STATUS: NO INCIDENT DETECTED
 {'-'*70}
-{solution}
+{exec_summary}
+
+{text_report}
 
 {'='*70}
-Report generated by Multi-Agent Incident Response System
-Agents: Log Analyzer → Root Cause Investigator → Solution Recommender
+Report generated by deterministic triage (no agents called)
 {'='*70}
 """
+    if state.get("report_path"):
+        write_report(state["report_path"], report)
 
-    logger.info("✅ Final report compiled")
+    logger.info("✅ Clean report compiled")
 
     return {
         "incident_report": report,
@@ -5,7 +5,17 @@ from typing import TypedDict, Dict, List
 
 class LogAnalyzerState(TypedDict):
     """State for log analysis pipeline."""
+    log_file: str                        # Optional: explicit log path (batch mode)
+    output_dir: str                      # Optional: where to save reports (batch mode)
+    since: str                           # Optional: time range start ("HH:MM" or full timestamp)
+    until: str                           # Optional: time range end
     log_content: str
+    triage: Dict                         # clean | minor | incident + action
+    focused_log: str                     # Error windows extracted from log_content
+    metrics: str                         # Pre-computed latency / error-rate table
+    log_digest: str                      # Pre-aggregated statistics (PROMPT_MODE=digest)
+    fingerprint: str                     # Incident fingerprint (result cache key)
+    cache_hit: bool                      # True when analysis came from the result cache
     analysis_text: str
     analysis_json: Dict
     executive_summary: str
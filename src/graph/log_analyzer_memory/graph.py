@@ -3,27 +3,56 @@ Log Analyzer - Graph Assembly
 """
 from langgraph.graph import StateGraph, END
 from .state import LogAnalyzerState
+from ..parallel import add_parallel_stage
 from .nodes import read_log, analyze_log, save_outputs, retrieve_context, load_memories
+from .nodes import triage_severity, route_after_triage, clean_report, extract_windows
+from .nodes import lookup_cache, route_after_cache, embed_log
 
-def build_graph():
+def build_graph(checkpointer=None):
     """Build and return compiled log analyzer with RAG + Memory."""
 
     workflow = StateGraph(LogAnalyzerState)
 
     # Add nodes
     workflow.add_node("read", read_log)
-    workflow.add_node("load_memory", load_memories)         # NEW
-    workflow.add_node("retrieve", retrieve_context)
+    workflow.add_node("triage", triage_severity)
+    workflow.add_node("clean_report", clean_report)
+    workflow.add_node("extract", extract_windows)
+    workflow.add_node("cache", lookup_cache)
+    workflow.add_node("embed", embed_log)
     workflow.add_node("analyze", analyze_log)
     workflow.add_node("save", save_outputs)
 
     # Connect nodes
     workflow.set_entry_point("read")
-    workflow.add_edge("read", "load_memory")               # NEW
-    workflow.add_edge("load_memory", "retrieve")           # NEW
-    workflow.add_edge("retrieve", "analyze")
+    workflow.add_edge("read", "triage")
+
+    # Clean logs skip the LLM, everything else continues
+    workflow.add_conditional_edges(
+        "triage",
+        route_after_triage,
+        {"clean_report": "clean_report", "analyze": "extract"}
+    )
+    workflow.add_edge("clean_report", "save")
+    workflow.add_edge("extract", "cache")
+
+    # Recurring incidents reuse the cached analysis
+    workflow.add_conditional_edges(
+        "cache",
+        route_after_cache,
+        {"save": "save", "analyze": "embed"}
+    )
+
+    workflow.add_edge("embed", "context")
+
+    # Memory and RAG lookups share the query vector and are independent: fan out, join before analyze
+    add_parallel_stage(
+        workflow, "context",
+        {"load_memory": load_memories, "retrieve": retrieve_context},
+        join="analyze"
+    )
     workflow.add_edge("analyze", "save")
     workflow.add_edge("save", END)
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
 
@@ -8,9 +8,17 @@ from langchain_core.output_parsers import StrOutputParser
 
 from .state import LogAnalyzerState
 from src.core import get_langchain_llm, pick_log_file, get_logger
-from src.prompts.log_analyzer_prompts import LOG_ANALYZER_SYSTEM_PROMPT
-from src.core import search_vector_store
+from src.core import triage_log, render_clean_report, SMALL_MODEL
+from src.core import CascadeStats, CASCADE_TIERS
+from src.core import log_analysis_chain, report_parsed
+from src.core import extract_error_windows, extract_anchor_query
+from src.core import incident_fingerprint, ResultCache, refresh_cached_analysis
+from src.core import read_log_range, log_metrics_table, log_digest, PROMPT_MODE
+from src.prompts.log_analyzer_prompts import LOG_ANALYZER_SYSTEM_PROMPT, LOG_ANALYZER_DIGEST_SYSTEM_PROMPT
+from src.prompts.log_analyzer_prompts import LOG_ANALYZER_STRUCTURED_SYSTEM_PROMPT, LOG_ANALYZER_STRUCTURED_DIGEST_SYSTEM_PROMPT
+from src.core import search_vector_store, embed_query
 from src.core import ConversationMemory, PersistentMemory
+from src.core import assemble_context, format_accounting
 
 # Initialize memory (shared across all nodes)
 conversation_memory = ConversationMemory(max_messages=20)
@@ -25,39 +33,101 @@ OUT_DIR = ROOT / "outputs" / "log_analyzer"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Build Langchain components
-llm = get_langchain_llm()
+# Model cascade (CASCADE_MODELS): tier 0 is the cheapest, unparseable reports escalate
+tier_llms = [get_langchain_llm(tier=tier) for tier in range(CASCADE_TIERS)]
+system_prompt = LOG_ANALYZER_DIGEST_SYSTEM_PROMPT if PROMPT_MODE == "digest" else LOG_ANALYZER_SYSTEM_PROMPT
 prompt_template = ChatPromptTemplate.from_messages([
-    ("system", LOG_ANALYZER_SYSTEM_PROMPT),
+    ("system", system_prompt),
     ("user", "Analyze this log:\\n\\n{log_content}")
 ])
 parser = StrOutputParser()
-chain = prompt_template | llm | parser
+
+# Native structured output (LogAnalysis schema) where the provider supports it, else the three-part text
+structured_prompt = (LOG_ANALYZER_STRUCTURED_DIGEST_SYSTEM_PROMPT if PROMPT_MODE == "digest"
+                     else LOG_ANALYZER_STRUCTURED_SYSTEM_PROMPT)
+structured_template = ChatPromptTemplate.from_messages([
+    ("system", structured_prompt),
+    ("user", "Analyze this log:\n\n{log_content}")
+])
+chains = [log_analysis_chain(structured_template, prompt_template, tier_llm, parser) for tier_llm in tier_llms]
+
+# Cheaper chain for logs triaged as "minor"
+small_llm = get_langchain_llm(SMALL_MODEL)
+small_chain = log_analysis_chain(structured_template, prompt_template, small_llm, parser)
+
+# Hit rate of each cascade tier
+cascade_stats = CascadeStats()
+PIPELINE = "log_analyzer_memory"
+
+# Analyses of recurring incidents, keyed by fingerprint
+result_cache = ResultCache(namespace="log_analyzer_memory")
 
 
 def read_log(state: LogAnalyzerState) -> LogAnalyzerState:
     """Read log file."""
-    log_file = pick_log_file(None, LOG_DIR)
-    log_content = log_file.read_text(encoding="utf-8")
+    if state.get("log_content"):
+        # Batch mode: already read (and parsed) in the process pool
+        logger.info(f"Using pre-parsed log: {Path(state['log_file']).name} ({len(state['log_content'])} chars)")
+        return {}
+
+    log_file = pick_log_file(state.get("log_file") or None, LOG_DIR)
+    # --since/--until seek straight to the range via the sparse index
+    log_content = read_log_range(log_file, state.get("since"), state.get("until"))
     logger.info(f"Read log file: {log_file.name} ({len(log_content)} chars)")
     return {"log_content": log_content}
 
+
+def triage_severity(state: LogAnalyzerState) -> LogAnalyzerState:
+    """Deterministic pre-triage: clean, minor or incident."""
+    triage = state.get("triage") or triage_log(state["log_content"])
+    logger.info(f"Triage: {triage['level'].upper()} → {triage['action']} ({triage['reason']})")
+    return {"triage": triage}
+
+
+def route_after_triage(state: LogAnalyzerState) -> str:
+    """Clean logs skip the LLM entirely."""
+    if state["triage"]["action"] == "skip":
+        logger.info("✅ Clean log - routing to templated report")
+        return "clean_report"
+    return "analyze"
+
+
+def clean_report(state: LogAnalyzerState) -> LogAnalyzerState:
+    """Templated report for clean logs (no LLM call)."""
+    text_report, json_report, exec_summary = render_clean_report(state["triage"])
+    return {
+        "analysis_text": text_report,
+        "analysis_json": json_report,
+        "executive_summary": exec_summary,
+        "errors": []
+    }
+
+def _query_text(focused_log: str) -> str:
+    """One query text (the error lines) for both the memory and the knowledge base search."""
+    return f"troubleshooting past incidents similar to: {extract_anchor_query(focused_log, max_chars=500)}"
+
+
+def embed_log(state: LogAnalyzerState) -> LogAnalyzerState:
+    """Embed the error lines once; the memory and KB searches reuse the vector."""
+    return {"query_embedding": embed_query(_query_text(state["focused_log"]))}
+
+
 def load_memories(state: LogAnalyzerState) -> LogAnalyzerState:
     """Load short-term and long-term memory."""
 
-    log_content = state["log_content"]
-    log_preview = log_content[:300]  # First 300 chars for search
-
     logger.info("Loading memories...")
 
     # Short-term: Get conversation history
     conversation_history = conversation_memory.get_history()
     logger.info(f"Loaded conversation history: {len(conversation_history)} messages")
 
-    # Long-term: Retrieve similar past incidents
-    past_incidents = persistent_memory.get_context(
-        query=f"past incidents similar to: {log_preview}",
-        top_k=2
+    # Long-term: Retrieve similar past incidents (scored, for the context budget)
+    past_matches = persistent_memory.get_context_items(
+        query=_query_text(state["focused_log"]),
+        top_k=2,
+        embedding=state.get("query_embedding") or None
     )
+    past_incidents = "\n---\n".join(match["text"] for match in past_matches)
 
     if past_incidents:
         logger.info("Retrieved past incident patterns from long-term memory")
@@ -66,28 +136,25 @@ def load_memories(state: LogAnalyzerState) -> LogAnalyzerState:
 
     return {
         "conversation_history": conversation_history,
-        "past_incidents": past_incidents
+        "past_incidents": past_incidents,
+        "past_matches": past_matches
     }
 
 
 def retrieve_context(state: LogAnalyzerState) -> LogAnalyzerState:
     """Retrieve relevant troubleshooting guides from knowledge base."""
 
-    log_content = state["log_content"]
-
-    # Extract key error patterns from log (first 500 chars)
-    log_preview = log_content[:500]
-
     logger.info("Retrieving relevant troubleshooting guides...")
 
-    # Search vector store
+    # Search with the error lines, not the startup noise at the top of the log
     results = search_vector_store(
-        query=f"troubleshooting guide for: {log_preview}",
-        top_k=3
+        query=_query_text(state["focused_log"]),
+        top_k=3,
+        embedding=state.get("query_embedding") or None
     )
 
     # Format context
-    context_parts = []
+    context_parts, retrieved_docs = [], []
     for i, (doc, score) in enumerate(results, 1):
         source = doc.metadata.get('source', 'Unknown').split('/')[-1]
         similarity = 1 - score
@@ -95,52 +162,108 @@ def retrieve_context(state: LogAnalyzerState) -> LogAnalyzerState:
         logger.info(f"Retrieved [{i}] {source} (similarity: {similarity:.2f})")
 
         context_parts.append(f"[Source: {source}]\\n{doc.page_content}\n")
+        retrieved_docs.append({"text": context_parts[-1], "score": similarity})
 
     retrieved_context = "\n---\n".join(context_parts)
 
     logger.info(f"Retrieved {len(results)} relevant troubleshooting guides")
 
-    return {"retrieved_context": retrieved_context}
+    return {"retrieved_context": retrieved_context, "retrieved_docs": retrieved_docs}
+
+
+def extract_windows(state: LogAnalyzerState) -> LogAnalyzerState:
+    """Keep only the regions around errors and pre-compute metrics / digest."""
+    if state.get("focused_log"):
+        return {}
+
+    log_content = state["log_content"]
+    focused_log = extract_error_windows(log_content)
+    logger.info(f"Extracted error windows: {len(focused_log)}/{len(log_content)} chars")
+
+    # Latency / duration / error-rate numbers are computed exactly over the full log
+    metrics = log_metrics_table(log_content)
+
+    # PROMPT_MODE=digest: the model gets pre-aggregated statistics instead of raw lines
+    digest = log_digest(log_content) if PROMPT_MODE == "digest" else ""
+    return {"focused_log": focused_log, "metrics": metrics, "log_digest": digest}
+
+
+def lookup_cache(state: LogAnalyzerState) -> LogAnalyzerState:
+    """Reuse the stored analysis when this incident fingerprint was seen before."""
+    fingerprint = incident_fingerprint(state["log_content"])["fingerprint"]
+    cached = result_cache.get(fingerprint)
+
+    if not cached:
+        return {"fingerprint": fingerprint, "cache_hit": False}
+
+    logger.info(f"♻️ Recurring incident {fingerprint} - skipping LLM analysis")
+    return {
+        **refresh_cached_analysis(cached, fingerprint, state["triage"]),
+        "fingerprint": fingerprint,
+        "cache_hit": True,
+        "errors": []
+    }
+
+
+def route_after_cache(state: LogAnalyzerState) -> str:
+    """Cache hits go straight to save."""
+    return "save" if state.get("cache_hit") else "analyze"
 
 
 def analyze_log(state: LogAnalyzerState) -> LogAnalyzerState:
     """Analyze log with RAG + both memories."""
     logger.info("Analyzing log with RAG and memory context...")
 
-    log_content = state["log_content"]
-    rag_context = state.get("retrieved_context", "")
-    past_incidents = state.get("past_incidents", "")
-    conv_history = state.get("conversation_history", [])
-
-    # Build conversation context
-    conv_context = ""
-    if conv_history:
-        recent = conv_history[-3:]  # Last 3 messages
-        conv_lines = [f"{msg['role']}: {msg['content'][:100]}..." for msg in recent]
-        conv_context = "\n".join(conv_lines)
+    log_content = state.get("log_digest") or state["focused_log"]
+
+    # Bounded prompt: the log and metrics first, then guides / incidents by similarity, recent messages last
+    context = assemble_context([
+        {"name": "log", "items": [log_content], "priority": 5},
+        {"name": "metrics", "items": [state.get("metrics", "")], "priority": 4},
+        {"name": "guides", "items": state.get("retrieved_docs") or [state.get("retrieved_context", "")],
+         "priority": 3, "min_tokens": 400, "separator": "\n---\n"},
+        {"name": "past_incidents", "items": state.get("past_matches") or [state.get("past_incidents", "")],
+         "priority": 2, "min_tokens": 200, "separator": "\n---\n"},
+        {"name": "conversation", "items": _recent_messages(state.get("conversation_history", [])),
+         "priority": 1, "separator": "\n"},
+    ])
+    logger.info(f"Context: {format_accounting(context)}")
+    texts = context["texts"]
 
     # Build enhanced prompt with all context
     user_message = f"""Context from our conversation:
-{conv_context if conv_context else "First analysis"}
+{texts["conversation"] or "First analysis"}
 
 ---
 
 Troubleshooting guides:
-{rag_context}
+{texts["guides"]}
 
 ---
 
 Past similar incidents:
-{past_incidents if past_incidents else "No past incidents yet"}
+{texts["past_incidents"] or "No past incidents yet"}
+
+---
+
+{texts["metrics"] or "No numeric metrics for this log"}
 
 ---
 
 Now analyze this log:
-{log_content}"""
+{texts["log"]}"""
 
     try:
-        response = chain.invoke({"log_content": user_message})
-        text_report, json_report, exec_summary = _split_response(response)
+        # Minor logs go to the small model, the rest climb the cascade until the report parses
+        minor = state["triage"]["action"] == "small"
+        for tier, active_chain in enumerate([small_chain] if minor else chains):
+            # Structured object or parsed 3-part response
+            text_report, json_report, exec_summary = active_chain.invoke({"log_content": user_message})
+            parsed = report_parsed(json_report)
+            if not minor:
+                cascade_stats.record(PIPELINE, tier, parsed)
+            if parsed:
+                break
 
         logger.info("Analysis complete with RAG + memory")
 
@@ -164,6 +287,15 @@ Now analyze this log:
             "errors": [f"LLM error: {e}"]
         }
 
+
+def _recent_messages(conv_history: list) -> list:
+    """Conversation messages scored by recency (the newest is most relevant)."""
+    return [
+        {"text": f"{msg['role']}: {msg['content']}", "score": (i + 1) / len(conv_history)}
+        for i, msg in enumerate(conv_history)
+    ]
+
+
 def save_outputs(state: LogAnalyzerState) -> LogAnalyzerState:
     """Save analysis to files and long-term memory."""
 
@@ -171,22 +303,33 @@ def save_outputs(state: LogAnalyzerState) -> LogAnalyzerState:
         logger.warning("Skipping save due to errors")
         return {}
 
+    out_dir = Path(state.get("output_dir") or OUT_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
     # Save to files (existing code)
-    text_file = OUT_DIR / "analysis_report.txt"
+    text_file = out_dir / "analysis_report.txt"
     text_file.write_text(state["analysis_text"], encoding="utf-8")
     logger.info(f"Saved text analysis: {text_file.relative_to(ROOT)}")
 
-    json_file = OUT_DIR / "analysis_report.json"
+    json_file = out_dir / "analysis_report.json"
     json_file.write_text(
         json.dumps(state["analysis_json"], indent=2),
         encoding="utf-8"
     )
     logger.info(f"Saved JSON report: {json_file.relative_to(ROOT)}")
 
-    exec_file = OUT_DIR / "executive_summary.txt"
+    exec_file = out_dir / "executive_summary.txt"
     exec_file.write_text(state["executive_summary"], encoding="utf-8")
     logger.info(f"Saved executive summary: {exec_file.relative_to(ROOT)}")
 
+    # Store fresh analyses for recurring incidents
+    if state.get("fingerprint") and not state.get("cache_hit") and "error" not in state["analysis_json"]:
+        result_cache.put(state["fingerprint"], {
+            "analysis_text": state["analysis_text"],
+            "analysis_json": state["analysis_json"],
+            "executive_summary": state["executive_summary"]
+        })
+
     # NEW: Store in long-term memory
     log_preview = state.get("log_content", "")[:200]
     json_summary = state.get("analysis_json", {})
@@ -212,33 +355,3 @@ Recommendations: {', '.join(json_summary.get('recommendations', [])[:2])}"""
     logger.info("Stored analysis in long-term memory")
 
     return {}
-
-
-
-def _split_response(response: str) -> tuple:
-    """Split LLM response into 3 parts."""
-    text_report = response
-    json_report = {}
-    exec_summary = "Executive summary not generated."
-
-    # Split by ```json markdown fence
-    if "```json" in response:
-        parts = response.split("```json")
-        text_report = parts[0].strip()
-        remainder = parts[1]
-
-        # Extract JSON
-        if "```" in remainder:
-            json_block = remainder.split("```")[0].strip()
-            try:
-                json_report = json.loads(json_block)
-            except json.JSONDecodeError:
-                json_report = {"error": "Failed to parse JSON"}
-
-            # Extract executive summary
-            after_json = remainder.split("```", 1)[1]
-            if "---EXECUTIVE---" in after_json:
-                exec_parts = after_json.split("---EXECUTIVE---")
-                exec_summary = exec_parts[1].strip()
-
-    return text_report, json_report, exec_summary
@@ -1,14 +1,29 @@
 """
 Log Analyzer - State Definition
 """
-from typing import TypedDict, Dict, List
+from typing import TypedDict, Dict, List, Annotated
+from ..parallel import merge_dicts
 
 class LogAnalyzerState(TypedDict):
     """State for log analysis pipeline."""
+    log_file: str                        # Optional: explicit log path (batch mode)
+    output_dir: str                      # Optional: where to save reports (batch mode)
+    since: str                           # Optional: time range start ("HH:MM" or full timestamp)
+    until: str                           # Optional: time range end
     log_content: str
+    triage: Dict                         # clean | minor | incident + action
+    focused_log: str                     # Error windows extracted from log_content
+    metrics: str                         # Pre-computed latency / error-rate table
+    log_digest: str                      # Pre-aggregated statistics (PROMPT_MODE=digest)
+    fingerprint: str                     # Incident fingerprint (result cache key)
+    cache_hit: bool                      # True when analysis came from the result cache
+    query_embedding: List[float]         # Query vector shared by the memory and KB searches
     retrieved_context: str
+    retrieved_docs: List[Dict]           # KB chunks with similarity (context budget)
     conversation_history: List[Dict]     # NEW: Short-term memory
     past_incidents: str                  # NEW: Long-term memory
+    past_matches: List[Dict]             # Past incidents with similarity (context budget)
+    stage_timings: Annotated[Dict[str, float], merge_dicts]  # Parallel branch durations (seconds)
     analysis_text: str
     analysis_json: Dict
     executive_summary: str
@@ -8,7 +8,14 @@ from langchain_core.output_parsers import StrOutputParser
 
 from .state import LogAnalyzerState
 from src.core import get_langchain_llm, pick_log_file, get_logger
-from src.prompts.log_analyzer_prompts import LOG_ANALYZER_SYSTEM_PROMPT
+from src.core import triage_log, render_clean_report, SMALL_MODEL
+from src.core import CascadeStats, CASCADE_TIERS
+from src.core import log_analysis_chain, report_parsed
+from src.core import extract_error_windows, extract_anchor_query
+from src.core import incident_fingerprint, ResultCache, refresh_cached_analysis
+from src.core import read_log_range, log_metrics_table, log_digest, PROMPT_MODE
+from src.prompts.log_analyzer_prompts import LOG_ANALYZER_SYSTEM_PROMPT, LOG_ANALYZER_DIGEST_SYSTEM_PROMPT
+from src.prompts.log_analyzer_prompts import LOG_ANALYZER_STRUCTURED_SYSTEM_PROMPT, LOG_ANALYZER_STRUCTURED_DIGEST_SYSTEM_PROMPT
 from src.core import search_vector_store
 
 
@@ -20,29 +27,80 @@ OUT_DIR = ROOT / "outputs" / "log_analyzer"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Build Langchain components
-llm = get_langchain_llm()
+# Model cascade (CASCADE_MODELS): tier 0 is the cheapest, unparseable reports escalate
+tier_llms = [get_langchain_llm(tier=tier) for tier in range(CASCADE_TIERS)]
+system_prompt = LOG_ANALYZER_DIGEST_SYSTEM_PROMPT if PROMPT_MODE == "digest" else LOG_ANALYZER_SYSTEM_PROMPT
 prompt_template = ChatPromptTemplate.from_messages([
-    ("system", LOG_ANALYZER_SYSTEM_PROMPT),
+    ("system", system_prompt),
     ("user", "Analyze this log:\\n\\n{log_content}")
 ])
 parser = StrOutputParser()
-chain = prompt_template | llm | parser
+
+# Native structured output (LogAnalysis schema) where the provider supports it, else the three-part text
+structured_prompt = (LOG_ANALYZER_STRUCTURED_DIGEST_SYSTEM_PROMPT if PROMPT_MODE == "digest"
+                     else LOG_ANALYZER_STRUCTURED_SYSTEM_PROMPT)
+structured_template = ChatPromptTemplate.from_messages([
+    ("system", structured_prompt),
+    ("user", "Analyze this log:\n\n{log_content}")
+])
+chains = [log_analysis_chain(structured_template, prompt_template, tier_llm, parser) for tier_llm in tier_llms]
+
+# Cheaper chain for logs triaged as "minor"
+small_llm = get_langchain_llm(SMALL_MODEL)
+small_chain = log_analysis_chain(structured_template, prompt_template, small_llm, parser)
+
+# Hit rate of each cascade tier
+cascade_stats = CascadeStats()
+PIPELINE = "log_analyzer_rag"
+
+# Analyses of recurring incidents, keyed by fingerprint
+result_cache = ResultCache(namespace="log_analyzer_rag")
 
 
 def read_log(state: LogAnalyzerState) -> LogAnalyzerState:
     """Read log file."""
-    log_file = pick_log_file(None, LOG_DIR)
-    log_content = log_file.read_text(encoding="utf-8")
+    if state.get("log_content"):
+        # Batch mode: already read (and parsed) in the process pool
+        logger.info(f"Using pre-parsed log: {Path(state['log_file']).name} ({len(state['log_content'])} chars)")
+        return {}
+
+    log_file = pick_log_file(state.get("log_file") or None, LOG_DIR)
+    # --since/--until seek straight to the range via the sparse index
+    log_content = read_log_range(log_file, state.get("since"), state.get("until"))
     logger.info(f"Read log file: {log_file.name} ({len(log_content)} chars)")
     return {"log_content": log_content}
 
+
+def triage_severity(state: LogAnalyzerState) -> LogAnalyzerState:
+    """Deterministic pre-triage: clean, minor or incident."""
+    triage = state.get("triage") or triage_log(state["log_content"])
+    logger.info(f"Triage: {triage['level'].upper()} → {triage['action']} ({triage['reason']})")
+    return {"triage": triage}
+
+
+def route_after_triage(state: LogAnalyzerState) -> str:
+    """Clean logs skip the LLM entirely."""
+    if state["triage"]["action"] == "skip":
+        logger.info("✅ Clean log - routing to templated report")
+        return "clean_report"
+    return "analyze"
+
+
+def clean_report(state: LogAnalyzerState) -> LogAnalyzerState:
+    """Templated report for clean logs (no LLM call)."""
+    text_report, json_report, exec_summary = render_clean_report(state["triage"])
+    return {
+        "analysis_text": text_report,
+        "analysis_json": json_report,
+        "executive_summary": exec_summary,
+        "errors": []
+    }
+
 def retrieve_context(state: LogAnalyzerState) -> LogAnalyzerState:
     """Retrieve relevant troubleshooting guides from knowledge base."""
 
-    log_content = state["log_content"]
-
-    # Extract key error patterns from log (first 500 chars)
-    log_preview = log_content[:500]
+    # Search with the error lines, not the startup noise at the top of the log
+    log_preview = extract_anchor_query(state["focused_log"], max_chars=500)
 
     logger.info("Retrieving relevant troubleshooting guides...")
 
@@ -69,11 +127,50 @@ def retrieve_context(state: LogAnalyzerState) -> LogAnalyzerState:
     return {"retrieved_context": retrieved_context}
 
 
+def extract_windows(state: LogAnalyzerState) -> LogAnalyzerState:
+    """Keep only the regions around errors and pre-compute metrics / digest."""
+    if state.get("focused_log"):
+        return {}
+
+    log_content = state["log_content"]
+    focused_log = extract_error_windows(log_content)
+    logger.info(f"Extracted error windows: {len(focused_log)}/{len(log_content)} chars")
+
+    # Latency / duration / error-rate numbers are computed exactly over the full log
+    metrics = log_metrics_table(log_content)
+
+    # PROMPT_MODE=digest: the model gets pre-aggregated statistics instead of raw lines
+    digest = log_digest(log_content) if PROMPT_MODE == "digest" else ""
+    return {"focused_log": focused_log, "metrics": metrics, "log_digest": digest}
+
+
+def lookup_cache(state: LogAnalyzerState) -> LogAnalyzerState:
+    """Reuse the stored analysis when this incident fingerprint was seen before."""
+    fingerprint = incident_fingerprint(state["log_content"])["fingerprint"]
+    cached = result_cache.get(fingerprint)
+
+    if not cached:
+        return {"fingerprint": fingerprint, "cache_hit": False}
+
+    logger.info(f"♻️ Recurring incident {fingerprint} - skipping LLM analysis")
+    return {
+        **refresh_cached_analysis(cached, fingerprint, state["triage"]),
+        "fingerprint": fingerprint,
+        "cache_hit": True,
+        "errors": []
+    }
+
+
+def route_after_cache(state: LogAnalyzerState) -> str:
+    """Cache hits go straight to save."""
+    return "save" if state.get("cache_hit") else "analyze"
+
+
 def analyze_log(state: LogAnalyzerState) -> LogAnalyzerState:
     """Analyze log with RAG context (troubleshooting guides)."""
     logger.info("Analyzing log with troubleshooting guides...")
 
-    log_content = state["log_content"]
+    log_content = state.get("log_digest") or state["focused_log"]
     context = state.get("retrieved_context", "")
 
     # Build enhanced prompt with context
@@ -83,13 +180,25 @@ def analyze_log(state: LogAnalyzerState) -> LogAnalyzerState:
 
 ---
 
+{state.get("metrics") or "No numeric metrics for this log"}
+
+---
+
 Now analyze this log:
 
 {log_content}"""
 
     try:
-        response = chain.invoke({"log_content": user_message})
-        text_report, json_report, exec_summary = _split_response(response)
+        # Minor logs go to the small model, the rest climb the cascade until the report parses
+        minor = state["triage"]["action"] == "small"
+        for tier, active_chain in enumerate([small_chain] if minor else chains):
+            # Structured object or parsed 3-part response
+            text_report, json_report, exec_summary = active_chain.invoke({"log_content": user_message})
+            parsed = report_parsed(json_report)
+            if not minor:
+                cascade_stats.record(PIPELINE, tier, parsed)
+            if parsed:
+                break
 
         logger.info("Analysis complete with RAG context")
         return {
@@ -115,13 +224,16 @@ def save_outputs(state: LogAnalyzerState) -> LogAnalyzerState:
         logger.warning("Skipping save due to errors")
         return {}
 
+    out_dir = Path(state.get("output_dir") or OUT_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
     # Save text analysis
-    text_file = OUT_DIR / "analysis_report.txt"
+    text_file = out_dir / "analysis_report.txt"
     text_file.write_text(state["analysis_text"], encoding="utf-8")
     logger.info(f"Saved text analysis: {text_file.relative_to(ROOT)}")
 
     # Save JSON report
-    json_file = OUT_DIR / "analysis_report.json"
+    json_file = out_dir / "analysis_report.json"
     json_file.write_text(
         json.dumps(state["analysis_json"], indent=2),
         encoding="utf-8"
@@ -129,37 +241,16 @@ def save_outputs(state: LogAnalyzerState) -> LogAnalyzerState:
     logger.info(f"Saved JSON report: {json_file.relative_to(ROOT)}")
 
     # Save executive summary
-    exec_file = OUT_DIR / "executive_summary.txt"
+    exec_file = out_dir / "executive_summary.txt"
     exec_file.write_text(state["executive_summary"], encoding="utf-8")
     logger.info(f"Saved executive summary: {exec_file.relative_to(ROOT)}")
 
-    return {}
-
+    # Store fresh analyses for recurring incidents
+    if state.get("fingerprint") and not state.get("cache_hit") and "error" not in state["analysis_json"]:
+        result_cache.put(state["fingerprint"], {
+            "analysis_text": state["analysis_text"],
+            "analysis_json": state["analysis_json"],
+            "executive_summary": state["executive_summary"]
+        })
 
-def _split_response(response: str) -> tuple:
-    """Split LLM response into 3 parts."""
-    text_report = response
-    json_report = {}
-    exec_summary = "Executive summary not generated."
-
-    # Split by ```json markdown fence
-    if "```json" in response:
-        parts = response.split("```json")
-        text_report = parts[0].strip()
-        remainder = parts[1]
-
-        # Extract JSON
-        if "```" in remainder:
-            json_block = remainder.split("```")[0].strip()
-            try:
-                json_report = json.loads(json_block)
-            except json.JSONDecodeError:
-                json_report = {"error": "Failed to parse JSON"}
-
-            # Extract executive summary
-            after_json = remainder.split("```", 1)[1]
-            if "---EXECUTIVE---" in after_json:
-                exec_parts = after_json.split("---EXECUTIVE---")
-                exec_summary = exec_parts[1].strip()
-
-    return text_report, json_report, exec_summary
+    return {}
@@ -0,0 +1,63 @@
+"""
+Parallel Stages - Fan-out / join helper for LangGraph pipelines
+Independent retrieval nodes (memory, RAG, ...) run in the same superstep
+instead of one after the other; the join node waits for all of them.
+"""
+import inspect
+import time
+from functools import wraps
+from typing import Callable, Dict
+from src.core import get_logger
+
+logger = get_logger("parallel_stage")
+
+
+def merge_dicts(left: Dict, right: Dict) -> Dict:
+    """State reducer: branches finishing in the same superstep each add their own keys."""
+    return {**(left or {}), **(right or {})}
+
+
+def add_parallel_stage(workflow, name: str, branches: Dict[str, Callable], join: str):
+    """
+    Add `name` as an entry node that fans out to every branch, and join them into `join`.
+
+    Route into the stage by pointing an edge (or conditional edge) at `name`.
+    Branches must write disjoint state keys; their durations are recorded in
+    `stage_timings` (declare it as Annotated[Dict[str, float], merge_dicts]).
+    """
+    workflow.add_node(name, _enter_stage(name, list(branches)))
+
+    for branch, node in branches.items():
+        workflow.add_node(branch, _timed(branch, node))
+        workflow.add_edge(name, branch)
+
+    # A list of sources waits for every branch before running the join node
+    workflow.add_edge(list(branches), join)
+
+
+def _enter_stage(name: str, branches: list):
+    def enter(state):
+        logger.info(f"⇉ {name}: running {', '.join(branches)} in parallel")
+        return {}
+    return enter
+
+
+def _timed(branch: str, node: Callable):
+    """Wrap a branch node so its duration lands in stage_timings."""
+    def record(result: Dict, start: float) -> Dict:
+        elapsed = round(time.perf_counter() - start, 3)
+        logger.info(f"⏱️ {branch} finished in {elapsed:.2f}s")
+        return {**(result or {}), "stage_timings": {branch: elapsed}}
+
+    if inspect.iscoroutinefunction(node):
+        @wraps(node)
+        async def arun(state):
+            start = time.perf_counter()
+            return record(await node(state), start)
+        return arun
+
+    @wraps(node)
+    def run(state):
+        start = time.perf_counter()
+        return record(node(state), start)
+    return run
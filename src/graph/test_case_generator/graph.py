@@ -15,7 +15,7 @@ from .nodes import (
     route_after_human_approval
 )
 
-def build_graph():
+def build_graph(checkpointer=None):
     """Build and return compiled testcase generator graph."""
 
     # Create graph
@@ -65,4 +65,4 @@ def build_graph():
     workflow.add_edge("save", END)
 
     # Compile
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
@@ -5,10 +5,15 @@ from typing import TypedDict, List, Dict
 
 class TestCaseState(TypedDict):
     """State for test case generation pipeline."""
+    requirement_file: str                # Optional: explicit requirement path (batch mode)
+    output_dir: str                      # Optional: where to save test cases (batch mode)
     requirement: str
     test_cases: List[Dict]
+    sections: List[Dict]                 # Section title / key → test IDs (for the manifest)
     errors: List[str]
+    invalid_cases: List[Dict]            # Failed items: {index, test_case, errors} (targeted repair)
     validation_status: str  # "pass" | "fail" | "pending"
+    model_tier: int                      # Cascade tier (CASCADE_MODELS index) of the current attempt
     retry_count: int  # Track retry attempts
     human_approval: str  # "pending" | "approved" | "rejected"
     human_feedback: str  #  Optional feedback from human
@@ -3,8 +3,10 @@ TestCase Generator - Graph Assembly
 """
 from langgraph.graph import StateGraph, END
 from .state import TestCaseState
+from ..parallel import add_parallel_stage
 from .nodes import (
     read_requirement,
+    embed_requirement,
     load_memories,
     retrieve_context,
     generate_tests,
@@ -17,15 +19,14 @@ from .nodes import (
     route_after_human_approval
 )
 
-def build_graph():
+def build_graph(checkpointer=None):
     """Build and return compiled testcase generator with RAG + Memory."""
 
     workflow = StateGraph(TestCaseState)
 
     # Add nodes
     workflow.add_node("read", read_requirement)
-    workflow.add_node("load_memory", load_memories)         # NEW
-    workflow.add_node("retrieve", retrieve_context)
+    workflow.add_node("embed", embed_requirement)
     workflow.add_node("generate", generate_tests)
     workflow.add_node("validate", validate_tests)
     workflow.add_node("retry", retry_generate)
@@ -35,9 +36,15 @@ def build_graph():
 
     # Linear edges
     workflow.set_entry_point("read")
-    workflow.add_edge("read", "load_memory")               # NEW
-    workflow.add_edge("load_memory", "retrieve")           # NEW
-    workflow.add_edge("retrieve", "generate")
+    workflow.add_edge("read", "embed")
+    workflow.add_edge("embed", "context")
+
+    # Memory and RAG lookups share the query vector and are independent: fan out, join before generate
+    add_parallel_stage(
+        workflow, "context",
+        {"load_memory": load_memories, "retrieve": retrieve_context},
+        join="generate"
+    )
     workflow.add_edge("generate", "validate")
 
     # Conditional edges (unchanged)
@@ -58,4 +65,4 @@ def build_graph():
     workflow.add_edge("retry", "validate")
     workflow.add_edge("save", END)
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
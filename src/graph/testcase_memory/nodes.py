@@ -6,12 +6,20 @@ from pathlib import Path
 import pandas as pd
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from langgraph.types import interrupt
 
 from .state import TestCaseState
 from src.core import get_langchain_llm, pick_requirement, get_logger
-from src.prompts.testcase_prompts import TESTCASE_SYSTEM_PROMPT
-from src.core import search_vector_store
+from src.prompts.testcase_prompts import TESTCASE_SECTION_SYSTEM_PROMPT, TESTCASE_REPAIR_PROMPT
+from src.core import generate_by_section, ResultCache, TestCaseManifest
+from src.core import validate_test_cases, retry_generation
+from src.core import tier_candidates, SPECULATIVE_MODE
+from src.core import CascadeStats, CASCADE_TIERS
+from src.core import testcase_chain
+from src.core import auto_approval, APPROVAL_MODE
+from src.core import search_vector_store, embed_query
 from src.core import ConversationMemory, PersistentMemory
+from src.core import assemble_context, format_accounting
 
 
 # Initialize memory (shared across all nodes)
@@ -27,21 +35,50 @@ OUT_DIR = ROOT / "outputs" / "testcase_generated"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Build Langchain components
-llm = get_langchain_llm()
+# Model cascade (CASCADE_MODELS): tier 0 is the cheapest, failed validations escalate
+tier_llms = [get_langchain_llm(tier=tier) for tier in range(CASCADE_TIERS)]
 prompt_template = ChatPromptTemplate.from_messages([
-    ("system", TESTCASE_SYSTEM_PROMPT),
+    ("system", TESTCASE_SECTION_SYSTEM_PROMPT),
     ("user", "Requirements:\\n\\n{requirement}")
 ])
 parser = StrOutputParser()
-chain = prompt_template | llm | parser
+# Native structured output (TestCaseList schema) where the provider supports it
+chains = [testcase_chain(prompt_template, tier_llm, parser) for tier_llm in tier_llms]
+
+# Fixes only the test cases that failed validation
+repair_template = ChatPromptTemplate.from_messages([
+    ("system", TESTCASE_REPAIR_PROMPT),
+    ("user", "Requirement:\n\n{requirement}\n\nTest cases to fix:\n\n{items}")
+])
+repair_chains = [testcase_chain(repair_template, tier_llm, parser) for tier_llm in tier_llms]
+
+# SPECULATIVE_MODE=on: race K generations per section, first valid one wins (candidates per cascade tier)
+speculative = tier_candidates(prompt_template, parser) if SPECULATIVE_MODE else None
+
+# Hit rate of each cascade tier
+cascade_stats = CascadeStats()
+
+# Manifest namespace (matches the approval queue pipeline names)
+PIPELINE = "testcase_memory"
+
+# Test cases per requirement section (editing one section regenerates only that one)
+section_cache = ResultCache(namespace="testcase_memory_sections")
 
 
 def read_requirement(state: TestCaseState) -> TestCaseState:
     """Read requirement file."""
-    req_file = pick_requirement(None, REQ_DIR)
+    req_file = pick_requirement(state.get("requirement_file") or None, REQ_DIR)
     requirement = req_file.read_text(encoding="utf-8")
     logger.info(f"Read requirement: {req_file.name}")
-    return {"requirement": requirement}
+    return {"requirement": requirement, "requirement_file": str(req_file)}
+
+def _query_text(requirement: str) -> str:
+    """One query text for both the memory and the knowledge base search."""
+    return f"test case patterns and guidelines for: {requirement[:200]}"
+
+def embed_requirement(state: TestCaseState) -> TestCaseState:
+    """Embed the requirement once; the memory and KB searches reuse the vector."""
+    return {"query_embedding": embed_query(_query_text(state["requirement"]))}
 
 def load_memories(state: TestCaseState) -> TestCaseState:
     """Load short-term and long-term memory."""
@@ -54,11 +91,13 @@ def load_memories(state: TestCaseState) -> TestCaseState:
     conversation_history = conversation_memory.get_history()
     logger.info(f"Loaded conversation history: {len(conversation_history)} messages")
 
-    # Long-term: Retrieve similar past patterns
-    past_patterns = persistent_memory.get_context(
-        query=f"test case patterns for: {requirement[:200]}",
-        top_k=2
+    # Long-term: Retrieve similar past patterns (scored, for the context budget)
+    past_matches = persistent_memory.get_context_items(
+        query=_query_text(requirement),
+        top_k=2,
+        embedding=state.get("query_embedding") or None
     )
+    past_patterns = "\n---\n".join(match["text"] for match in past_matches)
 
     if past_patterns:
         logger.info("Retrieved past test case patterns from long-term memory")
@@ -67,7 +106,8 @@ def load_memories(state: TestCaseState) -> TestCaseState:
 
     return {
         "conversation_history": conversation_history,
-        "past_patterns": past_patterns
+        "past_patterns": past_patterns,
+        "past_matches": past_matches
     }
 
 
@@ -79,12 +119,13 @@ def retrieve_context(state: TestCaseState) -> TestCaseState:
 
     # Search vector store
     results = search_vector_store(
-        query=f"test case guidelines for: {requirement[:200]}",
-        top_k=3
+        query=_query_text(requirement),
+        top_k=3,
+        embedding=state.get("query_embedding") or None
     )
 
     # Format context
-    context_parts = []
+    context_parts, retrieved_docs = [], []
     for i, (doc, score) in enumerate(results, 1):
         source = doc.metadata.get('source', 'Unknown').split('/')[-1]
         similarity = 1 - score
@@ -92,74 +133,101 @@ def retrieve_context(state: TestCaseState) -> TestCaseState:
         logger.info(f"Retrieved [{i}] {source} (similarity: {similarity:.2f})")
 
         context_parts.append(f"[Source: {source}]\\n{doc.page_content}\n")
+        retrieved_docs.append({"text": context_parts[-1], "score": similarity})
 
     retrieved_context = "\n---\n".join(context_parts)
 
     logger.info(f"Retrieved {len(results)} relevant documents")
 
-    return {"retrieved_context": retrieved_context}
+    return {"retrieved_context": retrieved_context, "retrieved_docs": retrieved_docs}
 
 
 
-def generate_tests(state: TestCaseState) -> TestCaseState:
-    """Generate test cases with RAG + both memories."""
-    logger.info("Generating test cases with RAG and memory context...")
-
-    requirement = state["requirement"]
-    rag_context = state.get("retrieved_context", "")
-    past_patterns = state.get("past_patterns", "")
-    conv_history = state.get("conversation_history", [])
+def _user_message(state: TestCaseState, requirement: str) -> str:
+    """Enhanced prompt: conversation + guidelines + past patterns + (a section of) the requirement."""
+    # Bounded prompt: the requirement first, then guidelines / patterns by similarity, recent messages last
+    context = assemble_context([
+        {"name": "requirement", "items": [requirement], "priority": 4},
+        {"name": "guidelines", "items": state.get("retrieved_docs") or [state.get("retrieved_context", "")],
+         "priority": 3, "min_tokens": 400, "separator": "\n---\n"},
+        {"name": "past_patterns", "items": state.get("past_matches") or [state.get("past_patterns", "")],
+         "priority": 2, "min_tokens": 200, "separator": "\n---\n"},
+        {"name": "conversation", "items": _recent_messages(state.get("conversation_history", [])),
+         "priority": 1, "separator": "\n"},
+    ])
+    logger.info(f"Context: {format_accounting(context)}")
+    texts = context["texts"]
 
-    # Build conversation context
-    conv_context = ""
-    if conv_history:
-        recent = conv_history[-3:]  # Last 3 messages
-        conv_lines = [f"{msg['role']}: {msg['content'][:100]}..." for msg in recent]
-        conv_context = "\n".join(conv_lines)
-
-    # Build enhanced prompt with all context
-    user_message = f"""Context from our conversation:
-{conv_context if conv_context else "First interaction"}
+    return f"""Context from our conversation:
+{texts["conversation"] or "First interaction"}
 
 ---
 
 Company testing guidelines:
-{rag_context}
+{texts["guidelines"]}
 
 ---
 
 Past test case patterns you've used:
-{past_patterns if past_patterns else "No past patterns yet"}
+{texts["past_patterns"] or "No past patterns yet"}
 
 ---
 
 Now generate test cases for this requirement:
-{requirement}"""
+{texts["requirement"]}"""
+
+
+def _recent_messages(conv_history: list) -> list:
+    """Conversation messages scored by recency (the newest is most relevant)."""
+    return [
+        {"text": f"{msg['role']}: {msg['content']}", "score": (i + 1) / len(conv_history)}
+        for i, msg in enumerate(conv_history)
+    ]
+
+
+def _generate_sections(state: TestCaseState, use_cache: bool = True, tier: int = 0, feedback: str = "") -> dict:
+    """Per-section generation (parallel, cached per section) for the whole requirement."""
+    return generate_by_section(
+        chains[tier], state["requirement"],
+        build_input=lambda text, num_cases: {"requirement": _user_message(state, text), "num_cases": num_cases},
+        cache=section_cache, use_cache=use_cache,
+        manifest=TestCaseManifest(state.get("requirement_file", ""), PIPELINE),
+        candidates=speculative[tier] if speculative else None,
+        feedback=feedback
+    )
+
+
+def generate_tests(state: TestCaseState) -> TestCaseState:
+    """Generate test cases with RAG + both memories."""
+    logger.info("Generating test cases with RAG and memory context...")
 
     try:
-        response = chain.invoke({"requirement": user_message})
-        testcases = json.loads(response)
-        logger.info(f"Generated {len(testcases)} test cases using RAG + memory")
+        result = _generate_sections(state)
+        if result["errors"]:
+            # Valid sections are cached: the retry only regenerates the failed ones
+            return {
+                "test_cases": [],
+                "errors": result["errors"],
+                "retry_count": state.get("retry_count", 0),
+                "validation_status": "fail"
+            }
+
+        testcases = result["test_cases"]
+        logger.info(f"Generated {len(testcases)} test cases using RAG + memory "
+                    f"({len(result['sections'])} sections, {result['carried']} unchanged, {result['cached']} from cache)")
 
         # Store in short-term memory
-        conversation_memory.add_message("user", f"Generate tests: {requirement[:100]}...")
+        conversation_memory.add_message("user", f"Generate tests: {state['requirement'][:100]}...")
         conversation_memory.add_message("agent", f"Generated {len(testcases)} test cases")
 
         return {
             "test_cases": testcases,
+            "sections": result["sections"],
             "errors": [],
             "retry_count": state.get("retry_count", 0),
             "validation_status": "pending"
         }
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON: {e}")
-        return {
-            "test_cases": [],
-            "errors": [f"JSON parse error: {e}"],
-            "retry_count": state.get("retry_count", 0),
-            "validation_status": "fail"
-        }
     except Exception as e:
         logger.error(f"LLM call failed: {e}")
         return {
@@ -169,7 +237,6 @@ Now generate test cases for this requirement:
             "validation_status": "fail"
         }
 
-
 def save_outputs(state: TestCaseState) -> TestCaseState:
     """Save test cases to files and long-term memory."""
     test_cases = state["test_cases"]
@@ -178,18 +245,24 @@ def save_outputs(state: TestCaseState) -> TestCaseState:
         logger.warning("No test cases to save")
         return {}
 
+    out_dir = Path(state.get("output_dir") or OUT_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
     # Save to files (existing code)
-    raw_file = OUT_DIR / "raw_output.txt"
+    raw_file = out_dir / "raw_output.txt"
     raw_file.write_text(json.dumps(test_cases, indent=2), encoding="utf-8")
     logger.info(f"Saved raw JSON: {raw_file.relative_to(ROOT)}")
 
     df = pd.DataFrame(test_cases)
     if 'steps' in df.columns:
         df['steps'] = df['steps'].apply(lambda x: ' | '.join(x) if isinstance(x, list) else x)
-    csv_file = OUT_DIR / "test_cases.csv"
+    csv_file = out_dir / "test_cases.csv"
     df.to_csv(csv_file, index=False)
     logger.info(f"Saved CSV: {csv_file.relative_to(ROOT)}")
 
+    # Approved baseline: the next run regenerates only the sections that changed
+    TestCaseManifest(state.get("requirement_file", ""), PIPELINE).save(state.get("sections", []), test_cases)
+
     # NEW: Store in long-term memory
     requirement = state.get("requirement", "")
     interaction = f"""Generated {len(test_cases)} test cases for: {requirement[:100]}
@@ -221,71 +294,27 @@ def validate_tests(state: TestCaseState) -> TestCaseState:
     # Validation checks
     if len(test_cases) < 3:
         logger.warning("Validation FAILED: Less than 3 test cases")
-        return {"validation_status": "fail"}
-
-    # Check each test case has required fields
-    required_fields = ["id", "title", "steps", "expected", "priority"]
-    for tc in test_cases:
-        missing = [f for f in required_fields if f not in tc or not tc[f]]
-        if missing:
-            logger.warning(f"Validation FAILED: Missing fields {missing}")
-            return {"validation_status": "fail"}
+        result = {"validation_status": "fail", "invalid_cases": []}
+    else:
+        # Check each test case against the schema (required fields, 2+ steps)
+        _, invalid = validate_test_cases(test_cases)
+        for item in invalid:
+            logger.warning(f"Validation FAILED: test case #{item['index'] + 1}: {'; '.join(item['errors'])}")
+        result = {"validation_status": "fail" if invalid else "pass", "invalid_cases": invalid}
 
-        # Check steps is a list with at least 2 steps
-        if not isinstance(tc["steps"], list) or len(tc["steps"]) < 2:
-            logger.warning("Validation FAILED: Steps must be list with 2+ items")
-            return {"validation_status": "fail"}
+    if result["validation_status"] == "pass":
+        logger.info("✅ Validation PASSED")
 
-    logger.info("✅ Validation PASSED")
-    return {"validation_status": "pass"}
+    # Cascade hit rate: did the current tier's output pass?
+    cascade_stats.record(PIPELINE, state.get("model_tier", 0), result["validation_status"] == "pass")
+    return result
 
 def retry_generate(state: TestCaseState) -> TestCaseState:
-    """Retry test case generation with RAG context."""
-    retry_count = state.get("retry_count", 0) + 1
-    logger.warning(f"🔄 Retry attempt {retry_count}/3")
-
-    requirement = state["requirement"]
-    context = state.get("retrieved_context", "")
-
-    # Build enhanced prompt with context
-    user_message = f"""Based on the following company testing guidelines:
-
-{context}
-
----
-
-Now generate test cases for this requirement:
-
-{requirement}"""
-
-    try:
-        response = chain.invoke({"requirement": user_message})
-        testcases = json.loads(response)
-        logger.info(f"Regenerated {len(testcases)} test cases with RAG")
-
-        return {
-            "test_cases": testcases,
-            "errors": [],
-            "retry_count": retry_count,
-            "validation_status": "pending"
-        }
-
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON: {e}")
-        return {
-            "test_cases": [],
-            "errors": [f"JSON parse error: {e}"],
-            "retry_count": retry_count,
-            "validation_status": "fail"
-        }
-    except Exception as e:
-        logger.error(f"LLM call failed: {e}")
-        return {
-            "test_cases": [],
-            "errors": [f"LLM error: {e}"],
-            "retry_count": retry_count,
-            "validation_status": "fail"
-        }
+    """Retry test case generation with RAG + memory context."""
+    return retry_generation(
+        state, lambda use_cache, tier, feedback: _generate_sections(state, use_cache, tier, feedback),
+        repair_chains, label=" with RAG + memory"
+    )
 
 def route_after_validation(state: TestCaseState) -> str:
     """Decide next node based on validation result."""
@@ -332,6 +361,24 @@ def show_preview(state: TestCaseState) -> TestCaseState:
 def human_approval(state: TestCaseState) -> TestCaseState:
     """Wait for human approval decision."""
 
+    # Auto-approve policy (APPROVAL_POLICY) skips the human entirely
+    decision = auto_approval(state)
+    if decision:
+        return decision
+
+    # Queue mode: pause here (checkpointed); the approval queue CLI resumes with the decision
+    if APPROVAL_MODE == "queue":
+        answer = interrupt({
+            "test_cases": state.get("test_cases", []),
+            "validation_status": state.get("validation_status", "pending"),
+            "retry_count": state.get("retry_count", 0)
+        })
+        logger.info(f"Approval decision received: {answer['decision']}")
+        return {
+            "human_approval": answer["decision"],
+            "human_feedback": answer.get("feedback", "")
+        }
+
     print("\n🤔 What would you like to do?")
     print("  1. APPROVE - Save test cases")
     print("  2. REJECT - Regenerate test cases")
@@ -352,7 +399,7 @@ def human_approval(state: TestCaseState) -> TestCaseState:
             logger.warning(f"❌ Human REJECTED test cases: {feedback}")
             return {
                 "human_approval": "rejected",
-                "human_feedback": feedback or "No feedback provided"
+                "human_feedback": feedback  # Goes into the regeneration prompt
             }
 
         elif choice == "3":
@@ -1,17 +1,27 @@
 """
 TestCase Generator - State Definition
 """
-from typing import TypedDict, List, Dict
+from typing import TypedDict, List, Dict, Annotated
+from ..parallel import merge_dicts
 
 class TestCaseState(TypedDict):
     """State for test case generation pipeline."""
+    requirement_file: str                # Optional: explicit requirement path (batch mode)
+    output_dir: str                      # Optional: where to save test cases (batch mode)
     requirement: str
+    query_embedding: List[float]         # Query vector shared by the memory and KB searches
     retrieved_context: str
+    retrieved_docs: List[Dict]           # KB chunks with similarity (context budget)
     conversation_history: List[Dict]     # NEW: Short-term memory
     past_patterns: str                   # NEW: Long-term memory
+    past_matches: List[Dict]             # Past patterns with similarity (context budget)
+    stage_timings: Annotated[Dict[str, float], merge_dicts]  # Parallel branch durations (seconds)
     test_cases: List[Dict]
+    sections: List[Dict]                 # Section title / key → test IDs (for the manifest)
     errors: List[str]
+    invalid_cases: List[Dict]            # Failed items: {index, test_case, errors} (targeted repair)
     validation_status: str  # "pass" | "fail" | "pending"
+    model_tier: int                      # Cascade tier (CASCADE_MODELS index) of the current attempt
     retry_count: int  # Track retry attempts
     human_approval: str  # "pending" | "approved" | "rejected"
     human_feedback: str  #  Optional feedback from human
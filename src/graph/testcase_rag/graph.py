@@ -16,7 +16,7 @@ from .nodes import (
     route_after_human_approval
 )
 
-def build_graph():
+def build_graph(checkpointer=None):
     """Build and return compiled testcase generator graph with RAG."""
 
     workflow = StateGraph(TestCaseState)
@@ -55,4 +55,4 @@ def build_graph():
     workflow.add_edge("retry", "validate")
     workflow.add_edge("save", END)
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
@@ -6,10 +6,17 @@ from pathlib import Path
 import pandas as pd
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from langgraph.types import interrupt
 
 from .state import TestCaseState
 from src.core import get_langchain_llm, pick_requirement, get_logger
-from src.prompts.testcase_prompts import TESTCASE_SYSTEM_PROMPT
+from src.prompts.testcase_prompts import TESTCASE_SECTION_SYSTEM_PROMPT, TESTCASE_REPAIR_PROMPT
+from src.core import generate_by_section, ResultCache, TestCaseManifest
+from src.core import validate_test_cases, retry_generation
+from src.core import tier_candidates, SPECULATIVE_MODE
+from src.core import CascadeStats, CASCADE_TIERS
+from src.core import testcase_chain
+from src.core import auto_approval, APPROVAL_MODE
 from src.core import search_vector_store
 
 # Setup
@@ -20,21 +27,42 @@ OUT_DIR = ROOT / "outputs" / "testcase_generated"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Build Langchain components
-llm = get_langchain_llm()
+# Model cascade (CASCADE_MODELS): tier 0 is the cheapest, failed validations escalate
+tier_llms = [get_langchain_llm(tier=tier) for tier in range(CASCADE_TIERS)]
 prompt_template = ChatPromptTemplate.from_messages([
-    ("system", TESTCASE_SYSTEM_PROMPT),
+    ("system", TESTCASE_SECTION_SYSTEM_PROMPT),
     ("user", "Requirements:\\n\\n{requirement}")
 ])
 parser = StrOutputParser()
-chain = prompt_template | llm | parser
+# Native structured output (TestCaseList schema) where the provider supports it
+chains = [testcase_chain(prompt_template, tier_llm, parser) for tier_llm in tier_llms]
+
+# Fixes only the test cases that failed validation
+repair_template = ChatPromptTemplate.from_messages([
+    ("system", TESTCASE_REPAIR_PROMPT),
+    ("user", "Requirement:\n\n{requirement}\n\nTest cases to fix:\n\n{items}")
+])
+repair_chains = [testcase_chain(repair_template, tier_llm, parser) for tier_llm in tier_llms]
+
+# SPECULATIVE_MODE=on: race K generations per section, first valid one wins (candidates per cascade tier)
+speculative = tier_candidates(prompt_template, parser) if SPECULATIVE_MODE else None
+
+# Hit rate of each cascade tier
+cascade_stats = CascadeStats()
+
+# Manifest namespace (matches the approval queue pipeline names)
+PIPELINE = "testcase_rag"
+
+# Test cases per requirement section (editing one section regenerates only that one)
+section_cache = ResultCache(namespace="testcase_rag_sections")
 
 
 def read_requirement(state: TestCaseState) -> TestCaseState:
     """Read requirement file."""
-    req_file = pick_requirement(None, REQ_DIR)
+    req_file = pick_requirement(state.get("requirement_file") or None, REQ_DIR)
     requirement = req_file.read_text(encoding="utf-8")
     logger.info(f"Read requirement: {req_file.name}")
-    return {"requirement": requirement}
+    return {"requirement": requirement, "requirement_file": str(req_file)}
 
 def retrieve_context(state: TestCaseState) -> TestCaseState:
     """Retrieve relevant testing guidelines from knowledge base."""
@@ -66,15 +94,10 @@ def retrieve_context(state: TestCaseState) -> TestCaseState:
 
 
 
-def generate_tests(state: TestCaseState) -> TestCaseState:
-    """Generate test cases with RAG context."""
-    logger.info("Generating test cases with RAG context...")
-
-    requirement = state["requirement"]
+def _user_message(state: TestCaseState, requirement: str) -> str:
+    """Enhanced prompt: company guidelines + (a section of) the requirement."""
     context = state.get("retrieved_context", "")
-
-    # Build enhanced prompt with context
-    user_message = f"""Based on the following company testing guidelines:
+    return f"""Based on the following company testing guidelines:
 
 {context}
 
@@ -84,26 +107,46 @@ Now generate test cases for this requirement:
 
 {requirement}"""
 
+
+def _generate_sections(state: TestCaseState, use_cache: bool = True, tier: int = 0, feedback: str = "") -> dict:
+    """Per-section generation (parallel, cached per section) for the whole requirement."""
+    return generate_by_section(
+        chains[tier], state["requirement"],
+        build_input=lambda text, num_cases: {"requirement": _user_message(state, text), "num_cases": num_cases},
+        cache=section_cache, use_cache=use_cache,
+        manifest=TestCaseManifest(state.get("requirement_file", ""), PIPELINE),
+        candidates=speculative[tier] if speculative else None,
+        feedback=feedback
+    )
+
+
+def generate_tests(state: TestCaseState) -> TestCaseState:
+    """Generate test cases with RAG context."""
+    logger.info("Generating test cases with RAG context...")
+
     try:
-        response = chain.invoke({"requirement": user_message})
-        testcases = json.loads(response)
-        logger.info(f"Generated {len(testcases)} test cases using RAG")
+        result = _generate_sections(state)
+        if result["errors"]:
+            # Valid sections are cached: the retry only regenerates the failed ones
+            return {
+                "test_cases": [],
+                "errors": result["errors"],
+                "retry_count": state.get("retry_count", 0),
+                "validation_status": "fail"
+            }
+
+        testcases = result["test_cases"]
+        logger.info(f"Generated {len(testcases)} test cases using RAG "
+                    f"({len(result['sections'])} sections, {result['carried']} unchanged, {result['cached']} from cache)")
 
         return {
             "test_cases": testcases,
+            "sections": result["sections"],
             "errors": [],
             "retry_count": state.get("retry_count", 0),
             "validation_status": "pending"
         }
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON: {e}")
-        return {
-            "test_cases": [],
-            "errors": [f"JSON parse error: {e}"],
-            "retry_count": state.get("retry_count", 0),
-            "validation_status": "fail"
-        }
     except Exception as e:
         logger.error(f"LLM call failed: {e}")
         return {
@@ -121,8 +164,11 @@ def save_outputs(state: TestCaseState) -> TestCaseState:
         logger.warning("No test cases to save")
         return {}
 
+    out_dir = Path(state.get("output_dir") or OUT_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
     # Save raw JSON
-    raw_file = OUT_DIR / "raw_output.txt"
+    raw_file = out_dir / "raw_output.txt"
     raw_file.write_text(json.dumps(test_cases, indent=2), encoding="utf-8")
     logger.info(f"Saved raw JSON: {raw_file.relative_to(ROOT)}")
 
@@ -131,10 +177,13 @@ def save_outputs(state: TestCaseState) -> TestCaseState:
     if 'steps' in df.columns:
         df['steps'] = df['steps'].apply(lambda x: ' | '.join(x) if isinstance(x, list) else x)
 
-    csv_file = OUT_DIR / "test_cases.csv"
+    csv_file = out_dir / "test_cases.csv"
     df.to_csv(csv_file, index=False)
     logger.info(f"Saved CSV: {csv_file.relative_to(ROOT)}")
 
+    # Approved baseline: the next run regenerates only the sections that changed
+    TestCaseManifest(state.get("requirement_file", ""), PIPELINE).save(state.get("sections", []), test_cases)
+
     return {}
 
 def validate_tests(state: TestCaseState) -> TestCaseState:
@@ -146,71 +195,27 @@ def validate_tests(state: TestCaseState) -> TestCaseState:
     # Validation checks
     if len(test_cases) < 3:
         logger.warning("Validation FAILED: Less than 3 test cases")
-        return {"validation_status": "fail"}
-
-    # Check each test case has required fields
-    required_fields = ["id", "title", "steps", "expected", "priority"]
-    for tc in test_cases:
-        missing = [f for f in required_fields if f not in tc or not tc[f]]
-        if missing:
-            logger.warning(f"Validation FAILED: Missing fields {missing}")
-            return {"validation_status": "fail"}
+        result = {"validation_status": "fail", "invalid_cases": []}
+    else:
+        # Check each test case against the schema (required fields, 2+ steps)
+        _, invalid = validate_test_cases(test_cases)
+        for item in invalid:
+            logger.warning(f"Validation FAILED: test case #{item['index'] + 1}: {'; '.join(item['errors'])}")
+        result = {"validation_status": "fail" if invalid else "pass", "invalid_cases": invalid}
 
-        # Check steps is a list with at least 2 steps
-        if not isinstance(tc["steps"], list) or len(tc["steps"]) < 2:
-            logger.warning("Validation FAILED: Steps must be list with 2+ items")
-            return {"validation_status": "fail"}
+    if result["validation_status"] == "pass":
+        logger.info("✅ Validation PASSED")
 
-    logger.info("✅ Validation PASSED")
-    return {"validation_status": "pass"}
+    # Cascade hit rate: did the current tier's output pass?
+    cascade_stats.record(PIPELINE, state.get("model_tier", 0), result["validation_status"] == "pass")
+    return result
 
 def retry_generate(state: TestCaseState) -> TestCaseState:
     """Retry test case generation with RAG context."""
-    retry_count = state.get("retry_count", 0) + 1
-    logger.warning(f"🔄 Retry attempt {retry_count}/3")
-
-    requirement = state["requirement"]
-    context = state.get("retrieved_context", "")
-
-    # Build enhanced prompt with context
-    user_message = f"""Based on the following company testing guidelines:
-
-{context}
-
----
-
-Now generate test cases for this requirement:
-
-{requirement}"""
-
-    try:
-        response = chain.invoke({"requirement": user_message})
-        testcases = json.loads(response)
-        logger.info(f"Regenerated {len(testcases)} test cases with RAG")
-
-        return {
-            "test_cases": testcases,
-            "errors": [],
-            "retry_count": retry_count,
-            "validation_status": "pending"
-        }
-
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON: {e}")
-        return {
-            "test_cases": [],
-            "errors": [f"JSON parse error: {e}"],
-            "retry_count": retry_count,
-            "validation_status": "fail"
-        }
-    except Exception as e:
-        logger.error(f"LLM call failed: {e}")
-        return {
-            "test_cases": [],
-            "errors": [f"LLM error: {e}"],
-            "retry_count": retry_count,
-            "validation_status": "fail"
-        }
+    return retry_generation(
+        state, lambda use_cache, tier, feedback: _generate_sections(state, use_cache, tier, feedback),
+        repair_chains, label=" with RAG"
+    )
 
 def route_after_validation(state: TestCaseState) -> str:
     """Decide next node based on validation result."""
@@ -257,6 +262,24 @@ def show_preview(state: TestCaseState) -> TestCaseState:
 def human_approval(state: TestCaseState) -> TestCaseState:
     """Wait for human approval decision."""
 
+    # Auto-approve policy (APPROVAL_POLICY) skips the human entirely
+    decision = auto_approval(state)
+    if decision:
+        return decision
+
+    # Queue mode: pause here (checkpointed); the approval queue CLI resumes with the decision
+    if APPROVAL_MODE == "queue":
+        answer = interrupt({
+            "test_cases": state.get("test_cases", []),
+            "validation_status": state.get("validation_status", "pending"),
+            "retry_count": state.get("retry_count", 0)
+        })
+        logger.info(f"Approval decision received: {answer['decision']}")
+        return {
+            "human_approval": answer["decision"],
+            "human_feedback": answer.get("feedback", "")
+        }
+
     print("\n🤔 What would you like to do?")
     print("  1. APPROVE - Save test cases")
     print("  2. REJECT - Regenerate test cases")
@@ -277,7 +300,7 @@ def human_approval(state: TestCaseState) -> TestCaseState:
             logger.warning(f"❌ Human REJECTED test cases: {feedback}")
             return {
                 "human_approval": "rejected",
-                "human_feedback": feedback or "No feedback provided"
+                "human_feedback": feedback  # Goes into the regeneration prompt
             }
 
         elif choice == "3":
@@ -1,5 +1,8 @@
 from .incident_response_prompts import (
     LOG_ANALYZER_PROMPT,
-    ROOT_CAUSE_PROMPT,
-    SOLUTION_PROMPT
+    SOLUTION_PROMPT,
+    LOG_ANALYZER_DIGEST_PROMPT,
+    ROOT_CAUSE_DIGEST_PROMPT,
+    FUSED_INCIDENT_PROMPT,
+    FUSED_SECTION_MARKERS
 )
@@ -18,7 +18,23 @@ Be concise and structured.
 Log to analyze:
 {log_content}"""
 
-ROOT_CAUSE_PROMPT = """You are a Root Cause Investigation Specialist.
+# PROMPT_MODE=digest: counts, time range and components are pre-computed
+LOG_ANALYZER_DIGEST_PROMPT = """You are a Log Analysis Specialist.
+
+Your job: Identify the critical issues in a log from its pre-computed digest.
+
+The digest already contains exact counts, the time range and the affected components.
+Copy those numbers as given - do not recount. Focus on:
+1. Top 3-5 issues (use the message groups and their timestamps)
+2. How the issues relate to each other
+3. Affected systems/services and user impact
+
+Be concise and structured.
+
+Log digest:
+{log_digest}"""
+
+ROOT_CAUSE_DIGEST_PROMPT = """You are a Root Cause Investigation Specialist.
 
 Your job: Determine the underlying root cause of incidents.
 
@@ -28,13 +44,13 @@ Based on the log analysis, investigate and provide:
 3. Contributing factors
 4. Impact assessment
 
-Be specific and technical.
+Be specific and technical. Counts and timestamps in the digest are exact.
 
 Log Analysis:
 {log_analysis}
 
-Original Log:
-{log_content}"""
+Log Digest:
+{log_digest}"""
 
 SOLUTION_PROMPT = """You are a Solution Recommendation Specialist.
 
@@ -53,3 +69,36 @@ Root Cause:
 
 Log Analysis:
 {log_analysis}"""
+
+# INCIDENT_MODE=fused: one call returns all three sections
+FUSED_SECTION_MARKERS = ("===LOG ANALYSIS===", "===ROOT CAUSE===", "===SOLUTION===")
+
+FUSED_INCIDENT_PROMPT = """You are an Incident Response Specialist.
+
+Your job: Analyze the log, determine the root cause and recommend fixes in ONE answer.
+
+Return exactly three sections, each starting with its marker line:
+
+===LOG ANALYSIS===
+1. Critical errors count
+2. Warnings count
+3. Top 3-5 issues with timestamps
+4. Affected systems/services
+5. Time range of issues
+
+===ROOT CAUSE===
+1. Root cause (one clear statement)
+2. Technical explanation
+3. Contributing factors
+4. Impact assessment
+
+===SOLUTION===
+1. Immediate actions (2-3 steps with commands if applicable)
+2. Short-term fixes (within 24 hours)
+3. Long-term prevention
+4. Verification steps
+
+Be concise, specific and actionable.
+
+Log to analyze:
+{log_content}"""
@@ -22,3 +22,43 @@ Rules:
 - Keep steps clear and actionable
 - Priority: High, Medium, or Low
 - Return ONLY JSON, no markdown fences"""
+
+
+TESTCASE_SECTION_SYSTEM_PROMPT = """You are a QA engineer. Generate test cases for ONE section of a requirement.
+
+The requirement may start with shared background (feature, user story, API contract).
+Use it for context, but only test the behaviour described under "Section to test".
+
+Return ONLY a JSON array with this structure:
+[
+  {{
+    "id": "TC-001",
+    "title": "Short test title",
+    "steps": ["Step 1", "Step 2", "Step 3"],
+    "expected": "Expected result",
+    "priority": "High"
+  }}
+]
+
+Rules:
+- Return {num_cases} test cases
+- Cover positive and negative scenarios of this section
+- Include edge cases
+- Keep steps clear and actionable
+- Priority: High, Medium, or Low
+- Return ONLY JSON, no markdown fences"""
+
+
+TESTCASE_REPAIR_PROMPT = """You are a QA engineer. Fix test cases that failed validation.
+
+Each item has a "test_case" and the "errors" found in it.
+Fix only what the errors describe, using the requirement for missing details.
+Keep the id and the intent of every test case.
+
+Every test case needs:
+- id, title, expected
+- steps: a list of 2 or more clear, actionable steps
+- priority: High, Medium, or Low
+
+Return ONLY a JSON array with one fixed test case per item, in the same order.
+Return ONLY JSON, no markdown fences"""
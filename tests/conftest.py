@@ -0,0 +1,7 @@
+"""
+Shared test setup
+"""
+import os
+
+# LLM clients are built when the graph modules are imported; tests never call them
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
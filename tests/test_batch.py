@@ -0,0 +1,32 @@
+"""
+Batch - process-pool parsing
+"""
+from pathlib import Path
+
+from src.core.batch import parse_files
+from src.core.log_metrics import log_metrics_table
+from src.core.log_windows import extract_error_windows
+from src.core.triage import triage_log
+
+LOG_DIR = Path(__file__).resolve().parents[1] / "data" / "logs"
+
+
+def test_parsed_fields_match_the_graph_nodes():
+    files = sorted(LOG_DIR.glob("*.log"))
+    items, parsed = parse_files(files, max_workers=2)
+
+    assert sorted(item["file"] for item in items) == sorted(str(f) for f in files)
+    for path, fields in parsed.items():
+        log_content = Path(path).read_text(encoding="utf-8")
+        assert fields["log_content"] == log_content
+        assert fields["triage"] == triage_log(log_content)
+        if fields["triage"]["action"] != "skip":
+            assert fields["focused_log"] == extract_error_windows(log_content)
+            assert fields["metrics"] == log_metrics_table(log_content)
+
+
+def test_noisiest_files_come_first():
+    items, _ = parse_files(sorted(LOG_DIR.glob("*.log")), max_workers=2)
+
+    keys = [(item["error_lines"], item["size"]) for item in items]
+    assert keys == sorted(keys, reverse=True)
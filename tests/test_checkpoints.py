@@ -0,0 +1,84 @@
+"""
+Checkpointed runs - resume after failed LLM calls
+"""
+import sqlite3
+from typing import List, TypedDict
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph import StateGraph, END
+
+from src.graph.checkpoints import invoke_checkpointed
+
+
+class RunState(TypedDict):
+    log_content: str
+    analysis: str
+    report: str
+    errors: List[str]
+
+
+def _build(outcomes: list, calls: dict):
+    """read → analyze → report; analyze fails (caught, like the real nodes) while outcomes say so."""
+    def read(state):
+        calls["read"] = calls.get("read", 0) + 1
+        return {"log_content": "ERROR db timeout"}
+
+    def analyze(state):
+        calls["analyze"] = calls.get("analyze", 0) + 1
+        if outcomes.pop(0) == "fail":
+            return {"analysis": "", "errors": ["LLM error: rate limited"]}
+        return {"analysis": "db timeout", "errors": []}
+
+    def report(state):
+        return {"report": f"Report: {state['analysis'] or 'n/a'}"}
+
+    workflow = StateGraph(RunState)
+    workflow.add_node("read", read)
+    workflow.add_node("analyze", analyze)
+    workflow.add_node("report", report)
+    workflow.set_entry_point("read")
+    workflow.add_edge("read", "analyze")
+    workflow.add_edge("analyze", "report")
+    workflow.add_edge("report", END)
+
+    saver = SqliteSaver(sqlite3.connect(":memory:", check_same_thread=False))
+    return workflow.compile(checkpointer=saver)
+
+
+INIT = {"log_content": "", "analysis": "", "report": "", "errors": []}
+
+
+def test_resume_reruns_failed_node():
+    calls = {}
+    app = _build(["fail", "ok"], calls)
+
+    failed = invoke_checkpointed(app, INIT, "run-1")
+    assert failed["errors"] == ["LLM error: rate limited"]
+
+    resumed = invoke_checkpointed(app, INIT, "run-1", resume=True)
+    assert resumed["errors"] == []
+    assert resumed["report"] == "Report: db timeout"
+    assert calls == {"read": 1, "analyze": 2}
+
+
+def test_resume_returns_completed_run():
+    calls = {}
+    app = _build(["ok"], calls)
+
+    invoke_checkpointed(app, INIT, "run-2")
+    resumed = invoke_checkpointed(app, INIT, "run-2", resume=True)
+
+    assert resumed["report"] == "Report: db timeout"
+    assert calls == {"read": 1, "analyze": 1}
+
+
+def test_resume_after_second_failure_reruns_again():
+    calls = {}
+    app = _build(["fail", "fail", "ok"], calls)
+
+    invoke_checkpointed(app, INIT, "run-3")
+    assert invoke_checkpointed(app, INIT, "run-3", resume=True)["errors"]
+
+    resumed = invoke_checkpointed(app, INIT, "run-3", resume=True)
+    assert resumed["errors"] == []
+    assert calls == {"read": 1, "analyze": 3}
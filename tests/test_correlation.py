@@ -0,0 +1,42 @@
+"""
+Cross-log correlation - shared signatures per episode
+"""
+from datetime import datetime
+
+from src.core.correlation import correlate, format_timeline
+
+
+def _record(source, timestamp, level, message, component="db"):
+    return {"source": source, "timestamp": timestamp, "time": datetime.fromisoformat(timestamp),
+            "level": level, "component": component, "message": message}
+
+
+SOURCES = {
+    "database": [
+        _record("database", "2026-01-04 09:17:00", "ERROR", "Deadlock detected"),
+        _record("database", "2026-01-08 14:16:00", "ERROR", "Lock wait timeout exceeded: table=orders"),
+    ],
+    "app": [
+        _record("app", "2026-01-08 14:16:15", "ERROR", "Deadlock detected on table: inventory", "orders"),
+    ],
+}
+
+
+def test_shared_section_only_links_services_within_one_episode():
+    timeline = format_timeline(correlate(SOURCES))
+    shared = timeline.split("--- Episode 1")[0]
+
+    assert "Episode 2, deadlock: app, database" in shared
+    assert "2026-01-04" not in shared
+
+
+def test_shared_section_lists_an_example_per_service():
+    timeline = format_timeline(correlate(SOURCES))
+
+    assert "(app) Deadlock detected on table: inventory" in timeline
+    assert "(database) Lock wait timeout exceeded: table=orders" in timeline
+
+
+def test_no_shared_section_without_cross_service_episode():
+    sources = {"database": SOURCES["database"]}
+    assert "same episode" not in format_timeline(correlate(sources))
@@ -0,0 +1,49 @@
+"""
+Incident fingerprint - result cache keys for minor logs
+"""
+from src.core.fingerprint import incident_fingerprint
+from src.core.result_cache import ResultCache
+from src.graph.log_analyzer import nodes
+
+DISK_LOG = """2026-01-04 10:00:00 INFO [main] Service started
+2026-01-04 10:05:00 WARNING [disk] Disk usage at 85% on /var
+"""
+
+AUTH_LOG = """2026-01-04 11:00:00 INFO [main] Service started
+2026-01-04 11:02:00 WARNING [auth] Token for user 42 expires in 5 minutes
+"""
+
+
+def _cache(tmp_path):
+    cache = ResultCache(namespace="log_analyzer", db_path=tmp_path / "results.db")
+    cache.enabled = True
+    return cache
+
+
+def test_warning_only_logs_get_distinct_fingerprints():
+    disk = incident_fingerprint(DISK_LOG)
+    auth = incident_fingerprint(AUTH_LOG)
+
+    assert disk["signatures"] and auth["signatures"]
+    assert disk["fingerprint"] != auth["fingerprint"]
+
+
+def test_log_without_signatures_is_not_cacheable():
+    assert incident_fingerprint("2026-01-04 10:00:00 INFO [main] Service started\n")["fingerprint"] == ""
+
+
+def test_warning_only_logs_do_not_share_a_cache_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(nodes, "result_cache", _cache(tmp_path))
+    triage = {"level": "minor", "action": "small"}
+
+    first = nodes.lookup_cache({"log_content": DISK_LOG, "triage": triage})
+    assert not first["cache_hit"]
+    nodes.result_cache.put(first["fingerprint"], {
+        "analysis_text": "disk report",
+        "analysis_json": {"summary": "disk almost full"},
+        "executive_summary": "disk"
+    })
+
+    second = nodes.lookup_cache({"log_content": AUTH_LOG, "triage": triage})
+    assert not second["cache_hit"]
+    assert second["fingerprint"] != first["fingerprint"]
@@ -0,0 +1,58 @@
+"""
+Incident response routing - fused mode fallback
+"""
+from src.graph.incident_response.agents import fused_responder
+from src.graph.incident_response.supervisor import route_next
+from src.prompts import FUSED_SECTION_MARKERS
+
+
+class FakeChain:
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return self.response
+
+
+def _state():
+    return {
+        "triage": {"action": "analyze"},
+        "execution_mode": "fused",
+        "incident_context": {"evidence": "ERROR db timeout", "metrics": "", "use_digest": False, "findings": {}},
+        "steps_completed": [],
+        "errors": [],
+    }
+
+
+def _run_fused(monkeypatch, response):
+    fake = FakeChain(response)
+    monkeypatch.setattr(fused_responder, "chain", fake)
+    state = _state()
+    state.update(fused_responder.fused_responder_agent(state))
+    return state, fake
+
+
+def test_markerless_fused_reply_routes_to_log_analyzer(monkeypatch):
+    state, fake = _run_fused(monkeypatch, "The database timed out; restart it.")
+
+    assert fake.calls == 1
+    assert state["execution_mode"] == "full"
+    assert route_next(state) == "log_analyzer"
+
+
+def test_partial_fused_reply_routes_to_missing_agent(monkeypatch):
+    log_marker, root_marker, _ = FUSED_SECTION_MARKERS
+    state, _ = _run_fused(monkeypatch, f"{log_marker}\nDB timeouts\n{root_marker}\nPool exhausted\n")
+
+    assert state["log_analysis"] == "DB timeouts"
+    assert route_next(state) == "solution_recommender"
+
+
+def test_complete_fused_reply_finishes(monkeypatch):
+    response = "\n".join(f"{marker}\nsection {i}" for i, marker in enumerate(FUSED_SECTION_MARKERS))
+    state, _ = _run_fused(monkeypatch, response)
+
+    assert state["execution_mode"] == "fused"
+    assert route_next(state) == "FINISH"
@@ -0,0 +1,26 @@
+"""
+Log digest - exemplar lines
+"""
+from pathlib import Path
+
+from src.core.log_digest import build_digest, SINGLE_LINE_EXEMPLARS
+
+LOG_DIR = Path(__file__).resolve().parents[1] / "data" / "logs"
+
+
+def test_multi_line_logs_get_their_continuation_context():
+    digest = build_digest((LOG_DIR / "application_error.log").read_text(encoding="utf-8"))
+
+    assert digest["exemplars"]
+    assert all("\n" in exemplar for exemplar in digest["exemplars"])
+
+
+def test_single_line_logs_still_get_exemplars():
+    log_content = (LOG_DIR / "api_access.log").read_text(encoding="utf-8")
+    digest = build_digest(log_content)
+
+    assert len(digest["exemplars"]) == SINGLE_LINE_EXEMPLARS
+    # Verbatim first occurrence of the top-ranked group
+    top = digest["groups"][0]
+    assert digest["exemplars"][0].startswith(f"{top['first']} {top['level']}")
+    assert top["message"] in digest["exemplars"][0]
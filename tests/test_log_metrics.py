@@ -0,0 +1,32 @@
+"""
+Log metrics - endpoint table selection
+"""
+from pathlib import Path
+
+import pandas as pd
+
+from src.core.log_metrics import log_metrics_table, top_endpoints
+
+LOG_DIR = Path(__file__).resolve().parents[1] / "data" / "logs"
+
+
+def _endpoints(rows):
+    return pd.DataFrame(rows, columns=["endpoint", "p95", "error_rate"]).set_index("endpoint")
+
+
+def test_failing_endpoints_are_kept_before_truncation():
+    endpoints = _endpoints([("/slow", 900, 0.0), ("/slower", 800, 0.0), ("/broken", 3, 1.0), ("/flaky", 50, 0.2)])
+
+    assert list(top_endpoints(endpoints, max_rows=3).index) == ["/broken", "/flaky", "/slow"]
+
+
+def test_all_failing_endpoints_shown_even_past_max_rows():
+    endpoints = _endpoints([("/a", 10, 0.5), ("/b", 20, 0.5), ("/c", 900, 0.0)])
+
+    assert list(top_endpoints(endpoints, max_rows=1).index) == ["/b", "/a"]
+
+
+def test_api_access_log_table_shows_the_failing_dashboard():
+    table = log_metrics_table((LOG_DIR / "api_access.log").read_text(encoding="utf-8"))
+
+    assert "/api/v1/dashboard | 1 | 3 | 3 | 3 | 3 | 100%" in table
@@ -0,0 +1,143 @@
+"""
+Per-section test case generation - manifest carry-over and streamed parsing
+"""
+import json
+
+import pytest
+
+from src.core import requirement_sections
+from src.core.requirement_sections import generate_by_section
+from src.core.testcase_schema import validate_test_cases
+from src.core import testcase_manifest
+
+REQUIREMENT = """API Endpoint: User Registration
+
+Endpoint: POST /api/v1/users/register
+
+1. Valid Registration
+   - Given all required fields are provided
+   - Then response status should be 201 Created
+
+2. Duplicate Email Validation
+   - Given email already exists in system
+   - Then response status should be 409 Conflict
+
+3. Password Validation
+   - Password must be minimum 8 characters
+   - If validation fails, return 400 Bad Request
+"""
+
+
+class FakeChain:
+    """Returns `count` valid test cases per prompt and records the prompts it saw."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def _output(self, inputs):
+        self.prompts.append(inputs["requirement"])
+        return json.dumps([
+            {"id": f"X-{i}", "title": f"Case {i}", "steps": ["Send request", "Check response"],
+             "expected": "Matches the requirement", "priority": "High"}
+            for i in range(inputs["num_cases"])
+        ])
+
+    def invoke(self, inputs):
+        return self._output(inputs)
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        return [self._output(item) for item in inputs]
+
+    def stream(self, inputs):
+        yield from self._output(inputs)
+
+
+def _generate(chain, requirement, manifest_dir):
+    manifest = testcase_manifest.TestCaseManifest("registration.txt", "test", manifest_dir)
+    result = generate_by_section(
+        chain, requirement,
+        build_input=lambda text, num_cases: {"requirement": text, "num_cases": num_cases},
+        manifest=manifest
+    )
+    manifest.save(result["sections"], result["test_cases"])
+    return result
+
+
+def test_unchanged_requirement_is_carried_over(tmp_path):
+    first = _generate(FakeChain(), REQUIREMENT, tmp_path)
+    chain = FakeChain()
+    second = _generate(chain, REQUIREMENT, tmp_path)
+
+    assert chain.prompts == []
+    assert second["carried"] == 3
+    assert [tc["id"] for tc in second["test_cases"]] == [tc["id"] for tc in first["test_cases"]]
+
+
+def test_edited_section_regenerates_only_that_section(tmp_path):
+    _generate(FakeChain(), REQUIREMENT, tmp_path)
+    chain = FakeChain()
+    edited = REQUIREMENT.replace("409 Conflict", "409 Conflict with an error code")
+    result = _generate(chain, edited, tmp_path)
+
+    assert len(chain.prompts) == 1
+    assert "409 Conflict with an error code" in chain.prompts[0]
+    assert result["carried"] == 2
+
+
+def test_edited_context_regenerates_every_section_with_same_ids(tmp_path):
+    first = _generate(FakeChain(), REQUIREMENT, tmp_path)
+    chain = FakeChain()
+    edited = REQUIREMENT.replace("POST /api/v1/users/register", "POST /api/v2/users")
+    result = _generate(chain, edited, tmp_path)
+
+    assert len(chain.prompts) == 3
+    assert all("/api/v2/users" in prompt for prompt in chain.prompts)
+    assert result["carried"] == 0
+    assert [tc["id"] for tc in result["test_cases"]] == [tc["id"] for tc in first["test_cases"]]
+
+
+def test_streamed_and_batched_generation_agree(tmp_path, monkeypatch):
+    streamed = _generate(FakeChain(), REQUIREMENT, tmp_path / "streamed")
+    monkeypatch.setattr(requirement_sections, "STREAM_PARSE", False)
+    batched = _generate(FakeChain(), REQUIREMENT, tmp_path / "batched")
+
+    assert streamed["test_cases"] == batched["test_cases"]
+
+
+class OneStepChain(FakeChain):
+    """The first test case of every section has a single step (schema-invalid, well-formed JSON)."""
+
+    def _output(self, inputs):
+        cases = json.loads(super()._output(inputs))
+        cases[0]["steps"] = cases[0]["steps"][:1]
+        return json.dumps(cases)
+
+
+def test_streamed_schema_invalid_cases_are_kept_for_repair(tmp_path):
+    result = _generate(OneStepChain(), REQUIREMENT, tmp_path)
+    _, invalid = validate_test_cases(result["test_cases"])
+
+    assert result["errors"] == []
+    assert len(invalid) == 3
+    assert all("steps" in item["errors"][0] for item in invalid)
+
+
+def test_streamed_malformed_json_fails_the_section():
+    chain = FakeChain()
+    chain.stream = lambda inputs: iter(['[{"id": "TC-1", "title": }, {"id": "TC-2"}]'])
+
+    with pytest.raises(ValueError, match="malformed"):
+        requirement_sections.stream_section(chain, {"requirement": "x", "num_cases": 2}, 2)
+
+
+def test_rejection_feedback_reaches_every_section_prompt(tmp_path):
+    chain = FakeChain()
+    manifest = testcase_manifest.TestCaseManifest("registration.txt", "test", tmp_path)
+    generate_by_section(
+        chain, REQUIREMENT,
+        build_input=lambda text, num_cases: {"requirement": text, "num_cases": num_cases},
+        manifest=manifest, use_cache=False, feedback="Missing negative cases"
+    )
+
+    assert len(chain.prompts) == 3
+    assert all(prompt.endswith("Missing negative cases") for prompt in chain.prompts)
@@ -0,0 +1,27 @@
+"""
+Speculative generation - candidates per cascade tier
+"""
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.core import speculative
+
+PROMPT = ChatPromptTemplate.from_messages([("user", "{requirement}")])
+
+
+def test_without_cascade_races_speculative_models(monkeypatch):
+    monkeypatch.setattr(speculative, "CASCADE_MODELS", ["gpt-4o-mini"])
+    tiers = speculative.tier_candidates(PROMPT, StrOutputParser(), k=2)
+
+    assert len(tiers) == 1
+    assert [c["model"] for c in tiers[0]] == [speculative.SPECULATIVE_MODELS[i % len(speculative.SPECULATIVE_MODELS)]
+                                              for i in range(2)]
+
+
+def test_each_cascade_tier_races_its_own_model(monkeypatch):
+    monkeypatch.setattr(speculative, "CASCADE_MODELS", ["gpt-5-nano", "gpt-4o-mini"])
+    tiers = speculative.tier_candidates(PROMPT, StrOutputParser(), k=3)
+
+    assert [[c["model"] for c in tier] for tier in tiers] == [["gpt-5-nano"] * 3, ["gpt-4o-mini"] * 3]
+    # First sample at temperature 0, repeats with some variety
+    assert [c["name"].split(":", 1)[1] for c in tiers[1]] == ["gpt-4o-mini", "gpt-4o-mini@0.7", "gpt-4o-mini@0.7"]
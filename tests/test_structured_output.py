@@ -0,0 +1,35 @@
+"""
+Structured output chains - streaming only on the text path
+"""
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_openai import ChatOpenAI
+
+from src.core import requirement_sections, structured_output
+from src.core.structured_output import is_structured
+
+PROMPT = ChatPromptTemplate.from_messages([("user", "{requirement} ({num_cases} cases)")])
+
+
+def test_native_structured_chain_is_tagged():
+    chain = structured_output.testcase_chain(PROMPT, ChatOpenAI(model="gpt-4o-mini", api_key="test-key"), StrOutputParser())
+    assert is_structured(chain)
+
+
+def test_text_chain_is_not_tagged():
+    chain = structured_output.testcase_chain(PROMPT, FakeListChatModel(responses=["[]"]), StrOutputParser())
+    assert not is_structured(chain)
+
+
+def test_structured_chain_is_batched_not_streamed(monkeypatch):
+    chain = structured_output.testcase_chain(PROMPT, ChatOpenAI(model="gpt-4o-mini", api_key="test-key"), StrOutputParser())
+    streamed = []
+    monkeypatch.setattr(requirement_sections, "_stream_batch", lambda *args: streamed.append(args))
+    monkeypatch.setattr(type(chain), "batch", lambda self, inputs, **kwargs: ["[]"] * len(inputs))
+
+    requirement_sections.generate_by_section(
+        chain, "Login must work",
+        build_input=lambda text, num_cases: {"requirement": text, "num_cases": num_cases}
+    )
+    assert streamed == []
@@ -0,0 +1,83 @@
+"""
+Test case retry step - repair, regeneration and cascade escalation
+"""
+import json
+
+from src.core import testcase_retry
+
+VALID = {"id": "TC-001", "title": "Login", "steps": ["Open page", "Submit"], "expected": "Logged in",
+         "priority": "High", "section": "Full requirement"}
+INVALID = {**VALID, "id": "TC-002", "steps": ["Open page"]}
+
+
+class RepairChain:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        return json.dumps([{**INVALID, "steps": ["Open page", "Submit"]}])
+
+
+class Generator:
+    def __init__(self, result=None):
+        self.calls = []
+        self.result = result or {"test_cases": [VALID], "errors": [], "sections": [], "carried": 0, "cached": 0}
+
+    def __call__(self, use_cache, tier, feedback):
+        self.calls.append((use_cache, tier, feedback))
+        return self.result
+
+
+def _state(**overrides):
+    return {"requirement": "Login must work", "test_cases": [VALID, INVALID], "retry_count": 0,
+            "model_tier": 0, "invalid_cases": [], "human_approval": "pending", **overrides}
+
+
+def test_invalid_items_are_repaired_on_the_next_tier(monkeypatch):
+    monkeypatch.setattr(testcase_retry, "next_tier", lambda tier: tier + 1)
+    repair_chains = [RepairChain(), RepairChain()]
+    generate = Generator()
+    invalid = [{"index": 1, "test_case": INVALID, "errors": ["steps: too short"]}]
+
+    updates = testcase_retry.retry_generation(_state(invalid_cases=invalid), generate, repair_chains)
+
+    assert (repair_chains[0].calls, repair_chains[1].calls, generate.calls) == (0, 1, [])
+    assert updates["model_tier"] == 1 and updates["retry_count"] == 1
+    assert updates["test_cases"][1]["steps"] == ["Open page", "Submit"]
+    assert updates["validation_status"] == "pending"
+
+
+def test_rejection_regenerates_everything_on_the_same_tier(monkeypatch):
+    monkeypatch.setattr(testcase_retry, "next_tier", lambda tier: tier + 1)
+    generate = Generator()
+    invalid = [{"index": 1, "test_case": INVALID, "errors": ["steps: too short"]}]
+
+    updates = testcase_retry.retry_generation(
+        _state(human_approval="rejected", human_feedback="Missing negative cases", invalid_cases=invalid),
+        generate, [RepairChain()])
+
+    assert generate.calls == [(False, 0, "Missing negative cases")]
+    assert updates["test_cases"] == [VALID] and updates["model_tier"] == 0
+
+
+def test_rejection_is_cleared_so_later_retries_repair(monkeypatch):
+    monkeypatch.setattr(testcase_retry, "next_tier", lambda tier: tier + 1)
+    updates = testcase_retry.retry_generation(_state(human_approval="rejected"), Generator(), [RepairChain()])
+    assert updates["human_approval"] == "pending"
+
+    repair_chains = [RepairChain(), RepairChain()]
+    invalid = [{"index": 1, "test_case": INVALID, "errors": ["steps: too short"]}]
+    state = _state(**{**updates, "test_cases": [VALID, INVALID], "invalid_cases": invalid})
+    testcase_retry.retry_generation(state, Generator(), repair_chains)
+
+    assert repair_chains[1].calls == 1
+
+
+def test_failed_sections_fail_validation():
+    generate = Generator({"test_cases": [VALID], "errors": ["Section 'Login': timeout"]})
+
+    updates = testcase_retry.retry_generation(_state(), generate, [RepairChain()])
+
+    assert updates["test_cases"] == [] and updates["validation_status"] == "fail"
+    assert updates["errors"] == ["Section 'Login': timeout"]